@@ -6,6 +6,8 @@ and identify synergies between different research domains using TF-IDF vectoriza
 and cosine similarity analysis.
 """
 
+import os
+import sys
 import pandas as pd
 import numpy as np
 import re
@@ -21,6 +23,46 @@ from collections import defaultdict
 import warnings
 warnings.filterwarnings('ignore')
 
+# Shared dataset cache and keyword tagger live with the backend services
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cursor-back'))
+from dataset_cache import load_taskbook
+from keyword_tagger import KeywordTagger, text_column
+
+# Research domain keywords for project classification
+DOMAIN_KEYWORDS = {
+    'Space Biology': [
+        'biology', 'biological', 'cell', 'cellular', 'tissue', 'muscle', 'bone',
+        'immune', 'cardiovascular', 'neural', 'endocrine', 'physiology', 'metabolism',
+        'protein', 'gene', 'dna', 'rna', 'stem cell', 'regeneration', 'microgravity',
+        'spaceflight', 'radiation', 'oxidative', 'apoptosis', 'differentiation'
+    ],
+    'Human Research': [
+        'human', 'astronaut', 'crew', 'behavior', 'psychology', 'cognitive',
+        'performance', 'fatigue', 'sleep', 'circadian', 'stress', 'adaptation',
+        'countermeasure', 'exercise', 'nutrition', 'health', 'medical'
+    ],
+    'Physical Sciences': [
+        'physics', 'fluid', 'combustion', 'crystal', 'material', 'thermal',
+        'optical', 'laser', 'plasma', 'electromagnetic', 'gravity', 'mechanics',
+        'dynamics', 'thermodynamics', 'quantum', 'atomic', 'molecular'
+    ],
+    'Technology Development': [
+        'technology', 'engineering', 'system', 'instrument', 'sensor',
+        'robotic', 'automation', 'software', 'algorithm', 'data', 'communication',
+        'navigation', 'propulsion', 'power', 'energy', 'structure'
+    ],
+    'Earth Science': [
+        'earth', 'climate', 'atmosphere', 'ocean', 'land', 'ecosystem',
+        'environment', 'remote sensing', 'satellite', 'observation', 'monitoring'
+    ],
+    'Planetary Science': [
+        'planet', 'mars', 'moon', 'asteroid', 'comet', 'solar', 'space',
+        'exploration', 'mission', 'rover', 'lander', 'orbiter'
+    ]
+}
+domain_tagger = KeywordTagger(DOMAIN_KEYWORDS)
+
+
 class CrossDomainSynergyAgent:
     """
     Agent for identifying cross-domain synergies in NASA Task Book research projects.
@@ -66,7 +108,7 @@ class CrossDomainSynergyAgent:
             Loaded DataFrame
         """
         print(f"Loading data from {file_path}...")
-        self.df = pd.read_csv(file_path)
+        self.df = load_taskbook(file_path)
         print(f"Loaded {len(self.df)} projects")
         print(f"Columns: {list(self.df.columns)}")
         return self.df
@@ -83,56 +125,10 @@ class CrossDomainSynergyAgent:
         """
         print("Extracting research domains...")
         
-        # Define domain keywords
-        domain_keywords = {
-            'Space Biology': [
-                'biology', 'biological', 'cell', 'cellular', 'tissue', 'muscle', 'bone',
-                'immune', 'cardiovascular', 'neural', 'endocrine', 'physiology', 'metabolism',
-                'protein', 'gene', 'dna', 'rna', 'stem cell', 'regeneration', 'microgravity',
-                'spaceflight', 'radiation', 'oxidative', 'apoptosis', 'differentiation'
-            ],
-            'Human Research': [
-                'human', 'astronaut', 'crew', 'behavior', 'psychology', 'cognitive',
-                'performance', 'fatigue', 'sleep', 'circadian', 'stress', 'adaptation',
-                'countermeasure', 'exercise', 'nutrition', 'health', 'medical'
-            ],
-            'Physical Sciences': [
-                'physics', 'fluid', 'combustion', 'crystal', 'material', 'thermal',
-                'optical', 'laser', 'plasma', 'electromagnetic', 'gravity', 'mechanics',
-                'dynamics', 'thermodynamics', 'quantum', 'atomic', 'molecular'
-            ],
-            'Technology Development': [
-                'technology', 'engineering', 'system', 'instrument', 'sensor',
-                'robotic', 'automation', 'software', 'algorithm', 'data', 'communication',
-                'navigation', 'propulsion', 'power', 'energy', 'structure'
-            ],
-            'Earth Science': [
-                'earth', 'climate', 'atmosphere', 'ocean', 'land', 'ecosystem',
-                'environment', 'remote sensing', 'satellite', 'observation', 'monitoring'
-            ],
-            'Planetary Science': [
-                'planet', 'mars', 'moon', 'asteroid', 'comet', 'solar', 'space',
-                'exploration', 'mission', 'rover', 'lander', 'orbiter'
-            ]
-        }
-        
-        domain_mapping = {}
-        
-        for idx, row in self.df.iterrows():
-            # Combine title and abstract for domain classification
-            text = f"{str(row.get('Title', ''))} {str(row.get('Abstract', ''))}".lower()
-            
-            domain_scores = {}
-            for domain, keywords in domain_keywords.items():
-                score = sum(1 for keyword in keywords if keyword in text)
-                domain_scores[domain] = score
-            
-            # Assign to domain with highest score, or 'Other' if no clear match
-            if domain_scores and max(domain_scores.values()) > 0:
-                assigned_domain = max(domain_scores, key=domain_scores.get)
-                domain_mapping[idx] = assigned_domain
-            else:
-                domain_mapping[idx] = 'Other'
+        # Combine title and abstract for domain classification; each project goes to
+        # the domain with the most matching keywords, or 'Other' if none match
+        texts = text_column(self.df, ['Title', 'Abstract'])
+        domain_mapping = dict(zip(self.df.index, domain_tagger.best_match(texts)))
         
         self.domain_mapping = domain_mapping
         
@@ -0,0 +1,88 @@
+"""
+Aggregate Cube
+Project aggregates by domain x status x fiscal year, built with one groupby when
+the manager data is loaded. Every cell keeps the project count and, per measure
+(funding, ROI, team size), the sum, sum of squares, minimum and maximum, so
+counts, totals, means, standard deviations and ranges for any roll-up are
+combined from a few hundred cells instead of rescanning the projects.
+"""
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+
+DIMENSIONS = {"domain": "Assigned_Domain", "status": "Status", "year": "Fiscal Year"}
+MEASURES = {"funding": "Funding", "roi": "ROI", "team_size": "Team_Size"}
+
+
+class AggregateCube:
+    """Immutable per-cell aggregates of a projects table"""
+
+    def __init__(self, df: pd.DataFrame):
+        self.total = len(df)
+        columns = {name: df[col] for name, col in DIMENSIONS.items()}
+        measures = [name for name, col in MEASURES.items() if col in df.columns]
+        for name in measures:
+            values = df[MEASURES[name]]
+            columns[f"{name}_sum"] = values
+            columns[f"{name}_sumsq"] = values.astype("float64") ** 2
+            columns[f"{name}_min"] = values
+            columns[f"{name}_max"] = values
+        frame = pd.DataFrame(columns)
+        self.measures = measures
+        self._agg = {"count": "sum"}
+        for name in measures:
+            self._agg.update({f"{name}_sum": "sum", f"{name}_sumsq": "sum",
+                              f"{name}_min": "min", f"{name}_max": "max"})
+
+        grouped = frame.groupby(list(DIMENSIONS), sort=False)
+        self.cells = grouped.agg({col: how for col, how in self._agg.items() if col != "count"})
+        self.cells.insert(0, "count", grouped.size())
+        # First-appearance order of each dimension, the order value_counts breaks ties in
+        self.order: Dict[str, List] = {name: list(pd.unique(df[col])) for name, col in DIMENSIONS.items()}
+        self._rollups: Dict[Tuple, pd.DataFrame] = {}
+
+    def rollup(self, dimension: str = "domain", min_year: Optional[int] = None,
+               status: Optional[str] = None) -> pd.DataFrame:
+        """Aggregates per value of one dimension (sorted), optionally for recent years or one status"""
+        key = (dimension, min_year, status)
+        result = self._rollups.get(key)
+        if result is None:
+            cells = self.cells
+            mask = np.ones(len(cells), dtype=bool)
+            if min_year is not None:
+                mask &= cells.index.get_level_values("year") >= min_year
+            if status is not None:
+                mask &= cells.index.get_level_values("status") == status
+            result = cells[mask].groupby(level=dimension, sort=True).agg(self._agg)
+            self._rollups[key] = result
+        return result
+
+    def counts(self, dimension: str = "domain", min_year: Optional[int] = None,
+               status: Optional[str] = None) -> pd.Series:
+        """Project counts like df[column].value_counts(): largest first, ties in first-appearance order"""
+        counts = self.rollup(dimension, min_year, status)["count"]
+        order = [value for value in self.order[dimension] if value in counts.index]
+        counts = counts.reindex(order).sort_values(ascending=False, kind="stable")
+        counts.index.name = DIMENSIONS[dimension]
+        counts.name = "count"
+        return counts
+
+    def count(self, domain: Optional[str] = None, min_year: Optional[int] = None,
+              status: Optional[str] = None) -> int:
+        """Projects matching all given filters"""
+        if domain is None:
+            return int(self.rollup("status", min_year, status)["count"].sum())
+        counts = self.rollup("domain", min_year, status)["count"]
+        return int(counts.get(domain, 0))
+
+    def mean(self, measure: str, dimension: str = "domain", **filters) -> pd.Series:
+        rollup = self.rollup(dimension, **filters)
+        return rollup[f"{measure}_sum"] / rollup["count"]
+
+    def std(self, measure: str, dimension: str = "domain", **filters) -> pd.Series:
+        """Sample standard deviation (ddof=1, NaN for single projects) from the cell moments"""
+        rollup = self.rollup(dimension, **filters)
+        n = rollup["count"]
+        total = rollup[f"{measure}_sum"].astype("float64")
+        variance = (rollup[f"{measure}_sumsq"] - total ** 2 / n) / (n - 1)
+        return np.sqrt(variance.clip(lower=0)).where(n > 1)
@@ -0,0 +1,88 @@
+"""
+AI Chatbot Chunk Index
+Keeps the vector store and FAISS index for all_papers_chunked.jsonl up to date
+incrementally: only new or changed chunks (keyed by paper_id/chunk_index plus a
+text hash) are encoded and appended, removed chunks are tombstoned.
+
+Run offline after changing the corpus:
+    python ai_chunk_index.py [--source all_papers_chunked.jsonl] [--store ai_vector_store] [--compact]
+"""
+import argparse
+import json
+import os
+import faiss
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+from encoder_service import encoder_service
+from vector_store import VectorStore
+from ann_index import index_config_from_env, sync_store_index
+
+AI_CHUNKS_SOURCE = "all_papers_chunked.jsonl"
+AI_STORE_DIR = "ai_vector_store"
+INDEX_FILE_NAME = "faiss.index"
+
+
+def read_ai_chunk_rows(source_path: str = AI_CHUNKS_SOURCE) -> Tuple[List[str], Dict[str, List[Any]]]:
+    """Parse the chunk JSONL into row keys and metadata columns"""
+    keys = []
+    columns = {'chunk': [], 'paper_id': [], 'section': [], 'chunk_index': []}
+    seen = {}
+    with open(source_path, "r", encoding="utf-8") as f:
+        for line in f:
+            data = json.loads(line)
+            paper_id = data.get('paper_id', 'N/A')
+            chunk_index = data.get('chunk_index', 'N/A')
+            key = f"{paper_id}:{chunk_index}"
+            # Keep keys unique if the corpus repeats a (paper_id, chunk_index) pair
+            seen[key] = seen.get(key, 0) + 1
+            if seen[key] > 1:
+                key = f"{key}#{seen[key]}"
+            keys.append(key)
+            columns['chunk'].append(data['chunk_text_clean'])
+            columns['paper_id'].append(paper_id)
+            columns['section'].append(data.get('section', 'N/A'))
+            columns['chunk_index'].append(chunk_index)
+    return keys, columns
+
+
+def encode_chunks(texts: List[str]) -> np.ndarray:
+    """Embed chunk texts with the shared encoder, L2-normalized for inner-product search"""
+    print(f"Encoding {len(texts)} chunks...")
+    embeddings = np.ascontiguousarray(encoder_service.encode(texts, show_progress_bar=True), dtype='float32')
+    if len(embeddings):
+        faiss.normalize_L2(embeddings)
+    return embeddings
+
+
+def sync_ai_vector_store(source_path: str = AI_CHUNKS_SOURCE, store_dir: str = AI_STORE_DIR) -> Tuple[VectorStore, Dict[str, int]]:
+    """Open the store, encoding only chunks that are new or changed in the source"""
+    store = VectorStore(store_dir)
+    stats = store.sync(source_path, encoder_service.model_name,
+                       lambda: read_ai_chunk_rows(source_path), encode_chunks, text_column='chunk')
+    return store, stats
+
+
+def sync_ai_faiss_index(store: VectorStore, index_path: Optional[str] = None):
+    """Load the ANN index for the store (kind from NASA_ANN_INDEX), appending rows added since it was saved"""
+    index_path = index_path or os.path.join(store.store_dir, INDEX_FILE_NAME)
+    return sync_store_index(store, index_path, index_config_from_env())
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Incrementally update the AI chatbot vector store and FAISS index")
+    parser.add_argument("--source", default=AI_CHUNKS_SOURCE, help="Chunk JSONL file")
+    parser.add_argument("--store", default=AI_STORE_DIR, help="Vector store directory")
+    parser.add_argument("--compact", action="store_true", help="Drop tombstoned rows and rebuild the index")
+    args = parser.parse_args(argv)
+
+    store, stats = sync_ai_vector_store(args.source, args.store)
+    print(f"✅ Vector store synced: {stats}")
+    if args.compact and store.deleted_count:
+        print(f"🧹 Compacting {store.deleted_count} tombstoned rows...")
+        store.compact()
+    index = sync_ai_faiss_index(store)
+    print(f"✅ {type(index).__name__} has {index.ntotal} vectors ({store.live_count} live, {store.deleted_count} tombstoned)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Approximate Nearest Neighbour Index Factory
+Builds the FAISS index used by the RAG search paths: exact Flat, IVF-Flat, IVF-PQ
+or HNSW, trained on the existing embeddings. The kind and its search-time knobs
+(nprobe, efSearch) come from the environment:
+
+    NASA_ANN_INDEX=flat|ivf_flat|ivf_pq|hnsw   (default flat)
+    NASA_ANN_NLIST, NASA_ANN_NPROBE            IVF cells / cells probed per query
+    NASA_ANN_PQ_M, NASA_ANN_PQ_NBITS           PQ sub-quantizers / bits per code
+    NASA_ANN_HNSW_M, NASA_ANN_EF_SEARCH        HNSW graph degree / search breadth
+
+Use benchmark_ann_index.py to pick an operating point for the corpus size.
+"""
+import json
+import math
+import os
+import faiss
+import numpy as np
+from typing import Any, Dict, Optional
+
+INDEX_KINDS = ("flat", "ivf_flat", "ivf_pq", "hnsw")
+
+# FAISS warns below roughly 39 training points per centroid
+MIN_POINTS_PER_CENTROID = 39
+
+
+def index_config_from_env() -> Dict[str, Any]:
+    """Read the index kind and parameters from the environment"""
+    def _int(name: str) -> Optional[int]:
+        value = os.environ.get(name)
+        return int(value) if value else None
+
+    kind = os.environ.get("NASA_ANN_INDEX", "flat").lower()
+    if kind not in INDEX_KINDS:
+        print(f"⚠️ Unknown NASA_ANN_INDEX '{kind}', using flat")
+        kind = "flat"
+    return {
+        "kind": kind,
+        "nlist": _int("NASA_ANN_NLIST"),
+        "nprobe": _int("NASA_ANN_NPROBE"),
+        "pq_m": _int("NASA_ANN_PQ_M"),
+        "pq_nbits": _int("NASA_ANN_PQ_NBITS"),
+        "hnsw_m": _int("NASA_ANN_HNSW_M"),
+        "ef_search": _int("NASA_ANN_EF_SEARCH"),
+    }
+
+
+def default_nlist(n: int) -> int:
+    """About 4·sqrt(N) cells, capped so every cell gets enough training points"""
+    return max(1, min(int(4 * math.sqrt(max(n, 1))), n // MIN_POINTS_PER_CENTROID or 1))
+
+
+def default_nprobe(nlist: int) -> int:
+    """Probe about 1/8 of the cells; FAISS's own default of 1 costs too much recall"""
+    return max(1, nlist // 8)
+
+
+def default_pq_m(dimension: int) -> int:
+    """Largest sub-quantizer count dividing the dimension with at least 8 dims per sub-vector"""
+    for m in range(max(1, dimension // 8), 0, -1):
+        if dimension % m == 0:
+            return m
+    return 1
+
+
+def build_index(embeddings: np.ndarray, kind: str = "flat", metric: int = faiss.METRIC_INNER_PRODUCT,
+                nlist: Optional[int] = None, nprobe: Optional[int] = None, pq_m: Optional[int] = None,
+                pq_nbits: Optional[int] = None, hnsw_m: Optional[int] = None, ef_search: Optional[int] = None,
+                ef_construction: int = 200):
+    """Create, train and fill an index of the requested kind"""
+    embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+    n, dimension = embeddings.shape
+
+    if kind == "flat" or n == 0:
+        index = faiss.IndexFlatIP(dimension) if metric == faiss.METRIC_INNER_PRODUCT else faiss.IndexFlatL2(dimension)
+    elif kind == "hnsw":
+        index = faiss.IndexHNSWFlat(dimension, hnsw_m or 32, metric)
+        index.hnsw.efConstruction = ef_construction
+    elif kind in ("ivf_flat", "ivf_pq"):
+        nlist = min(nlist or default_nlist(n), n)
+        quantizer = faiss.IndexFlatIP(dimension) if metric == faiss.METRIC_INNER_PRODUCT else faiss.IndexFlatL2(dimension)
+        if kind == "ivf_flat":
+            index = faiss.IndexIVFFlat(quantizer, dimension, nlist, metric)
+        else:
+            m = pq_m or default_pq_m(dimension)
+            # Each sub-quantizer trains 2**nbits centroids; shrink codes on small corpora
+            nbits = pq_nbits or max(1, min(8, int(math.log2(max(n // MIN_POINTS_PER_CENTROID, 2)))))
+            index = faiss.IndexIVFPQ(quantizer, dimension, nlist, m, nbits, metric)
+        index.train(embeddings)
+        nprobe = nprobe or default_nprobe(nlist)
+    else:
+        raise ValueError(f"Unknown index kind: {kind}")
+
+    if n:
+        index.add(embeddings)
+    set_search_params(index, nprobe=nprobe, ef_search=ef_search)
+    return index
+
+
+def set_search_params(index, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+    """Apply search-time knobs; parameters that do not apply to the index are ignored"""
+    params = faiss.ParameterSpace()
+    if nprobe and isinstance(faiss.try_extract_index_ivf(index), faiss.IndexIVF):
+        params.set_index_parameter(index, "nprobe", nprobe)
+    if ef_search and hasattr(index, "hnsw"):
+        params.set_index_parameter(index, "efSearch", ef_search)
+    return index
+
+
+def describe_index(index) -> Dict[str, Any]:
+    """Kind and tuning of a loaded index, for status endpoints"""
+    info = {"type": type(index).__name__, "ntotal": int(index.ntotal), "dimension": int(index.d)}
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        info["nlist"] = int(ivf.nlist)
+        info["nprobe"] = int(ivf.nprobe)
+    if hasattr(index, "hnsw"):
+        info["ef_search"] = int(index.hnsw.efSearch)
+    return info
+
+
+def _read_index_meta(index_path: str) -> Dict[str, Any]:
+    try:
+        with open(f"{index_path}.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _write_index(index, index_path: str, store, kind: str):
+    """Index, then meta, each written to a temporary file and renamed into place"""
+    faiss.write_index(index, f"{index_path}.tmp")
+    os.replace(f"{index_path}.tmp", index_path)
+    with open(f"{index_path}.json.tmp", "w", encoding="utf-8") as f:
+        json.dump({"build_id": store.header.get("build_id"), "ntotal": int(index.ntotal), "kind": kind}, f)
+    os.replace(f"{index_path}.json.tmp", f"{index_path}.json")
+
+
+def sync_store_index(store, index_path: str, config: Optional[Dict[str, Any]] = None,
+                     metric: int = faiss.METRIC_INNER_PRODUCT):
+    """
+    Load the index built over a VectorStore, appending rows added since it was
+    written. Index ids are store row numbers; tombstoned rows stay in the index
+    and are filtered out at query time. A different store build or index kind
+    triggers a rebuild (and retraining for IVF indexes), as does an index whose
+    size disagrees with its meta (a crash between the two writes). Runs under the
+    store's writer lock, so concurrent workers never append the same rows twice.
+    """
+    config = dict(config or index_config_from_env())
+    kind = config.pop("kind", "flat")
+    search_params = {"nprobe": config.get("nprobe"), "ef_search": config.get("ef_search")}
+
+    with store.locked():
+        meta = _read_index_meta(index_path)
+        same_build = (
+            os.path.exists(index_path)
+            and meta.get("build_id") == store.header.get("build_id")
+            and meta.get("kind", "flat") == kind
+        )
+        indexed = int(meta.get("ntotal", -1))
+
+        index = None
+        if same_build and 0 <= indexed <= len(store):
+            if indexed == len(store):
+                # Up to date: flat indexes can be memory-mapped so workers share them too
+                try:
+                    index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP)
+                except Exception:
+                    index = faiss.read_index(index_path)
+            else:
+                index = faiss.read_index(index_path)
+            if index.ntotal != indexed:
+                print(f"⚠️ {index_path} holds {index.ntotal} vectors but its meta says {indexed}; rebuilding")
+                index = None
+            elif indexed == len(store):
+                return set_search_params(index, **search_params)
+
+        if index is not None:
+            print(f"Appending {len(store) - indexed} rows to {kind} index {index_path}...")
+            index.add(np.ascontiguousarray(store.embeddings[indexed:]))
+            set_search_params(index, **search_params)
+        else:
+            print(f"Creating {kind} index {index_path} over {len(store)} vectors...")
+            index = build_index(np.asarray(store.embeddings), kind=kind, metric=metric, **config)
+        _write_index(index, index_path, store, kind)
+        return index
+
+
+def rag_search_index(base_index, store, config: Optional[Dict[str, Any]] = None):
+    """
+    Search index for the rag_system chunks: the prebuilt faiss_index.bin when the
+    configured kind is flat, otherwise an ANN index trained on the chunk store and
+    kept next to it (faiss_<kind>.index) with the same metric.
+    """
+    config = dict(config or index_config_from_env())
+    if config["kind"] == "flat":
+        return set_search_params(base_index, nprobe=config.get("nprobe"), ef_search=config.get("ef_search"))
+    index_path = os.path.join(store.store_dir, f"faiss_{config['kind']}.index")
+    return sync_store_index(store, index_path, config, metric=base_index.metric_type)
@@ -0,0 +1,123 @@
+"""
+ANN Index Benchmark
+Measures recall@k and per-query latency of IVF-Flat, IVF-PQ and HNSW indexes
+against the exact flat baseline, sweeping nprobe / efSearch, so an operating
+point can be picked for the corpus size.
+
+    python benchmark_ann_index.py                       # AI chatbot vector store
+    python benchmark_ann_index.py --store ../nasa-ai-model/rag_system/chunks_store
+    python benchmark_ann_index.py --synthetic 200000    # random unit vectors
+"""
+import argparse
+import time
+import faiss
+import numpy as np
+from typing import Any, Dict, List, Optional
+from ann_index import build_index, default_nlist, set_search_params
+from vector_store import VectorStore
+
+
+def load_vectors(store_dir: Optional[str], synthetic: int, dimension: int, seed: int) -> np.ndarray:
+    """Embeddings from a vector store, or L2-normalized random vectors"""
+    if synthetic:
+        rng = np.random.default_rng(seed)
+        vectors = rng.standard_normal((synthetic, dimension)).astype(np.float32)
+    else:
+        store = VectorStore(store_dir).open()
+        vectors = np.array(store.embeddings, dtype=np.float32)
+    faiss.normalize_L2(vectors)
+    return vectors
+
+
+def sample_queries(vectors: np.ndarray, n_queries: int, seed: int) -> np.ndarray:
+    """Corpus vectors with a little noise, so queries look like real paraphrases"""
+    rng = np.random.default_rng(seed + 1)
+    picks = rng.choice(len(vectors), size=min(n_queries, len(vectors)), replace=False)
+    queries = vectors[picks] + rng.normal(0, 0.05, (len(picks), vectors.shape[1])).astype(np.float32)
+    faiss.normalize_L2(queries)
+    return np.ascontiguousarray(queries)
+
+
+def recall_at_k(found: np.ndarray, truth: np.ndarray) -> float:
+    """Fraction of the exact top-k neighbours the index returned"""
+    hits = sum(len(set(f[f >= 0]) & set(t)) for f, t in zip(found, truth))
+    return hits / truth.size
+
+
+def time_search(index, queries: np.ndarray, k: int, batch: bool):
+    """Latency per query in ms, either one query at a time (like the chat endpoints) or batched"""
+    start = time.perf_counter()
+    if batch:
+        _, found = index.search(queries, k)
+    else:
+        found = np.vstack([index.search(queries[i:i + 1], k)[1] for i in range(len(queries))])
+    elapsed = time.perf_counter() - start
+    return found, elapsed * 1000 / len(queries)
+
+
+def run_benchmark(vectors: np.ndarray, queries: np.ndarray, k: int, kinds: List[str],
+                  nprobes: List[int], ef_searches: List[int], batch: bool) -> List[Dict[str, Any]]:
+    results = []
+    flat = build_index(vectors, kind="flat")
+    truth, flat_ms = time_search(flat, queries, k, batch)
+    results.append({"kind": "flat", "param": "-", "build_s": 0.0, "recall": 1.0, "ms_per_query": flat_ms})
+
+    for kind in kinds:
+        start = time.perf_counter()
+        index = build_index(vectors, kind=kind)
+        build_s = time.perf_counter() - start
+        if kind == "hnsw":
+            sweep = [("efSearch", value, {"ef_search": value}) for value in ef_searches]
+        else:
+            nlist = faiss.extract_index_ivf(index).nlist
+            sweep = [("nprobe", value, {"nprobe": value}) for value in nprobes if value <= nlist]
+        for name, value, params in sweep:
+            set_search_params(index, **params)
+            found, ms = time_search(index, queries, k, batch)
+            results.append({"kind": kind, "param": f"{name}={value}", "build_s": build_s,
+                            "recall": recall_at_k(found, truth), "ms_per_query": ms})
+    return results
+
+
+def print_results(results: List[Dict[str, Any]], k: int):
+    flat_ms = results[0]["ms_per_query"]
+    print(f"\n{'index':<10} {'param':<14} {'build s':>8} {f'recall@{k}':>10} {'ms/query':>10} {'QPS':>9} {'speedup':>8}")
+    print("-" * 75)
+    for r in results:
+        qps = 1000 / r["ms_per_query"] if r["ms_per_query"] else float("inf")
+        speedup = flat_ms / r["ms_per_query"] if r["ms_per_query"] else float("inf")
+        print(f"{r['kind']:<10} {r['param']:<14} {r['build_s']:>8.2f} {r['recall']:>10.3f} "
+              f"{r['ms_per_query']:>10.3f} {qps:>9.0f} {speedup:>7.1f}x")
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Recall@k vs latency of ANN indexes against flat search")
+    parser.add_argument("--store", default="ai_vector_store", help="Vector store directory to benchmark")
+    parser.add_argument("--synthetic", type=int, default=0, help="Use N random vectors instead of a store")
+    parser.add_argument("--dimension", type=int, default=384, help="Dimension for --synthetic")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=10)
+    parser.add_argument("--kinds", default="ivf_flat,ivf_pq,hnsw")
+    parser.add_argument("--nprobe", default="1,4,8,16,32,64")
+    parser.add_argument("--ef-search", default="16,32,64,128,256")
+    parser.add_argument("--batch", action="store_true", help="Search all queries in one call")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    vectors = load_vectors(args.store, args.synthetic, args.dimension, args.seed)
+    queries = sample_queries(vectors, args.queries, args.seed)
+    print(f"📊 {len(vectors)} vectors × {vectors.shape[1]} dims, {len(queries)} queries, k={args.k}, "
+          f"default nlist={default_nlist(len(vectors))}")
+
+    results = run_benchmark(
+        vectors, queries, args.k,
+        kinds=[kind.strip() for kind in args.kinds.split(",") if kind.strip()],
+        nprobes=[int(v) for v in args.nprobe.split(",")],
+        ef_searches=[int(v) for v in args.ef_search.split(",")],
+        batch=args.batch,
+    )
+    print_results(results, args.k)
+
+
+if __name__ == "__main__":
+    main()
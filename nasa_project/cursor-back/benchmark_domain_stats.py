@@ -0,0 +1,107 @@
+"""
+Domain Stats Benchmark
+Times domain_stats.DomainStats against the per-domain passes it replaced in the
+data processor's gap analyses: the traditional scientific gap analysis (a
+groupby, then two masks per domain inside iterrows for the low-activity scan)
+and the manager funding and mission team-size groupbys. The projects table is
+replicated to grow it toward hundreds of thousands of rows. DomainStats is
+rolled up from the AggregateCube that load_data already builds for the manager
+dashboards, so the cube build is reported in its own column and the DomainStats
+column covers the roll-up and the reads. Reports the best of several runs, the
+cost per thousand rows and whether the outputs are identical.
+
+    python benchmark_domain_stats.py [--csv Taskbook_cleaned_for_NLP.csv] [--scales 1 10 100 1000] [--repeat 3]
+"""
+import argparse
+import time
+from datetime import datetime
+from typing import Callable, List, Optional
+import numpy as np
+import pandas as pd
+from aggregate_cube import AggregateCube
+from dataset_cache import load_taskbook
+from domain_stats import DomainStats
+
+
+def load_projects(csv_path: str, current_year: int) -> pd.DataFrame:
+    """Task Book domains with the data processor's synthetic columns"""
+    df = load_taskbook(csv_path)[["Title", "Assigned_Domain"]]
+    np.random.seed(42)
+    df["Fiscal Year"] = np.random.randint(2015, 2025, size=len(df))
+    df["Recent_5yrs"] = df["Fiscal Year"] >= (current_year - 5)
+    df["Funding"] = np.random.randint(50000, 500000, size=len(df))
+    df["ROI"] = np.random.uniform(1.2, 4.5, size=len(df))
+    df["Status"] = np.random.choice(["Active", "Completed", "On Hold", "Planning"],
+                                    size=len(df), p=[0.4, 0.35, 0.15, 0.1])
+    df["Team_Size"] = np.random.randint(2, 15, size=len(df))
+    return df
+
+
+def legacy_gap_stats(df: pd.DataFrame) -> list:
+    """The previous low-activity scan and the manager / mission gap groupbys"""
+    domain_stats = df.groupby("Assigned_Domain").agg({"Title": "count", "Funding": ["sum", "mean"]}).reset_index()
+    domain_stats.columns = ["Assigned_Domain", "project_count", "total_funding", "avg_funding"]
+    low_activity = []
+    for _, row in domain_stats.iterrows():
+        domain = row["Assigned_Domain"]
+        recent_count = len(df[(df["Assigned_Domain"] == domain) & (df["Recent_5yrs"] == True)])
+        if recent_count < 3:
+            low_activity.append((domain, recent_count, int(row["project_count"]), int(row["total_funding"])))
+
+    funding_stats = df.groupby("Assigned_Domain")["Funding"].agg(["sum", "mean", "count"]).reset_index()
+    funding = [(row["Assigned_Domain"], int(row["sum"]), int(row["count"]), round(row["mean"], 6))
+               for _, row in funding_stats.iterrows()]
+
+    team_stats = df.groupby("Assigned_Domain")["Team_Size"].agg(["mean", "max", "count"]).reset_index()
+    teams = [(row["Assigned_Domain"], round(row["mean"], 6), int(row["max"]), int(row["count"]))
+             for _, row in team_stats.iterrows()]
+    return [low_activity, funding, teams]
+
+
+def domain_stats_gap_stats(cube: AggregateCube, current_year: int) -> list:
+    """The same statistics from a DomainStats table rolled up from the cube"""
+    table = DomainStats(cube, current_year).table
+    low = table[table["recent_5yrs"] < 3]
+    low_activity = [(domain, int(row.recent_5yrs), int(row.project_count), int(row.funding_sum))
+                    for domain, row in zip(low.index, low.itertuples())]
+    funding = [(domain, int(row.funding_sum), int(row.project_count), round(row.funding_mean, 6))
+               for domain, row in zip(table.index, table.itertuples())]
+    teams = [(domain, round(row.team_size_mean, 6), int(row.team_size_max), int(row.project_count))
+             for domain, row in zip(table.index, table.itertuples())]
+    return [low_activity, funding, teams]
+
+
+def best_time(fn: Callable, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark DomainStats against the gap-analysis groupbys")
+    parser.add_argument("--csv", default="Taskbook_cleaned_for_NLP.csv")
+    parser.add_argument("--scales", type=int, nargs="+", default=[1, 10, 100, 1000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    current_year = datetime.now().year
+    base = load_projects(args.csv, current_year)
+    print(f"📊 {len(base)} projects in {base['Assigned_Domain'].nunique()} domains")
+    print(f"{'rows':>9}{'groupby ms':>12}{'cube ms':>10}{'stats ms':>10}{'groupby us/1k':>15}{'speedup':>9}")
+    for scale in args.scales:
+        df = base.iloc[np.tile(np.arange(len(base)), scale)].reset_index(drop=True)
+        cube = AggregateCube(df)
+        same = legacy_gap_stats(df) == domain_stats_gap_stats(cube, current_year)
+        legacy_ms = best_time(lambda: legacy_gap_stats(df), args.repeat)
+        cube_ms = best_time(lambda: AggregateCube(df), args.repeat)
+        stats_ms = best_time(lambda: domain_stats_gap_stats(cube, current_year), args.repeat)
+        per_k = 1000 * 1000 / len(df)
+        print(f"{len(df):>9}{legacy_ms:>12.1f}{cube_ms:>10.1f}{stats_ms:>10.1f}{legacy_ms * per_k:>15.1f}"
+              f"{legacy_ms / stats_ms:>8.1f}x{'' if same else '  DIFFERENT'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Keyword Tagger Benchmark
+Compares keyword_tagger.py with the per-row loops it replaced on
+Taskbook_cleaned_for_NLP.csv: the df.apply first-match domain assignment of the
+manager dashboard and data processor, and the iterrows keyword scores of the
+cross-domain synergy agent. A combined lookahead regex over the same keywords is
+timed too, for reference. Reports the best of several runs and checks that the
+outputs are identical.
+
+    python benchmark_keyword_tagger.py [--csv Taskbook_cleaned_for_NLP.csv] [--repeat 5]
+"""
+import argparse
+import re
+import time
+from typing import Callable, List, Optional
+import pandas as pd
+from keyword_tagger import TASKBOOK_DOMAINS, TASKBOOK_TEXT_COLUMNS, taskbook_domain_tagger, text_column
+
+
+def legacy_assign_domain(row) -> str:
+    """The previous df.apply(axis=1) domain assignment"""
+    text = " ".join([
+        str(row.get("Title", "")),
+        str(row.get("Abstract", "")),
+        str(row.get("Methods", "")),
+        str(row.get("Results", ""))
+    ]).lower()
+
+    for domain, keywords in TASKBOOK_DOMAINS.items():
+        for kw in keywords:
+            if kw in text:
+                return domain
+    return "Other"
+
+
+def legacy_best_domains(df: pd.DataFrame) -> List[str]:
+    """The previous iterrows keyword scoring of the synergy agent"""
+    domains = []
+    for idx, row in df.iterrows():
+        text = f"{str(row.get('Title', ''))} {str(row.get('Abstract', ''))}".lower()
+        domain_scores = {domain: sum(1 for keyword in keywords if keyword in text)
+                         for domain, keywords in TASKBOOK_DOMAINS.items()}
+        if max(domain_scores.values()) > 0:
+            domains.append(max(domain_scores, key=domain_scores.get))
+        else:
+            domains.append('Other')
+    return domains
+
+
+def regex_first_domains(df: pd.DataFrame) -> List[str]:
+    """First-match domains from one lookahead regex over all keywords"""
+    keywords = sorted({kw for kws in TASKBOOK_DOMAINS.values() for kw in kws}, key=len, reverse=True)
+    pattern = re.compile("(?=(" + "|".join(re.escape(kw) for kw in keywords) + "))")
+    texts = text_column(df, TASKBOOK_TEXT_COLUMNS).tolist()
+    # Each position reports its longest keyword; keywords that are prefixes of it match there too
+    domains_of = {kw: {d for d, kws in TASKBOOK_DOMAINS.items() for other in kws if kw.startswith(other)}
+                  for kw in keywords}
+    order = {domain: i for i, domain in enumerate(TASKBOOK_DOMAINS)}
+    first = []
+    for text in texts:
+        found = set()
+        for keyword in set(pattern.findall(text)):
+            found |= domains_of[keyword]
+        first.append(min(found, key=order.get) if found else "Other")
+    return first
+
+
+def best_time(fn: Callable, repeat: int) -> float:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return min(times) * 1000
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark the shared keyword tagger against per-row loops")
+    parser.add_argument("--csv", default="Taskbook_cleaned_for_NLP.csv")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    df = pd.read_csv(args.csv)
+    texts = text_column(df, TASKBOOK_TEXT_COLUMNS)
+    print(f"📊 {len(df)} projects, {texts.str.len().sum() / 1e6:.1f} M characters of text")
+
+    rows = []
+    legacy = df.apply(legacy_assign_domain, axis=1).tolist()
+    tagged = taskbook_domain_tagger.assign(df).tolist()
+    rows.append(("first match: df.apply loop",
+                 best_time(lambda: df.apply(legacy_assign_domain, axis=1), args.repeat), None))
+    rows.append(("first match: keyword tagger", best_time(lambda: taskbook_domain_tagger.assign(df), args.repeat),
+                 tagged == legacy))
+    rows.append(("first match: combined regex", best_time(lambda: regex_first_domains(df), args.repeat),
+                 regex_first_domains(df) == legacy))
+
+    title_abstract = text_column(df, ['Title', 'Abstract'])
+    legacy_best = legacy_best_domains(df)
+    rows.append(("best score: iterrows loop", best_time(lambda: legacy_best_domains(df), args.repeat), None))
+    rows.append(("best score: keyword tagger",
+                 best_time(lambda: taskbook_domain_tagger.best_match(title_abstract), args.repeat),
+                 taskbook_domain_tagger.best_match(title_abstract) == legacy_best))
+
+    rows.append(("all matches: keyword tagger",
+                 best_time(lambda: taskbook_domain_tagger.all_matches(texts), args.repeat), None))
+    rows.append(("scores: keyword tagger", best_time(lambda: taskbook_domain_tagger.scores(texts), args.repeat), None))
+
+    for name, ms, same in rows:
+        check = "" if same is None else ("  identical" if same else "  DIFFERENT")
+        print(f"{name:<30}{ms:>9.1f} ms{check}")
+
+
+if __name__ == "__main__":
+    main()
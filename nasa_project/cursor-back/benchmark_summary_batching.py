@@ -0,0 +1,99 @@
+"""
+Summarizer Batching Benchmark
+Throughput of role summaries from concurrent clients: one pipeline call per
+request (the previous behaviour) against the dynamic batching worker in
+summary_batcher.py. Scientist and manager requests are mixed, so the worker
+also has to group them by generation parameters.
+
+    python benchmark_summary_batching.py [--requests 64] [--clients 16] [--max-batch 8]
+    python benchmark_summary_batching.py --synthetic   # fake pipeline, no model download
+"""
+import argparse
+import json
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from summary_batcher import SummaryBatcher
+from summarizer_backends import SUMMARIZER_BACKENDS, SUMMARIZER_MODEL, load_summarization_pipeline
+
+SUMMARY_PARAMS = {
+    "scientist": {"max_length": 200, "min_length": 80, "do_sample": False, "truncation": True},
+    "manager": {"max_length": 120, "min_length": 40, "do_sample": False, "truncation": True},
+}
+
+
+class SyntheticPipeline:
+    """Stand-in with a fixed per-call cost plus a smaller per-text cost, like a padded forward pass"""
+
+    def __init__(self, call_seconds: float = 0.05, text_seconds: float = 0.01):
+        self.call_seconds = call_seconds
+        self.text_seconds = text_seconds
+
+    def __call__(self, texts, batch_size: int = 1, **params):
+        texts = [texts] if isinstance(texts, str) else texts
+        time.sleep(self.call_seconds + self.text_seconds * len(texts))
+        return [{"summary_text": text[:params.get("max_length", 100)]} for text in texts]
+
+
+def load_texts(path: str, n: int, seed: int = 0) -> List[str]:
+    """Paper chunks from step5_all_chunks.json, or generated text if it is missing"""
+    rng = random.Random(seed)
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            chunks = [item['Chunk'] for item in json.load(f) if len(item['Chunk']) >= 500]
+        return [rng.choice(chunks) for _ in range(n)]
+    except FileNotFoundError:
+        words = "microgravity bone loss astronaut radiation plant growth muscle atrophy gene expression".split()
+        return [" ".join(rng.choice(words) for _ in range(rng.randint(150, 400))) for _ in range(n)]
+
+
+def run_clients(summarize, workload: List[Dict[str, Any]], clients: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=clients) as pool:
+        list(pool.map(lambda item: summarize(item["text"], item["params"]), workload))
+    return time.perf_counter() - start
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Benchmark dynamic batching for the summarizer")
+    parser.add_argument("--requests", type=int, default=64)
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent callers")
+    parser.add_argument("--max-batch", type=int, default=8)
+    parser.add_argument("--max-wait-ms", type=float, default=10.0)
+    parser.add_argument("--chunks", default="step5_all_chunks.json")
+    parser.add_argument("--model", default=SUMMARIZER_MODEL)
+    parser.add_argument("--backend", choices=SUMMARIZER_BACKENDS, default=None, help="Defaults to NASA_SUMMARIZER_BACKEND")
+    parser.add_argument("--synthetic", action="store_true", help="Use a fake pipeline instead of the model")
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        pipe = SyntheticPipeline()
+    else:
+        pipe, _ = load_summarization_pipeline(args.model, args.backend, device=-1)
+
+    rng = random.Random(1)
+    workload = [{"text": text, "params": SUMMARY_PARAMS[rng.choice(["scientist", "manager"])]}
+                for text in load_texts(args.chunks, args.requests)]
+    print(f"📊 {len(workload)} requests from {args.clients} clients, max batch {args.max_batch}")
+
+    # Previous behaviour: every request calls the shared model on its own
+    model_lock = threading.Lock()
+
+    def one_at_a_time(text: str, params: Dict[str, Any]) -> str:
+        with model_lock:
+            return pipe(text, **params)[0]['summary_text']
+
+    baseline = run_clients(one_at_a_time, workload, args.clients)
+    batcher = SummaryBatcher(lambda: pipe, max_batch_size=args.max_batch, max_wait_ms=args.max_wait_ms)
+    batched = run_clients(batcher.summarize, workload, args.clients)
+
+    print(f"one call per request : {baseline:.2f}s ({len(workload) / baseline:.2f} summaries/s)")
+    print(f"batching worker      : {batched:.2f}s ({len(workload) / batched:.2f} summaries/s, "
+          f"{baseline / batched:.1f}x)")
+    print(f"worker stats         : {batcher.stats()}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Summarizer Backend Comparison
+Runs the summarizer on sample papers from step5_all_chunks.json with each
+inference backend and reports load time, latency per paper and agreement with
+the PyTorch eager summaries (ROUGE-L F1 over words; 1.0 means identical).
+
+    python compare_summarizer_backends.py [--papers 10] [--backends torch,torch-int8,onnx] [--role scientist]
+"""
+import argparse
+import json
+import statistics
+import time
+from typing import List, Optional
+from summarizer_backends import SUMMARIZER_BACKENDS, SUMMARIZER_MODEL, load_summarization_pipeline
+from title_index import PaperTitleIndex
+
+SUMMARY_PARAMS = {
+    "scientist": {"max_length": 200, "min_length": 80, "do_sample": False, "truncation": True},
+    "manager": {"max_length": 120, "min_length": 40, "do_sample": False, "truncation": True},
+}
+
+
+def rouge_l_f1(candidate: str, reference: str) -> float:
+    """ROUGE-L F1 from the longest common subsequence of words"""
+    a, b = candidate.lower().split(), reference.lower().split()
+    if not a or not b:
+        return 0.0
+    previous = [0] * (len(b) + 1)
+    for word in a:
+        current = [0]
+        for j, other in enumerate(b):
+            current.append(previous[j] + 1 if word == other else max(previous[j + 1], current[j]))
+        previous = current
+    lcs = previous[-1]
+    if lcs == 0:
+        return 0.0
+    precision, recall = lcs / len(a), lcs / len(b)
+    return 2 * precision * recall / (precision + recall)
+
+
+def sample_papers(path: str, n: int, max_chars: int = 4000) -> List[str]:
+    """Cleaned leading text of n papers spread across the corpus"""
+    with open(path, "r", encoding="utf-8") as f:
+        index = PaperTitleIndex(json.load(f))
+    step = max(1, len(index.titles) // n)
+    texts = []
+    for title in index.titles[::step]:
+        text = " ".join(chunk for chunk in index.cleaned_chunks(index.find_rows(title)) if len(chunk) >= 50)
+        if len(text) >= 500:
+            texts.append(text[:max_chars])
+        if len(texts) == n:
+            break
+    return texts
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Compare summarizer inference backends on sample papers")
+    parser.add_argument("--chunks", default="step5_all_chunks.json")
+    parser.add_argument("--papers", type=int, default=10)
+    parser.add_argument("--backends", default=",".join(SUMMARIZER_BACKENDS))
+    parser.add_argument("--role", choices=sorted(SUMMARY_PARAMS), default="scientist")
+    parser.add_argument("--model", default=SUMMARIZER_MODEL)
+    args = parser.parse_args(argv)
+
+    texts = sample_papers(args.chunks, args.papers)
+    backends = [backend.strip() for backend in args.backends.split(",") if backend.strip()]
+    params = SUMMARY_PARAMS[args.role]
+    print(f"📊 {len(texts)} papers, {args.role} parameters, backends: {backends}")
+
+    reference: Optional[List[str]] = None
+    rows = []
+    for backend in backends:
+        start = time.perf_counter()
+        pipe, loaded = load_summarization_pipeline(args.model, backend, device=-1)
+        load_seconds = time.perf_counter() - start
+        if loaded != backend:
+            print(f"⚠️ {backend} could not be loaded; its row measures {loaded}")
+            backend = f"{backend}->{loaded}"
+        pipe(texts[0], **params)  # warm-up
+
+        latencies, summaries = [], []
+        for text in texts:
+            start = time.perf_counter()
+            summaries.append(pipe(text, **params)[0]['summary_text'])
+            latencies.append(time.perf_counter() - start)
+        if reference is None:
+            reference = summaries
+        agreement = statistics.mean(rouge_l_f1(s, r) for s, r in zip(summaries, reference))
+        rows.append((backend, load_seconds, statistics.mean(latencies), max(latencies), agreement,
+                     statistics.mean(len(s.split()) for s in summaries)))
+
+    print(f"\n{'backend':<12}{'load s':>8}{'mean s':>9}{'max s':>8}{'speedup':>9}{'ROUGE-L':>9}{'words':>7}")
+    for backend, load_seconds, mean_latency, max_latency, agreement, words in rows:
+        print(f"{backend:<12}{load_seconds:>8.1f}{mean_latency:>9.2f}{max_latency:>8.2f}"
+              f"{rows[0][2] / mean_latency:>8.1f}x{agreement:>9.3f}{words:>7.0f}")
+    print(f"\nROUGE-L is measured against {rows[0][0]}; set NASA_SUMMARIZER_BACKEND to choose the server's backend")
+
+
+if __name__ == "__main__":
+    main()
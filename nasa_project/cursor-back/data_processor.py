@@ -4,6 +4,10 @@ from datetime import datetime, timedelta
 import json
 from typing import Dict, List, Any
 import os
+from aggregate_cube import AggregateCube
+from dataset_cache import load_taskbook
+from domain_stats import DomainStats
+from keyword_tagger import TASKBOOK_DOMAINS
 
 class DynamicDataProcessor:
     """Real-time data processor for manager dashboard analytics"""
@@ -11,29 +15,21 @@ class DynamicDataProcessor:
     def __init__(self, csv_path: str = "Taskbook_cleaned_for_NLP.csv"):
         self.csv_path = csv_path
         self.df = None
+        self.cube = None
+        self.domain_stats = None
+        self.current_year = None
         self.last_update = None
+        self._dashboard_summary_json = None
         self.load_data()
     
     def load_data(self):
         """Load and process CSV data with domain classification"""
         try:
-            # Load CSV
-            self.df = pd.read_csv(self.csv_path)
+            # Load the parsed CSV; domains are assigned once per CSV version
+            self.df = load_taskbook(self.csv_path)
             
             # Domain classification keywords
-            self.domain_keywords = {
-                "Plants": ["plant", "flora", "crop", "seed", "photosynth", "phyt", "agri", "leaf", "root"],
-                "Microbes": ["microbe", "microbial", "bacteria", "bacterial", "virus", "fungi", "fungal",
-                             "staphyl", "streptoc", "pathogen", "microorganism"],
-                "Radiation": ["radiation", "ionizing", "cosmic", "radiol", "shield", "dosimetry", "radiobiology"],
-                "Psychology": ["psych", "behavior", "crew", "cognitive", "sleep", "social", "mental",
-                               "stress", "isolation"],
-                "Human Physiology": ["cardio", "cardiovascular", "musculo", "bone", "neuro",
-                                     "endocrine", "immune"],
-            }
-            
-            # Assign domains
-            self.df["Assigned_Domain"] = self.df.apply(self._assign_domain, axis=1)
+            self.domain_keywords = TASKBOOK_DOMAINS
             
             # Create synthetic fiscal years and dates for analysis
             np.random.seed(42)
@@ -54,52 +50,54 @@ class DynamicDataProcessor:
             # Add synthetic team sizes
             self.df['Team_Size'] = np.random.randint(2, 15, size=len(self.df))
             
+            # Aggregates by domain x status x fiscal year for the dashboard endpoints
+            self.current_year = current_year
+            self.cube = AggregateCube(self.df)
+            self.domain_stats = DomainStats(self.cube, current_year)
+            self._dashboard_summary_json = None
+            
             self.last_update = datetime.now()
             print(f"Loaded {len(self.df)} research projects")
             
         except Exception as e:
             print(f"Error loading data: {e}")
             self.df = pd.DataFrame()
-    
-    def _assign_domain(self, row):
-        """Assign domain based on content analysis"""
-        text = " ".join([
-            str(row.get("Title", "")),
-            str(row.get("Abstract", "")),
-            str(row.get("Methods", "")),
-            str(row.get("Results", ""))
-        ]).lower()
-
-        for domain, keywords in self.domain_keywords.items():
-            for kw in keywords:
-                if kw in text:
-                    return domain
-        return "Other"
+            self.cube = None
+            self.domain_stats = None
+            self._dashboard_summary_json = None
     
     def get_domain_analytics(self) -> Dict[str, Any]:
         """Get comprehensive domain analytics"""
         if self.df.empty:
             return {}
         
+        cube = self.cube
+        by_domain = cube.rollup("domain")
+        
         # Domain distribution
-        domain_counts = self.df["Assigned_Domain"].value_counts()
-        domain_percentages = (domain_counts / len(self.df) * 100).round(1)
+        domain_counts = cube.counts("domain")
+        domain_percentages = (domain_counts / cube.total * 100).round(1)
         
         # Recent trends (last 5 years)
-        recent_counts = self.df[self.df["Recent_5yrs"]]["Assigned_Domain"].value_counts()
+        recent_counts = cube.counts("domain", min_year=self.current_year - 5)
         
         # Funding analysis by domain
-        funding_by_domain = self.df.groupby("Assigned_Domain")["Funding"].agg([
-            'sum', 'mean', 'count'
-        ]).round(0)
+        funding_by_domain = pd.DataFrame({
+            'sum': by_domain["funding_sum"],
+            'mean': cube.mean("funding"),
+            'count': by_domain["count"]
+        }).round(0)
         
         # ROI analysis
-        roi_by_domain = self.df.groupby("Assigned_Domain")["ROI"].agg([
-            'mean', 'std', 'min', 'max'
-        ]).round(2)
+        roi_by_domain = pd.DataFrame({
+            'mean': cube.mean("roi"),
+            'std': cube.std("roi"),
+            'min': by_domain["roi_min"],
+            'max': by_domain["roi_max"]
+        }).round(2)
         
         analytics = {
-            "total_projects": len(self.df),
+            "total_projects": cube.total,
             "domains": {
                 "counts": domain_counts.to_dict(),
                 "percentages": domain_percentages.to_dict(),
@@ -117,9 +115,8 @@ class DynamicDataProcessor:
         if self.df.empty:
             return {}
         
-        recent_counts = self.df[self.df["Recent_5yrs"]]["Assigned_Domain"].value_counts()
-        funding_by_domain = self.df.groupby("Assigned_Domain")["Funding"].sum()
-        roi_by_domain = self.df.groupby("Assigned_Domain")["ROI"].mean()
+        recent_counts = self.cube.counts("domain", min_year=self.current_year - 5)
+        roi_by_domain = self.cube.mean("roi")
         
         # Find underfunded and overfunded domains
         underfunded = recent_counts.idxmin() if not recent_counts.empty else "Other"
@@ -164,7 +161,6 @@ class DynamicDataProcessor:
             return []
         
         alerts = []
-        current_year = datetime.now().year
         
         # Critical domains for space missions
         critical_domains = {
@@ -175,11 +171,8 @@ class DynamicDataProcessor:
         }
         
         for domain, criteria in critical_domains.items():
-            recent_count = len(self.df[
-                (self.df["Assigned_Domain"] == domain) & 
-                (self.df["Recent_7yrs"])
-            ])
-            total_count = len(self.df[self.df["Assigned_Domain"] == domain])
+            recent_count = self.cube.count(domain, min_year=self.current_year - 7)
+            total_count = self.cube.count(domain)
             
             if recent_count < criteria["threshold"]:
                 alert_level = "CRITICAL" if recent_count < criteria["threshold"] * 0.5 else "WARNING"
@@ -204,54 +197,147 @@ class DynamicDataProcessor:
         if self.df.empty:
             return {}
         
-        domain_data = self.df[self.df["Assigned_Domain"] == domain]
-        if domain_data.empty:
-            return {"error": f"Domain '{domain}' not found"}
+        return self.get_budget_simulations([(domain, adjustment_percentage)])[0]
+    
+    def get_domains(self) -> List[str]:
+        """Domains with projects, sorted by name"""
+        if self.df.empty:
+            return []
+        return list(self.cube.rollup("domain").index)
+    
+    def _budget_projections(self, domains: List[str], adjustments: List[float]) -> Dict[str, np.ndarray]:
+        """Current and projected studies/funding for parallel lists of domains and adjustment percentages"""
+        by_domain = self.cube.rollup("domain")
+        rows = by_domain.index.get_indexer(domains)
+        found = rows >= 0
+        rows = np.where(found, rows, 0)
+        
+        current_count = by_domain["count"].to_numpy()[rows]
+        current_funding = by_domain["funding_sum"].to_numpy()[rows]
+        
+        # Same arithmetic as a single simulation, one element per scenario
+        factor = 1 + np.asarray(adjustments, dtype=np.float64) / 100
+        projected_count = np.trunc(current_count * factor).astype(np.int64)
+        projected_funding = current_funding * factor
+        difference = projected_count - current_count
+        return {
+            "found": found,
+            "current_count": current_count,
+            "current_funding": current_funding,
+            "roi": (by_domain["roi_sum"] / by_domain["count"]).to_numpy()[rows],
+            "projected_count": projected_count,
+            "projected_funding": projected_funding,
+            "difference": difference,
+            "additional_investment": np.where(difference > 0, difference * 50000, 0),
+            "cost_savings": np.where(difference < 0, -difference * 50000, 0)
+        }
+    
+    def _budget_simulation_results(self, scenarios: List[tuple], projections: Dict[str, np.ndarray]) -> List[Dict[str, Any]]:
+        # Plain Python numbers, converted once per column
+        found = projections["found"].tolist()
+        current_count = projections["current_count"].tolist()
+        current_funding = np.trunc(projections["current_funding"]).astype(np.int64).tolist()
+        roi = np.round(projections["roi"], 2).tolist()
+        projected_count = projections["projected_count"].tolist()
+        projected_funding = np.trunc(projections["projected_funding"]).astype(np.int64).tolist()
+        difference = projections["difference"].tolist()
+        funding_difference = np.trunc(projections["projected_funding"] - projections["current_funding"]).astype(np.int64).tolist()
+        additional_investment = projections["additional_investment"].tolist()
+        cost_savings = projections["cost_savings"].tolist()
+        
+        simulations = []
+        for i, (domain, adjustment_percentage) in enumerate(scenarios):
+            if not found[i]:
+                simulations.append({"error": f"Domain '{domain}' not found"})
+                continue
+            simulations.append({
+                "domain": domain,
+                "adjustment_percentage": adjustment_percentage,
+                "current": {
+                    "studies": current_count[i],
+                    "funding": current_funding[i],
+                    "roi": roi[i]
+                },
+                "projected": {
+                    "studies": projected_count[i],
+                    "funding": projected_funding[i],
+                    "roi": roi[i]  # Assume ROI stays constant
+                },
+                "impact": {
+                    "study_difference": difference[i],
+                    "funding_difference": funding_difference[i],
+                    "additional_investment": additional_investment[i],
+                    "cost_savings": cost_savings[i]
+                }
+            })
+        return simulations
+    
+    def get_budget_simulations(self, scenarios: List[tuple]) -> List[Dict[str, Any]]:
+        """Simulate many (domain, adjustment_percentage) scenarios at once from the per-domain totals"""
+        if self.df.empty or not scenarios:
+            return []
+        
+        projections = self._budget_projections([domain for domain, _ in scenarios],
+                                               [adjustment for _, adjustment in scenarios])
+        return self._budget_simulation_results(scenarios, projections)
+    
+    def get_portfolio_simulation(self, allocation: Dict[str, float]) -> Dict[str, Any]:
+        """Apply one adjustment per domain together (unlisted domains unchanged) and total the portfolio"""
+        if self.df.empty:
+            return {}
+        
+        domains = self.get_domains()
+        unknown = [domain for domain in allocation if domain not in domains]
+        if unknown:
+            return {"error": f"Domain '{unknown[0]}' not found"}
         
-        current_count = len(domain_data)
-        current_funding = domain_data["Funding"].sum()
-        current_roi = domain_data["ROI"].mean()
+        scenarios = [(domain, allocation.get(domain, 0.0)) for domain in domains]
+        projections = self._budget_projections(domains, [adjustment for _, adjustment in scenarios])
+        simulations = self._budget_simulation_results(scenarios, projections)
+        current_funding = projections["current_funding"].sum()
+        projected_funding = projections["projected_funding"].sum()
+        roi = projections["roi"]
         
-        # Calculate projections
-        projected_count = int(current_count * (1 + adjustment_percentage/100))
-        projected_funding = current_funding * (1 + adjustment_percentage/100)
-        difference = projected_count - current_count
+        def total(section: str, field: str) -> int:
+            # Sums of the rounded domain rows, so the totals reconcile with the table
+            return sum(simulation[section][field] for simulation in simulations)
         
-        simulation = {
-            "domain": domain,
-            "adjustment_percentage": adjustment_percentage,
-            "current": {
-                "studies": current_count,
-                "funding": int(current_funding),
-                "roi": round(current_roi, 2)
-            },
-            "projected": {
-                "studies": projected_count,
-                "funding": int(projected_funding),
-                "roi": round(current_roi, 2)  # Assume ROI stays constant
-            },
-            "impact": {
-                "study_difference": difference,
-                "funding_difference": int(projected_funding - current_funding),
-                "additional_investment": int(difference * 50000) if difference > 0 else 0,
-                "cost_savings": int(abs(difference) * 50000) if difference < 0 else 0
+        return {
+            "simulations": simulations,
+            "totals": {
+                # Portfolio ROI is the funding-weighted mean of the domain ROIs
+                "current": {
+                    "studies": total("current", "studies"),
+                    "funding": total("current", "funding"),
+                    "roi": round(float((roi * projections["current_funding"]).sum() / current_funding), 2) if current_funding else 0
+                },
+                "projected": {
+                    "studies": total("projected", "studies"),
+                    "funding": total("projected", "funding"),
+                    "roi": round(float((roi * projections["projected_funding"]).sum() / projected_funding), 2) if projected_funding else 0
+                },
+                "impact": {
+                    "study_difference": total("impact", "study_difference"),
+                    "funding_difference": total("impact", "funding_difference"),
+                    "additional_investment": total("impact", "additional_investment"),
+                    "cost_savings": total("impact", "cost_savings")
+                }
             }
         }
-        
-        return simulation
     
     def get_emerging_areas(self) -> List[Dict[str, Any]]:
         """Identify emerging research areas"""
         if self.df.empty:
             return []
         
-        recent_counts = self.df[self.df["Recent_5yrs"]]["Assigned_Domain"].value_counts()
-        total_counts = self.df["Assigned_Domain"].value_counts()
+        recent_counts = self.cube.counts("domain", min_year=self.current_year - 5)
+        total_counts = self.cube.counts("domain")
+        recent_total = recent_counts.sum()
         
         emerging_areas = []
         for domain in recent_counts.index:
-            recent_pct = (recent_counts[domain] / len(self.df[self.df["Recent_5yrs"]])) * 100
-            total_pct = (total_counts[domain] / len(self.df)) * 100
+            recent_pct = (recent_counts[domain] / recent_total) * 100
+            total_pct = (total_counts[domain] / self.cube.total) * 100
             growth_score = recent_pct - total_pct
             
             status = "GROWING" if growth_score > 1 else "DECLINING" if growth_score < -1 else "STABLE"
@@ -274,15 +360,15 @@ class DynamicDataProcessor:
         if self.df.empty:
             return {}
         
-        status_counts = self.df["Status"].value_counts()
-        status_percentages = (status_counts / len(self.df) * 100).round(1)
+        cube = self.cube
+        status_counts = cube.counts("status")
+        status_percentages = (status_counts / cube.total * 100).round(1)
         
         # Calculate completion rates by domain
         completion_by_domain = {}
-        for domain in self.df["Assigned_Domain"].unique():
-            domain_data = self.df[self.df["Assigned_Domain"] == domain]
-            completed = len(domain_data[domain_data["Status"] == "Completed"])
-            total = len(domain_data)
+        for domain in cube.order["domain"]:
+            completed = cube.count(domain, status="Completed")
+            total = cube.count(domain)
             completion_by_domain[domain] = {
                 "completed": completed,
                 "total": total,
@@ -293,10 +379,30 @@ class DynamicDataProcessor:
             "overall_status": status_counts.to_dict(),
             "status_percentages": status_percentages.to_dict(),
             "completion_by_domain": completion_by_domain,
-            "total_active": len(self.df[self.df["Status"] == "Active"]),
-            "total_completed": len(self.df[self.df["Status"] == "Completed"])
+            "total_active": cube.count(status="Active"),
+            "total_completed": cube.count(status="Completed")
+        }
+    
+    def get_dashboard_summary(self) -> Dict[str, Any]:
+        """All manager dashboard sections in one payload"""
+        return {
+            "domain_analytics": self.get_domain_analytics(),
+            "investment_recommendations": self.get_investment_recommendations(),
+            "red_flag_alerts": self.get_red_flag_alerts(),
+            "emerging_areas": self.get_emerging_areas(),
+            "project_status": self.get_project_status_overview(),
+            "last_updated": self.last_update.isoformat() if self.last_update else None
         }
     
+    def dashboard_summary_json(self) -> bytes:
+        """The dashboard summary response, serialized once per data load"""
+        body = self._dashboard_summary_json
+        if body is None:
+            body = json.dumps({"success": True, "data": self.get_dashboard_summary()}, ensure_ascii=False,
+                              allow_nan=False, separators=(",", ":")).encode("utf-8")
+            self._dashboard_summary_json = body
+        return body
+    
     def refresh_data(self):
         """Refresh data from CSV file"""
         self.load_data()
@@ -665,15 +771,16 @@ class DynamicDataProcessor:
     def _analyze_paper_gaps_with_ai(self, paper: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Use AI to analyze a paper for research gaps"""
         try:
-            # Import the summarizer (avoid importing from main to prevent circular dependencies)
-            from transformers import pipeline
-            import torch
+            # Import the summarizer backends (avoid importing from main to prevent circular dependencies)
+            from summarizer_backends import load_summarization_pipeline
             
-            # Initialize summarizer locally if needed
-            try:
-                from main import summarizer
-            except:
-                summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-12-6", framework="pt", device=0 if torch.cuda.is_available() else -1)
+            # Reuse the server's lazily loaded summarizer, or initialize one locally on the configured backend
+            from resource_registry import resource_registry
+            summarizer = None
+            if resource_registry.is_registered("summarizer"):
+                summarizer = resource_registry.get("summarizer")
+            if summarizer is None:
+                summarizer, _ = load_summarization_pipeline()
             
             # Prepare text for analysis (truncate if too long)
             text_to_analyze = paper.get('combined_text', '') or paper.get('abstract', '')
@@ -778,33 +885,15 @@ class DynamicDataProcessor:
         """Fallback traditional gap analysis"""
         gaps = []
         
-        # Analyze domain coverage gaps using available columns
-        domain_stats = self.df.groupby('Assigned_Domain').agg({
-            'Title': 'count',  # Count projects per domain
-            'Funding': ['sum', 'mean'],  # Funding analysis
-            'Team_Size': 'mean'  # Team size analysis
-        }).reset_index()
-        
-        # Flatten column names
-        domain_stats.columns = ['Assigned_Domain', 'project_count', 'total_funding', 'avg_funding', 'avg_team_size']
-        
-        # Find domains with low recent activity (using Recent_5yrs column)
-        low_activity_domains = []
-        
-        for _, row in domain_stats.iterrows():
-            domain = row['Assigned_Domain']
-            recent_count = len(self.df[
-                (self.df['Assigned_Domain'] == domain) & 
-                (self.df['Recent_5yrs'] == True)
-            ])
-            
-            if recent_count < 3:  # Less than 3 projects in last 5 years
-                low_activity_domains.append({
-                    'domain': domain,
-                    'recent_count': recent_count,
-                    'total_count': row['project_count'],
-                    'total_funding': row['total_funding']
-                })
+        # Find domains with low recent activity (projects in the last 5 fiscal years)
+        domain_stats = self.domain_stats.table
+        low_activity = domain_stats[domain_stats['recent_5yrs'] < 3]  # Less than 3 projects in last 5 years
+        low_activity_domains = [{
+            'domain': domain,
+            'recent_count': int(row.recent_5yrs),
+            'total_count': int(row.project_count),
+            'total_funding': row.funding_sum
+        } for domain, row in zip(low_activity.index, low_activity.itertuples())]
         
         # Generate gap recommendations
         for domain_info in low_activity_domains:
@@ -869,18 +958,16 @@ class DynamicDataProcessor:
         gaps = []
         
         # Analyze funding distribution gaps
-        funding_stats = self.df.groupby('Assigned_Domain')['Funding'].agg(['sum', 'mean', 'count']).reset_index()
-        funding_stats.columns = ['Assigned_Domain', 'total_funding', 'avg_funding', 'project_count']
+        funding_stats = self.domain_stats.table
         
         # Find domains with disproportionate funding
-        total_funding = funding_stats['total_funding'].sum()
+        total_funding = funding_stats['funding_sum'].sum()
         avg_funding_per_project = total_funding / funding_stats['project_count'].sum()
         
-        for _, row in funding_stats.iterrows():
-            domain = row['Assigned_Domain']
-            domain_funding = row['total_funding']
-            project_count = row['project_count']
-            avg_cost = row['avg_funding']
+        for domain, row in zip(funding_stats.index, funding_stats.itertuples()):
+            domain_funding = row.funding_sum
+            project_count = row.project_count
+            avg_cost = row.funding_mean
             
             funding_percentage = (domain_funding / total_funding) * 100
             
@@ -916,14 +1003,12 @@ class DynamicDataProcessor:
         gaps = []
         
         # Analyze team size gaps (as proxy for mission complexity)
-        team_stats = self.df.groupby('Assigned_Domain')['Team_Size'].agg(['mean', 'min', 'max', 'count']).reset_index()
-        team_stats.columns = ['Assigned_Domain', 'avg_team_size', 'min_team_size', 'max_team_size', 'project_count']
-        
-        for _, row in team_stats.iterrows():
-            domain = row['Assigned_Domain']
-            avg_team_size = row['avg_team_size']
-            max_team_size = row['max_team_size']
-            project_count = row['project_count']
+        team_stats = self.domain_stats.table
+        
+        for domain, row in zip(team_stats.index, team_stats.itertuples()):
+            avg_team_size = row.team_size_mean
+            max_team_size = row.team_size_max
+            project_count = row.project_count
             
             if max_team_size < 10:  # No large team studies
                 gaps.append({
@@ -0,0 +1,119 @@
+"""
+Task Book Dataset Cache
+Taskbook_cleaned_for_NLP.csv is parsed once into an Arrow IPC (Feather v2) file
+together with the columns every consumer used to derive again after its own
+read_csv:
+
+    Assigned_Domain  first-match Task Book domain (keyword_tagger.TASKBOOK_DOMAINS)
+    combined_text    Title, Abstract, Methods, Results and Conclusion joined, missing parts empty
+    token_count      whitespace-separated tokens in combined_text
+
+The file name carries a hash of the CSV contents and of the derivation, so an
+edited CSV or a changed taxonomy produces a new file and stale ones are removed.
+The file is written uncompressed and opened with a memory map, so every process
+reading the same version shares its pages through the OS cache.
+
+Without pyarrow the CSV is parsed and the columns are derived in memory.
+
+    NASA_DATASET_CACHE_DIR   directory for converted datasets (default "dataset_cache")
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Optional, Tuple
+import pandas as pd
+from keyword_tagger import TASKBOOK_DOMAINS, TASKBOOK_TEXT_COLUMNS, taskbook_domain_tagger
+from vector_store import file_sha256
+
+FORMAT_VERSION = 1
+COMBINED_TEXT_COLUMNS = ["Title", "Abstract", "Methods", "Results", "Conclusion"]
+DERIVED_COLUMNS = ["Assigned_Domain", "combined_text", "token_count"]
+DATASET_CACHE_DIR = os.environ.get("NASA_DATASET_CACHE_DIR", "dataset_cache")
+
+# Derivation settings that are part of the cache key
+_DERIVATION = json.dumps({"format": FORMAT_VERSION, "domains": TASKBOOK_DOMAINS,
+                          "domain_columns": TASKBOOK_TEXT_COLUMNS, "text_columns": COMBINED_TEXT_COLUMNS},
+                         sort_keys=True)
+
+# Memory-mapped tables already opened by this process, by file path
+_tables: Dict[str, "pyarrow.Table"] = {}
+_tables_lock = threading.Lock()
+
+
+def add_derived_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """The parsed table with Assigned_Domain, combined_text and token_count added"""
+    df = df.copy()
+    df["Assigned_Domain"] = taskbook_domain_tagger.assign(df, TASKBOOK_TEXT_COLUMNS)
+    parts = [df[col].fillna("").astype(str) if col in df.columns else pd.Series("", index=df.index)
+             for col in COMBINED_TEXT_COLUMNS]
+    combined = parts[0]
+    for part in parts[1:]:
+        combined = combined + " " + part
+    df["combined_text"] = combined
+    df["token_count"] = combined.str.split().str.len().fillna(0).astype("int64")
+    return df
+
+
+def dataset_key(csv_path: str) -> str:
+    """Hash of the CSV contents and the derivation settings"""
+    digest = hashlib.sha256(file_sha256(csv_path).encode("ascii"))
+    digest.update(_DERIVATION.encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def cache_path(csv_path: str, cache_dir: Optional[str] = None) -> Tuple[str, str]:
+    """(cache file for the CSV's current contents, file name prefix shared by its versions)"""
+    stem = os.path.splitext(os.path.basename(csv_path))[0]
+    prefix = f"{stem}-"
+    return os.path.join(cache_dir or DATASET_CACHE_DIR, f"{prefix}{dataset_key(csv_path)}.arrow"), prefix
+
+
+def _write_table(df: pd.DataFrame, path: str, prefix: str):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.tmp-{os.getpid()}"
+    # Uncompressed, so readers can map the columns instead of decoding them
+    feather.write_feather(pa.Table.from_pandas(df, preserve_index=False), tmp_path, compression="uncompressed")
+    os.replace(tmp_path, path)
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith(".arrow") and os.path.join(directory, name) != path:
+            try:
+                os.remove(os.path.join(directory, name))
+            except OSError:
+                pass
+
+
+def _read_table(path: str):
+    import pyarrow as pa
+
+    with _tables_lock:
+        table = _tables.get(path)
+        if table is None:
+            table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+            _tables[path] = table
+        return table
+
+
+def load_taskbook_table(csv_path: str = "Taskbook_cleaned_for_NLP.csv", cache_dir: Optional[str] = None):
+    """Memory-mapped Arrow table of the CSV plus derived columns, converting the CSV if needed"""
+    path, prefix = cache_path(csv_path, cache_dir)
+    if not os.path.exists(path):
+        print(f"📦 Converting {csv_path} to {path}")
+        _write_table(add_derived_columns(pd.read_csv(csv_path)), path, prefix)
+    return _read_table(path)
+
+
+def load_taskbook(csv_path: str = "Taskbook_cleaned_for_NLP.csv", cache_dir: Optional[str] = None) -> pd.DataFrame:
+    """
+    The CSV as a DataFrame with the derived columns. Each call returns a new
+    frame, so consumers can add or rename columns freely.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return add_derived_columns(pd.read_csv(csv_path))
+    return load_taskbook_table(csv_path, cache_dir).to_pandas()
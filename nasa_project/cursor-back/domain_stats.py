@@ -0,0 +1,57 @@
+"""
+Domain Stats
+Per-domain project statistics for the gap analyses: project counts, counts in
+recent fiscal-year windows and funding / team-size / ROI aggregates. The table is
+rolled up from an AggregateCube's domain x status x fiscal-year cells, so it
+costs a few hundred cells however many projects there are, and stays in step
+with the manager dashboards that read the same cube. The gap analyses used to
+run their own groupbys and re-filter the whole table per domain inside iterrows
+(O(domains x rows)); lookups here are plain index reads.
+
+    stats = DomainStats(AggregateCube(df), current_year=2025)
+    stats.count("Radiation"), stats.recent_count("Radiation", 5)
+    stats.table[["project_count", "recent_5yrs", "funding_sum"]]
+"""
+from datetime import datetime
+from typing import Optional, Sequence
+import pandas as pd
+from aggregate_cube import DIMENSIONS, AggregateCube
+
+RECENT_WINDOWS = (5, 7)
+
+# Output column -> (cube measure, statistic), used when the cube holds the measure
+MEASURE_AGGREGATES = {
+    "funding_sum": ("funding", "sum"),
+    "funding_mean": ("funding", "mean"),
+    "team_size_mean": ("team_size", "mean"),
+    "team_size_min": ("team_size", "min"),
+    "team_size_max": ("team_size", "max"),
+    "roi_mean": ("roi", "mean"),
+}
+
+
+class DomainStats:
+    """One row of statistics per domain, sorted by domain name like df.groupby"""
+
+    def __init__(self, cube: AggregateCube, current_year: Optional[int] = None,
+                 recent_windows: Sequence[int] = RECENT_WINDOWS):
+        self.current_year = current_year or datetime.now().year
+        self.recent_windows = tuple(recent_windows)
+        rollup = cube.rollup("domain")
+        columns = {"project_count": rollup["count"]}
+        for years in self.recent_windows:
+            recent = cube.rollup("domain", min_year=self.current_year - years)["count"]
+            columns[f"recent_{years}yrs"] = recent.reindex(rollup.index, fill_value=0)
+        for name, (measure, how) in MEASURE_AGGREGATES.items():
+            if measure in cube.measures:
+                columns[name] = cube.mean(measure) if how == "mean" else rollup[f"{measure}_{how}"]
+        self.table = pd.DataFrame(columns)
+        self.table.index.name = DIMENSIONS["domain"]
+
+    def count(self, domain: str) -> int:
+        """Projects in the domain (0 for unknown domains)"""
+        return int(self.table["project_count"].get(domain, 0))
+
+    def recent_count(self, domain: str, years: int) -> int:
+        """Projects in the domain from the last `years` fiscal years"""
+        return int(self.table[f"recent_{years}yrs"].get(domain, 0))
@@ -2,13 +2,13 @@
 Duplication & Waste Detector Service for Manager Dashboard
 Identifies overlapping or duplicate research projects to help reduce redundant efforts and save costs.
 """
-import pandas as pd
 import numpy as np
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 from typing import List, Dict, Any, Optional
 import os
 import json
+from dataset_cache import load_taskbook
 
 class DuplicationDetector:
     """Service for detecting duplicate or overlapping research projects."""
@@ -24,12 +24,12 @@ class DuplicationDetector:
             # Try to load from the duplication detector folder first
             taskbook_path = "../duplication_waste_detector/Taskbook_cleaned_for_NLP.csv"
             if os.path.exists(taskbook_path):
-                self.df = pd.read_csv(taskbook_path)
+                self.df = load_taskbook(taskbook_path)
             else:
                 # Fallback to the main taskbook file
                 taskbook_path = "Taskbook_cleaned_for_NLP.csv"
                 if os.path.exists(taskbook_path):
-                    self.df = pd.read_csv(taskbook_path)
+                    self.df = load_taskbook(taskbook_path)
                 else:
                     return False
             
@@ -63,14 +63,15 @@ class DuplicationDetector:
             if self.df is None:
                 return False
             
-            # Combine relevant text fields
-            self.df['combined_text'] = (
-                self.df.get('title', '').fillna('') + ' ' +
-                self.df.get('abstract', '').fillna('') + ' ' +
-                self.df.get('methods', '').fillna('') + ' ' +
-                self.df.get('results', '').fillna('') + ' ' +
-                self.df.get('conclusion', '').fillna('')
-            )
+            # Combine relevant text fields (the dataset cache already provides them)
+            if 'combined_text' not in self.df.columns:
+                self.df['combined_text'] = (
+                    self.df.get('title', '').fillna('') + ' ' +
+                    self.df.get('abstract', '').fillna('') + ' ' +
+                    self.df.get('methods', '').fillna('') + ' ' +
+                    self.df.get('results', '').fillna('') + ' ' +
+                    self.df.get('conclusion', '').fillna('')
+                )
             
             # Remove empty texts
             self.df = self.df[self.df['combined_text'].str.strip() != '']
@@ -0,0 +1,175 @@
+"""
+Shared Sentence Encoder Service
+One process-wide SentenceTransformer used by the AI chat, NASA AI, Hybrid AI and
+paper similarity services. Concurrent small encode calls are collected for a few
+milliseconds and run as a single forward pass.
+"""
+import os
+import queue
+import threading
+import time
+import numpy as np
+from typing import Any, Dict, List, Optional, Union
+
+DEFAULT_MODEL_NAME = "all-MiniLM-L6-v2"
+
+
+class _EncodeRequest:
+    """A pending encode call waiting for the batching worker"""
+
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.done = threading.Event()
+        self.result: Optional[np.ndarray] = None
+        self.error: Optional[BaseException] = None
+
+
+class EncoderService:
+    """Process-wide sentence encoder with dynamic batching and throughput counters"""
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, max_batch_size: int = 64, max_wait_ms: float = 5.0):
+        self.model_name = model_name
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._model = None
+        self._model_lock = threading.Lock()
+        self._encode_lock = threading.Lock()
+        self._queue: "queue.Queue[_EncodeRequest]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "texts": 0,
+            "batches": 0,
+            "batched_requests": 0,
+            "direct_calls": 0,
+            "max_batch_texts": 0,
+            "encode_seconds": 0.0,
+        }
+
+    def load(self) -> "EncoderService":
+        """Load the model once; safe to call from any thread"""
+        if self._model is None:
+            with self._model_lock:
+                if self._model is None:
+                    from sentence_transformers import SentenceTransformer
+                    print(f"Loading shared embedding model {self.model_name}...")
+                    self._model = SentenceTransformer(self.model_name)
+        return self
+
+    @property
+    def model(self):
+        return self.load()._model
+
+    def get_sentence_embedding_dimension(self) -> int:
+        return self.model.get_sentence_embedding_dimension()
+
+    def encode(self, texts: Union[str, List[str]], **kwargs) -> np.ndarray:
+        """
+        Encode texts with the shared model. Small calls without extra options are
+        merged with concurrent callers; bulk calls go straight to the model.
+        """
+        single = isinstance(texts, str)
+        text_list = [texts] if single else list(texts)
+        if not text_list:
+            return np.zeros((0, self.get_sentence_embedding_dimension()), dtype=np.float32)
+
+        if kwargs or len(text_list) >= self.max_batch_size:
+            embeddings = self._encode_direct(text_list, **kwargs)
+        else:
+            embeddings = self._encode_batched(text_list)
+        return embeddings[0] if single else embeddings
+
+    def _encode_direct(self, texts: List[str], **kwargs) -> np.ndarray:
+        model = self.model
+        start = time.perf_counter()
+        with self._encode_lock:
+            embeddings = model.encode(texts, **kwargs)
+        self._record(requests=1, texts=len(texts), batches=1, seconds=time.perf_counter() - start, direct=True)
+        return np.asarray(embeddings)
+
+    def _encode_batched(self, texts: List[str]) -> np.ndarray:
+        self.load()
+        self._ensure_worker()
+        request = _EncodeRequest(texts)
+        self._queue.put(request)
+        request.done.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._model_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run_worker, name="encoder-batcher", daemon=True)
+                    self._worker.start()
+
+    def _collect_batch(self) -> List[_EncodeRequest]:
+        """Block for one request, then gather more until the batch is full or the wait expires"""
+        batch = [self._queue.get()]
+        batch_texts = len(batch[0].texts)
+        deadline = time.perf_counter() + self.max_wait
+        while batch_texts < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            batch.append(request)
+            batch_texts += len(request.texts)
+        return batch
+
+    def _run_worker(self):
+        while True:
+            batch = self._collect_batch()
+            texts = [text for request in batch for text in request.texts]
+            start = time.perf_counter()
+            try:
+                with self._encode_lock:
+                    embeddings = np.asarray(self._model.encode(texts))
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+                    request.done.set()
+                continue
+
+            self._record(requests=len(batch), texts=len(texts), batches=1, seconds=time.perf_counter() - start)
+            offset = 0
+            for request in batch:
+                request.result = embeddings[offset:offset + len(request.texts)]
+                offset += len(request.texts)
+                request.done.set()
+
+    def _record(self, requests: int, texts: int, batches: int, seconds: float, direct: bool = False):
+        with self._stats_lock:
+            self._stats["requests"] += requests
+            self._stats["texts"] += texts
+            self._stats["batches"] += batches
+            self._stats["encode_seconds"] += seconds
+            self._stats["max_batch_texts"] = max(self._stats["max_batch_texts"], texts)
+            if direct:
+                self._stats["direct_calls"] += 1
+            else:
+                self._stats["batched_requests"] += requests
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput counters for monitoring"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["model_name"] = self.model_name
+        stats["loaded"] = self._model is not None
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_batch_texts"] = round(stats["texts"] / stats["batches"], 2) if stats["batches"] else 0
+        stats["texts_per_second"] = round(stats["texts"] / stats["encode_seconds"], 1) if stats["encode_seconds"] else 0
+        stats["encode_seconds"] = round(stats["encode_seconds"], 3)
+        return stats
+
+
+# Global instance
+encoder_service = EncoderService(
+    max_batch_size=int(os.environ.get("NASA_ENCODER_MAX_BATCH", "64")),
+    max_wait_ms=float(os.environ.get("NASA_ENCODER_MAX_WAIT_MS", "5")),
+)
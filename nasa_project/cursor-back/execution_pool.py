@@ -0,0 +1,224 @@
+"""
+Execution Pool
+Routes CPU-heavy work (summarization, TF-IDF knowledge graphs, hypothesis
+generation) to a dedicated process pool, so tokenization and sklearn work no
+longer hold the API process's GIL while light endpoints such as /api/papers and
+/api/manager/* are waiting to run. Each endpoint gets its own concurrency limit;
+requests over the limit wait their turn. The similarity matrices of
+paper_similarity_service.py and duplication_detector_service.py are not built by
+any route, so they have no pool task; add one with their endpoint.
+
+Worker processes are spawned (the API process runs background threads, which do
+not survive a fork), receive shared state once through the initializer and
+preload the models listed in NASA_POOL_PRELOAD.
+
+    NASA_PROCESS_POOL_SIZE       worker processes (default 2; 0 runs heavy work on threads)
+    NASA_POOL_PRELOAD            comma-separated loaders run at worker start (default summarizer,hypothesis)
+    NASA_POOL_LIMIT_<ENDPOINT>   concurrent calls for one endpoint, e.g. NASA_POOL_LIMIT_KNOWLEDGE_GRAPH=1
+    NASA_POOL_DEFAULT_LIMIT      limit for endpoints without their own setting (default 2)
+"""
+import asyncio
+import importlib
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, Iterable, Optional
+
+# Shared state of the current process: set by the initializer in workers, by configure() in the API process
+_worker_state: Dict[str, Any] = {}
+
+
+def worker_state() -> Dict[str, Any]:
+    return _worker_state
+
+
+def _init_worker(state: Dict[str, Any], preload: Iterable[str]):
+    """Runs once in every worker process before it accepts tasks"""
+    _worker_state.update(state)
+    _worker_state["in_worker"] = True
+    for target in preload:
+        module_name, _, function_name = target.partition(":")
+        try:
+            getattr(importlib.import_module(module_name), function_name)()
+        except Exception as e:
+            print(f"⚠️ Worker preload {target} failed: {e}")
+
+
+def _ping() -> int:
+    return os.getpid()
+
+
+class ExecutionPool:
+    """Process pool for CPU-heavy work with per-endpoint concurrency limits"""
+
+    def __init__(self, max_workers: int = 2, limits: Optional[Dict[str, int]] = None, default_limit: int = 2,
+                 preload: Iterable[str] = ()):
+        self.max_workers = max_workers
+        self.limits = dict(limits or {})
+        self.default_limit = default_limit
+        self.preload = list(preload)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+        self._stats_lock = threading.Lock()
+        self._endpoints: Dict[str, Dict[str, Any]] = {}
+        self.restarts = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def configure(self, **state):
+        """
+        Shared state (e.g. the paper records) handed to every worker at start-up.
+        Must be set before the first task; it is also visible to in-process tasks.
+        """
+        _worker_state.update(state)
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    state = {key: value for key, value in _worker_state.items() if key != "in_worker"}
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_init_worker,
+                        initargs=(state, self.preload),
+                    )
+        return self._executor
+
+    def _reset_broken(self, executor: ProcessPoolExecutor):
+        """A worker died (e.g. out of memory); start a fresh pool on the next task"""
+        with self._executor_lock:
+            if self._executor is executor:
+                self._executor = None
+                self.restarts += 1
+        executor.shutdown(wait=False)
+
+    def submit(self, fn: Callable, *args) -> Future:
+        """Run fn(*args) in a worker process; for callers on plain threads"""
+        if not self.enabled:
+            future: Future = Future()
+            try:
+                future.set_result(fn(*args))
+            except Exception as e:
+                future.set_exception(e)
+            return future
+        executor = self._get_executor()
+        try:
+            return executor.submit(fn, *args)
+        except BrokenProcessPool:
+            self._reset_broken(executor)
+            return self._get_executor().submit(fn, *args)
+
+    def start(self):
+        """Spawn the workers and run their preloads now rather than on the first request"""
+        if self.enabled:
+            for future in [self.submit(_ping) for _ in range(self.max_workers)]:
+                future.result()
+
+    def _semaphore(self, endpoint: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(endpoint)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.limits.get(endpoint, self.default_limit))
+            self._semaphores[endpoint] = semaphore
+        return semaphore
+
+    def _endpoint_stats(self, endpoint: str) -> Dict[str, Any]:
+        return self._endpoints.setdefault(endpoint, {
+            "limit": self.limits.get(endpoint, self.default_limit),
+            "waiting": 0,
+            "running": 0,
+            "completed": 0,
+            "failed": 0,
+            "busy_seconds": 0.0,
+        })
+
+    async def _limited(self, endpoint: str, call: Callable[[], Any]) -> Any:
+        with self._stats_lock:
+            self._endpoint_stats(endpoint)["waiting"] += 1
+        try:
+            await self._semaphore(endpoint).acquire()
+        finally:
+            with self._stats_lock:
+                self._endpoint_stats(endpoint)["waiting"] -= 1
+        with self._stats_lock:
+            self._endpoint_stats(endpoint)["running"] += 1
+        start = time.perf_counter()
+        try:
+            result = await call()
+            outcome = "completed"
+            return result
+        except BaseException:
+            outcome = "failed"
+            raise
+        finally:
+            self._semaphore(endpoint).release()
+            with self._stats_lock:
+                stats = self._endpoint_stats(endpoint)
+                stats["running"] -= 1
+                stats[outcome] += 1
+                stats["busy_seconds"] += time.perf_counter() - start
+
+    async def run(self, endpoint: str, fn: Callable, *args) -> Any:
+        """
+        Run a module-level fn(*args) in a worker process under the endpoint's limit.
+        With the pool disabled it runs on a thread instead.
+        """
+        async def call():
+            if not self.enabled:
+                return await asyncio.to_thread(fn, *args)
+            return await asyncio.wrap_future(self.submit(fn, *args))
+        return await self._limited(endpoint, call)
+
+    async def run_in_thread(self, endpoint: str, fn: Callable, *args) -> Any:
+        """
+        Run fn(*args) on a thread under the endpoint's limit, for handlers that
+        coordinate caches and batching and send only model calls to the workers.
+        """
+        return await self._limited(endpoint, lambda: asyncio.to_thread(fn, *args))
+
+    def shutdown(self):
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self) -> Dict[str, Any]:
+        """Pool size and per-endpoint queue and throughput counters"""
+        with self._stats_lock:
+            endpoints = {}
+            for name, stats in self._endpoints.items():
+                endpoints[name] = dict(stats)
+                endpoints[name]["busy_seconds"] = round(stats["busy_seconds"], 3)
+        return {
+            "enabled": self.enabled,
+            "max_workers": self.max_workers,
+            "started": self._executor is not None,
+            "restarts": self.restarts,
+            "preload": self.preload,
+            "endpoints": endpoints,
+        }
+
+
+def _limits_from_env() -> Dict[str, int]:
+    prefix = "NASA_POOL_LIMIT_"
+    return {key[len(prefix):].lower(): int(value) for key, value in os.environ.items() if key.startswith(prefix)}
+
+
+def execution_pool_from_env() -> ExecutionPool:
+    preload_names = os.environ.get("NASA_POOL_PRELOAD", "summarizer,hypothesis")
+    return ExecutionPool(
+        max_workers=int(os.environ.get("NASA_PROCESS_POOL_SIZE", "2")),
+        limits=_limits_from_env(),
+        default_limit=int(os.environ.get("NASA_POOL_DEFAULT_LIMIT", "2")),
+        preload=[f"worker_tasks:load_{name.strip()}" for name in preload_names.split(",") if name.strip()],
+    )
+
+
+# Global instance
+execution_pool = execution_pool_from_env()
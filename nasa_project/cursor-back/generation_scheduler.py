@@ -0,0 +1,136 @@
+"""
+Ollama Generation Scheduler
+Bounds how many generations run against the local Ollama model at once, turns
+requests away when too many are already waiting (callers then answer from the
+RAG system), and lets concurrent identical prompts share one generation.
+
+    NASA_OLLAMA_MAX_IN_FLIGHT  generations running at once (default 2)
+    NASA_OLLAMA_MAX_QUEUE      generations allowed to wait for a slot (default 8)
+"""
+import asyncio
+import hashlib
+import os
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional
+
+
+def prompt_key(model: str, prompt: str) -> str:
+    """Coalescing key: identical model and prompt (query plus RAG context)"""
+    return hashlib.sha1(f"{model}\0{prompt}".encode("utf-8")).hexdigest()
+
+
+class GenerationScheduler:
+    """Admission control, concurrency limit and request coalescing for generations"""
+
+    def __init__(self, max_in_flight: int = 2, max_queue: int = 8, wait_samples: int = 1000):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self._semaphore = asyncio.Semaphore(max_in_flight)
+        self._pending: Dict[str, "asyncio.Task"] = {}
+        self._waiting = 0
+        self._running = 0
+        self._wait_times = deque(maxlen=wait_samples)
+        self._stats = {
+            "submitted": 0,
+            "coalesced": 0,
+            "rejected": 0,
+            "completed": 0,
+            "failed": 0,
+            "max_queue_depth": 0,
+            "generation_seconds": 0.0,
+        }
+
+    @property
+    def queue_depth(self) -> int:
+        return self._waiting
+
+    def _admit(self) -> bool:
+        if self._waiting >= self.max_queue:
+            self._stats["rejected"] += 1
+            return False
+        return True
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[bool]:
+        """
+        Hold one generation slot for the duration of the block. Yields False without
+        waiting when the queue is full, so the caller can degrade instead.
+        """
+        if not self._admit():
+            yield False
+            return
+        self._stats["submitted"] += 1
+        self._waiting += 1
+        self._stats["max_queue_depth"] = max(self._stats["max_queue_depth"], self._waiting)
+        queued_at = time.perf_counter()
+        try:
+            await self._semaphore.acquire()
+        finally:
+            self._waiting -= 1
+        self._wait_times.append(time.perf_counter() - queued_at)
+        self._running += 1
+        started_at = time.perf_counter()
+        try:
+            yield True
+            self._stats["completed"] += 1
+        except BaseException:
+            self._stats["failed"] += 1
+            raise
+        finally:
+            self._stats["generation_seconds"] += time.perf_counter() - started_at
+            self._running -= 1
+            self._semaphore.release()
+
+    async def _run(self, generate: Callable[[], Awaitable[str]]) -> Optional[str]:
+        async with self.slot() as admitted:
+            if not admitted:
+                return None
+            return await generate()
+
+    async def submit(self, key: str, generate: Callable[[], Awaitable[str]]) -> Optional[str]:
+        """
+        Run generate() under the concurrency limit, sharing the result with every
+        concurrent caller using the same key. Returns None when the request was not
+        admitted. The generation runs as its own task, so a caller disconnecting
+        does not cancel it for the others.
+        """
+        task = self._pending.get(key)
+        if task is not None:
+            self._stats["coalesced"] += 1
+            return await asyncio.shield(task)
+        if self._waiting >= self.max_queue:
+            self._stats["rejected"] += 1
+            return None
+
+        task = asyncio.ensure_future(self._run(generate))
+        self._pending[key] = task
+        task.add_done_callback(lambda _: self._pending.pop(key, None))
+        return await asyncio.shield(task)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue depth, wait times and outcome counters for monitoring"""
+        waits = sorted(self._wait_times)
+        stats = dict(self._stats)
+        finished = stats["completed"] + stats["failed"]
+        stats.update({
+            "max_in_flight": self.max_in_flight,
+            "max_queue": self.max_queue,
+            "in_flight": self._running,
+            "queue_depth": self._waiting,
+            "coalescing_keys": len(self._pending),
+            "avg_wait_ms": round(sum(waits) / len(waits) * 1000, 2) if waits else 0,
+            "p95_wait_ms": round(waits[int(0.95 * (len(waits) - 1))] * 1000, 2) if waits else 0,
+            "max_wait_ms": round(waits[-1] * 1000, 2) if waits else 0,
+            "avg_generation_seconds": round(stats["generation_seconds"] / finished, 3) if finished else 0,
+        })
+        stats["generation_seconds"] = round(stats["generation_seconds"], 3)
+        return stats
+
+
+# Global instance
+generation_scheduler = GenerationScheduler(
+    max_in_flight=int(os.environ.get("NASA_OLLAMA_MAX_IN_FLIGHT", "2")),
+    max_queue=int(os.environ.get("NASA_OLLAMA_MAX_QUEUE", "8")),
+)
@@ -0,0 +1,62 @@
+"""
+HTTP Caching Helpers
+ETag / Last-Modified validators and 304 Not Modified handling for responses built
+from data that only changes when the server reloads it, so browsers and CDNs can
+cache them and revalidate cheaply.
+
+    NASA_HTTP_MAX_AGE   seconds clients may reuse a response before revalidating (default 300)
+"""
+import hashlib
+import os
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Optional
+from fastapi import Request
+from fastapi.responses import Response
+
+HTTP_MAX_AGE = int(os.environ.get("NASA_HTTP_MAX_AGE", "300"))
+
+
+def body_etag(body: bytes) -> str:
+    """Strong validator for an exact response body"""
+    return '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    if if_none_match.strip() == "*":
+        return True
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _not_modified_since(if_modified_since: str, last_modified: float) -> bool:
+    try:
+        since = parsedate_to_datetime(if_modified_since).timestamp()
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return int(last_modified) <= since
+
+
+def conditional_response(request: Request, body: bytes, last_modified: Optional[float] = None,
+                         etag: Optional[str] = None, media_type: str = "application/json") -> Response:
+    """
+    The body with ETag, Last-Modified and Cache-Control headers, or an empty 304
+    when the request's If-None-Match (or, without it, If-Modified-Since) shows
+    the client already has this version.
+    """
+    etag = etag or body_etag(body)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={HTTP_MAX_AGE}"}
+    if last_modified is not None:
+        headers["Last-Modified"] = formatdate(last_modified, usegmt=True)
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        not_modified = _etag_matches(if_none_match, etag)
+    else:
+        if_modified_since = request.headers.get("if-modified-since")
+        not_modified = (if_modified_since is not None and last_modified is not None
+                        and _not_modified_since(if_modified_since, last_modified))
+    if not_modified:
+        return Response(status_code=304, headers=headers)
+    return Response(body, media_type=media_type, headers=headers)
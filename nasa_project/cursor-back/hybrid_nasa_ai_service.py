@@ -1,13 +1,27 @@
 import os
 import sys
 import json
-import pickle
+import asyncio
+import threading
 import numpy as np
-import requests
-from sentence_transformers import SentenceTransformer
 import faiss
+import httpx
 import re
-from typing import List, Dict, Any, Optional
+from encoder_service import encoder_service
+from vector_store import open_rag_chunk_store
+from ann_index import rag_search_index
+from query_cache import QueryCache
+from ollama_client import OllamaClient
+from generation_scheduler import generation_scheduler, prompt_key
+from ollama_health import health_monitor_from_env
+from typing import AsyncIterator, List, Dict, Any, Optional
+
+OLLAMA_OPTIONS = {
+    "temperature": 0.7,
+    "top_p": 0.9,
+    "top_k": 50,
+    "repeat_penalty": 1.1
+}
 
 class HybridNASA_AI:
     """Hybrid NASA AI service combining Ollama model with RAG system"""
@@ -18,20 +32,39 @@ class HybridNASA_AI:
         self.chunks = None
         self.rag_system_path = os.path.abspath(rag_system_path)
         self.ollama_model = ollama_model
-        self.ollama_available = False
-        self.ollama_base_url = "http://localhost:11434"
+        self.ollama_base_url = os.environ.get("OLLAMA_BASE_URL", "http://localhost:11434")
+        self.ollama = OllamaClient(self.ollama_base_url)
+        # Availability comes from a circuit breaker fed by a background probe
+        self.health = health_monitor_from_env(self.probe_ollama)
+        self.query_cache = QueryCache()
+        self._announced_model = None
+        self._loaded = False
+        self._load_lock = threading.Lock()
         
         print(f"RAG system path: {self.rag_system_path}")
-        self.load_components()
-        self.check_ollama_availability()
+    
+    def ensure_loaded(self) -> "HybridNASA_AI":
+        """Load RAG components and start the Ollama health monitor on first use instead of at import time"""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load_components()
+                    self.health.start()
+                    self._loaded = True
+        return self
+    
+    @property
+    def ollama_available(self) -> bool:
+        """True while the Ollama circuit breaker is closed"""
+        return self.health.breaker.is_closed
     
     def load_components(self):
         """Load the RAG system components"""
         try:
             print("Loading Hybrid NASA AI components...")
             
-            # Load embedding model
-            self.embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+            # Use the process-wide shared embedding model
+            self.embedding_model = encoder_service.load()
             
             # Load RAG components
             faiss_path = os.path.join(self.rag_system_path, "faiss_index.bin")
@@ -39,8 +72,11 @@ class HybridNASA_AI:
             
             if os.path.exists(faiss_path) and os.path.exists(chunks_path):
                 self.faiss_index = faiss.read_index(faiss_path)
-                with open(chunks_path, "rb") as f:
-                    self.chunks = pickle.load(f)
+                # Chunk metadata is memory-mapped from a store rebuilt whenever chunks.pkl changes
+                self.chunks = open_rag_chunk_store(self.rag_system_path, self.faiss_index,
+                                                   encoder_service.model_name, encoder_service.encode)
+                # Swap in an IVF/HNSW index when NASA_ANN_INDEX asks for one
+                self.faiss_index = rag_search_index(self.faiss_index, self.chunks)
                 print(f"✅ RAG system loaded with {len(self.chunks)} research chunks")
             else:
                 print("❌ RAG system files not found")
@@ -48,42 +84,60 @@ class HybridNASA_AI:
         except Exception as e:
             print(f"❌ Error loading RAG components: {e}")
     
-    def check_ollama_availability(self):
-        """Check if Ollama is running and the model is available"""
-        try:
-            # Check if Ollama is running
-            response = requests.get(f"{self.ollama_base_url}/api/tags", timeout=5)
-            if response.status_code == 200:
-                models = response.json().get("models", [])
-                model_names = [model.get("name", "") for model in models]
-                
-                # Check if our NASA model is available
-                if any("nasa" in name.lower() or "ollama-nasa-model" in name.lower() for name in model_names):
-                    self.ollama_available = True
-                    print(f"✅ Ollama NASA model found: {[name for name in model_names if 'nasa' in name.lower()]}")
-                else:
-                    print(f"⚠️ Ollama running but NASA model not found. Available models: {model_names}")
-                    # Try to use any available model as fallback
-                    if model_names:
-                        self.ollama_available = True
-                        self.ollama_model = model_names[0]  # Use first available model
-                        print(f"🔄 Using fallback model: {self.ollama_model}")
-            else:
-                print("❌ Ollama not responding")
-        except Exception as e:
-            print(f"❌ Ollama not available: {e}")
+    def probe_ollama(self):
+        """Health probe: raises unless Ollama is running with a usable model"""
+        model_names = self.ollama.list_models_sync(timeout=2)
+        if not model_names:
+            raise RuntimeError("Ollama running but no models are available")
+        
+        # Check if our NASA model is available
+        nasa_models = [name for name in model_names if "nasa" in name.lower() or "ollama-nasa-model" in name.lower()]
+        if nasa_models:
+            if not any(self.ollama_model in name for name in nasa_models):
+                self.ollama_model = nasa_models[0]
+            if self._announced_model != self.ollama_model:
+                print(f"✅ Ollama NASA model found: {nasa_models}")
+        elif self.ollama_model not in model_names:
+            print(f"⚠️ Ollama running but NASA model not found. Available models: {model_names}")
+            # Try to use any available model as fallback
+            self.ollama_model = model_names[0]  # Use first available model
+            print(f"🔄 Using fallback model: {self.ollama_model}")
+        self._announced_model = self.ollama_model
+    
+    def check_ollama_availability(self) -> bool:
+        """Probe Ollama right now and update the circuit breaker"""
+        return self.health.probe_now()
+    
+    def _record_ollama_failure(self, error: Exception):
+        # Trip the breaker after repeated failures and let the monitor re-probe soon
+        self.health.breaker.record_failure(error)
+        self.health.wake()
     
     def search_context(self, query: str, top_k: int = 8) -> List[Dict[str, Any]]:
         """Search for relevant context using RAG"""
-        if not self.embedding_model or not self.faiss_index or not self.chunks:
-            return []
+        return self.search_context_batch([query], top_k)[0]
+    
+    def search_context_batch(self, queries: List[str], top_k: int = 8) -> List[List[Dict[str, Any]]]:
+        """Search context for many queries with one encoder pass and one (N, d) index search"""
+        self.ensure_loaded()
+        if not queries or not self.embedding_model or not self.faiss_index or not self.chunks:
+            return [[] for _ in queries]
         
         try:
-            query_embedding = self.embedding_model.encode([query])
-            D, I = self.faiss_index.search(query_embedding, top_k)
-            
+            return self.query_cache.search(list(queries), top_k, (self.chunks.version, id(self.faiss_index)),
+                                           self.embedding_model.encode,
+                                           lambda embeddings: self._search_embeddings(embeddings, top_k))
+        except Exception as e:
+            print(f"Search error: {e}")
+            return [[] for _ in queries]
+    
+    def _search_embeddings(self, query_embeddings: np.ndarray, top_k: int) -> List[List[Dict[str, Any]]]:
+        D, I = self.faiss_index.search(query_embeddings, top_k)
+        
+        batch_results = []
+        for row_ids, row_scores in zip(I, D):
             results = []
-            for i, score in zip(I[0], D[0]):
+            for i, score in zip(row_ids, row_scores):
                 if i != -1:
                     chunk = self.chunks[i]
                     results.append({
@@ -93,20 +147,13 @@ class HybridNASA_AI:
                         'section': chunk.get('section', 'N/A'),
                         'score': float(score)
                     })
-            return results
-        except Exception as e:
-            print(f"Search error: {e}")
-            return []
+            batch_results.append(results)
+        return batch_results
     
-    def get_ollama_response(self, query: str, context: str = "") -> str:
-        """Get response from Ollama model"""
-        if not self.ollama_available:
-            return ""
-        
-        try:
-            # Prepare the prompt with context
-            if context:
-                prompt = f"""You are a NASA Research Assistant specialized in space science. Based on the following NASA research context, provide a detailed and accurate answer to the user's question.
+    def build_prompt(self, query: str, context: str = "") -> str:
+        """Prompt sent to the Ollama model, with RAG context when there is any"""
+        if context:
+            return f"""You are a NASA Research Assistant specialized in space science. Based on the following NASA research context, provide a detailed and accurate answer to the user's question.
 
 NASA Research Context:
 {context}
@@ -114,46 +161,61 @@ NASA Research Context:
 User Question: {query}
 
 Please provide a comprehensive answer based on the NASA research context above. Include specific details, scientific accuracy, and cite relevant findings when possible."""
-            else:
-                prompt = f"""You are a NASA Research Assistant specialized in space science. Answer the following question with detailed, scientifically accurate information about NASA research and space science.
+        return f"""You are a NASA Research Assistant specialized in space science. Answer the following question with detailed, scientifically accurate information about NASA research and space science.
 
 Question: {query}
 
 Provide a comprehensive answer with specific details about NASA research findings, space missions, and scientific discoveries."""
-            
-            # Call Ollama API
-            payload = {
-                "model": self.ollama_model,
-                "prompt": prompt,
-                "stream": False,
-                "options": {
-                    "temperature": 0.7,
-                    "top_p": 0.9,
-                    "top_k": 50,
-                    "repeat_penalty": 1.1
-                }
-            }
-            
-            response = requests.post(
-                f"{self.ollama_base_url}/api/generate",
-                json=payload,
-                timeout=30
+    
+    def get_ollama_response(self, query: str, context: str = "") -> str:
+        """Get response from Ollama model"""
+        if not self.ollama_available:
+            return ""
+        
+        try:
+            response = self.ollama.generate_sync(self.ollama_model, self.build_prompt(query, context), OLLAMA_OPTIONS)
+            self.health.breaker.record_success()
+            return response
+        except httpx.HTTPStatusError as e:
+            print(f"Ollama API error: {e.response.status_code}")
+            self._record_ollama_failure(e)
+            return ""
+        except Exception as e:
+            print(f"Ollama request error: {e}")
+            self._record_ollama_failure(e)
+            return ""
+    
+    async def aget_ollama_response(self, query: str, context: str = "") -> Optional[str]:
+        """
+        Get response from Ollama model without blocking the event loop. Goes through
+        the generation scheduler: identical concurrent prompts share one generation,
+        and None means the queue was full and the caller should answer from RAG.
+        """
+        if not self.ollama_available:
+            return ""
+        
+        try:
+            prompt = self.build_prompt(query, context)
+            response = await generation_scheduler.submit(
+                prompt_key(self.ollama_model, prompt),
+                lambda: self.ollama.generate(self.ollama_model, prompt, OLLAMA_OPTIONS)
             )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "")
-            else:
-                print(f"Ollama API error: {response.status_code}")
-                return ""
-                
+            if response is not None:
+                self.health.breaker.record_success()
+            return response
+        except httpx.HTTPStatusError as e:
+            print(f"Ollama API error: {e.response.status_code}")
+            self._record_ollama_failure(e)
+            return ""
         except Exception as e:
             print(f"Ollama request error: {e}")
+            self._record_ollama_failure(e)
             return ""
     
-    def generate_rag_response(self, query: str) -> str:
-        """Generate response using RAG system only"""
-        context_results = self.search_context(query, top_k=8)
+    def generate_rag_response(self, query: str, context_results: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate response using RAG system only; pass context_results to reuse a retrieval"""
+        if context_results is None:
+            context_results = self.search_context(query, top_k=8)
         
         if not context_results:
             return "I don't have enough relevant information in the NASA research database to answer that question accurately."
@@ -247,12 +309,8 @@ The findings represent decades of scientific investigation and continue to infor
         
         return response
     
-    def generate_hybrid_response(self, query: str) -> Dict[str, Any]:
-        """Generate hybrid response combining Ollama and RAG"""
-        # Get context from RAG system
-        context_results = self.search_context(query, top_k=8)
-        
-        # Prepare context string for Ollama
+    def build_context_text(self, context_results: List[Dict[str, Any]]) -> str:
+        """Prepare context string for Ollama"""
         context_text = ""
         if context_results:
             context_texts = []
@@ -263,16 +321,10 @@ The findings represent decades of scientific investigation and continue to infor
                     text = text[:200] + "..."
                 context_texts.append(f"Paper {result['paper_id']}: {text}")
             context_text = "\\n\\n".join(context_texts)
-        
-        # Try to get Ollama response first
-        ollama_response = ""
-        if self.ollama_available:
-            ollama_response = self.get_ollama_response(query, context_text)
-        
-        # Fallback to RAG if Ollama fails
-        if not ollama_response:
-            ollama_response = self.generate_rag_response(query)
-        
+        return context_text
+    
+    def format_result(self, response: str, context_results: List[Dict[str, Any]], degraded: bool = False) -> Dict[str, Any]:
+        """Response payload with sources and system status; degraded marks a RAG answer given because Ollama was busy"""
         # Format sources
         sources_info = f"Based on {len(context_results)} NASA research papers"
         if context_results:
@@ -280,18 +332,96 @@ The findings represent decades of scientific investigation and continue to infor
             sources_info += f" (including papers: {', '.join(paper_ids[:5])})"
         
         # Determine response type
-        response_type = "Hybrid (Ollama + RAG)" if self.ollama_available else "RAG System"
+        if degraded:
+            response_type = "RAG System (Ollama busy)"
+        else:
+            response_type = "Hybrid (Ollama + RAG)" if self.ollama_available else "RAG System"
         
         return {
-            "response": ollama_response,
+            "response": response,
             "sources": context_results,
             "sources_info": sources_info,
             "confidence": "High" if context_results else "Low",
             "paper_count": len(context_results),
             "response_type": response_type,
-            "ollama_available": self.ollama_available
+            "ollama_available": self.ollama_available,
+            "ollama_breaker": self.health.breaker.snapshot(),
+            "degraded": degraded
         }
     
+    def generate_hybrid_response(self, query: str) -> Dict[str, Any]:
+        """Generate hybrid response combining Ollama and RAG"""
+        self.ensure_loaded()
+        
+        # Get context from RAG system
+        context_results = self.search_context(query, top_k=8)
+        context_text = self.build_context_text(context_results)
+        
+        # Try to get Ollama response first
+        ollama_response = ""
+        if self.ollama_available:
+            ollama_response = self.get_ollama_response(query, context_text)
+        
+        # Fallback to RAG if Ollama fails
+        if not ollama_response:
+            ollama_response = self.generate_rag_response(query, context_results)
+        
+        return self.format_result(ollama_response, context_results)
+    
+    async def agenerate_hybrid_response(self, query: str) -> Dict[str, Any]:
+        """Async variant: retrieval runs in a worker thread, Ollama over the pooled async client"""
+        await asyncio.to_thread(self.ensure_loaded)
+        context_results = await asyncio.to_thread(self.search_context, query, 8)
+        context_text = self.build_context_text(context_results)
+        
+        ollama_response = ""
+        if self.ollama_available:
+            ollama_response = await self.aget_ollama_response(query, context_text)
+        degraded = ollama_response is None
+        
+        if not ollama_response:
+            ollama_response = self.generate_rag_response(query, context_results)
+        
+        return self.format_result(ollama_response, context_results, degraded)
+    
+    async def stream_hybrid_response(self, query: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Yield chat events as they become available: the sources first, then answer
+        tokens from Ollama, then a final "done" event. Falls back to the RAG answer
+        as a single token when Ollama is unavailable or fails before producing text.
+        """
+        await asyncio.to_thread(self.ensure_loaded)
+        context_results = await asyncio.to_thread(self.search_context, query, 8)
+        result = self.format_result("", context_results)
+        yield {"type": "sources", **{key: value for key, value in result.items() if key != "response"}}
+        
+        streamed = []
+        degraded = False
+        if self.ollama_available:
+            prompt = self.build_prompt(query, self.build_context_text(context_results))
+            async with generation_scheduler.slot() as admitted:
+                degraded = not admitted
+                if admitted:
+                    try:
+                        async for token in self.ollama.stream(self.ollama_model, prompt, OLLAMA_OPTIONS):
+                            streamed.append(token)
+                            yield {"type": "token", "text": token}
+                    except Exception as e:
+                        print(f"Ollama stream error: {e}")
+                        self._record_ollama_failure(e)
+                        if streamed:
+                            yield {"type": "error", "detail": "Ollama stream interrupted"}
+        
+        if not streamed:
+            fallback = self.generate_rag_response(query, context_results)
+            streamed.append(fallback)
+            yield {"type": "token", "text": fallback}
+        
+        final = self.format_result("", context_results, degraded)
+        yield {"type": "done", "response": "".join(streamed), "response_type": final["response_type"],
+               "ollama_available": self.ollama_available, "ollama_breaker": self.health.breaker.snapshot(),
+               "degraded": degraded}
+    
     def chat(self, message: str) -> Dict[str, Any]:
         """Main chat function for website integration"""
         try:
@@ -313,6 +443,25 @@ The findings represent decades of scientific investigation and continue to infor
                 "sources": [],
                 "confidence": "Low"
             }
+    
+    async def achat(self, message: str) -> Dict[str, Any]:
+        """Async chat for the FastAPI handlers"""
+        try:
+            if not message.strip():
+                return {
+                    "response": "Please enter a question about NASA space biology research.",
+                    "sources": [],
+                    "confidence": "Low"
+                }
+            
+            return await self.agenerate_hybrid_response(message)
+            
+        except Exception as e:
+            return {
+                "response": f"❌ Error: {str(e)}",
+                "sources": [],
+                "confidence": "Low"
+            }
 
 # Initialize the Hybrid NASA AI service
 hybrid_nasa_ai = HybridNASA_AI()
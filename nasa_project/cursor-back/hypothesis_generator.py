@@ -8,6 +8,19 @@ import re
 from collections import Counter
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from keyword_tagger import KeywordTagger
+
+# Domain keyword mapping
+DOMAIN_KEYWORDS = {
+    'Radiation': ['radiation', 'irradiation', 'dose', 'exposure', 'gamma', 'x-ray'],
+    'Human Physiology': ['bone', 'muscle', 'cardiovascular', 'immune', 'microgravity', 'atrophy', 'density'],
+    'Psychology': ['psychology', 'behavior', 'mental', 'cognitive', 'stress', 'isolation'],
+    'Plants': ['plant', 'crop', 'agriculture', 'growth', 'seed', 'root', 'leaf'],
+    'Cell Biology': ['cell', 'cellular', 'mitochondria', 'protein', 'gene', 'expression'],
+    'Molecular Biology': ['molecular', 'dna', 'rna', 'protein', 'enzyme', 'metabolism']
+}
+domain_tagger = KeywordTagger(DOMAIN_KEYWORDS, default='General Biology')
+
 
 class HypothesisGenerator:
     """Generate scientific hypotheses based on NASA space biology research data"""
@@ -28,7 +41,7 @@ class HypothesisGenerator:
         try:
             self.papers_df = pd.read_csv(self.papers_data_path)
             # Add domain assignment immediately after loading
-            self.papers_df['Assigned_Domain'] = self.papers_df['Title'].apply(self._assign_domain_from_title)
+            self.papers_df['Assigned_Domain'] = self._assign_domains_from_titles(self.papers_df['Title'])
             print(f"✅ Loaded {len(self.papers_df)} NASA papers for hypothesis generation")
         except Exception as e:
             print(f"❌ Error loading papers data: {e}")
@@ -90,28 +103,10 @@ class HypothesisGenerator:
         except Exception:
             return None
     
-    def _assign_domain_from_title(self, title: str) -> str:
-        """Assign research domain based on title keywords"""
-        if pd.isna(title):
-            return 'Unknown'
-        
-        title_lower = title.lower()
-        
-        # Domain keyword mapping
-        domain_keywords = {
-            'Radiation': ['radiation', 'irradiation', 'dose', 'exposure', 'gamma', 'x-ray'],
-            'Human Physiology': ['bone', 'muscle', 'cardiovascular', 'immune', 'microgravity', 'atrophy', 'density'],
-            'Psychology': ['psychology', 'behavior', 'mental', 'cognitive', 'stress', 'isolation'],
-            'Plants': ['plant', 'crop', 'agriculture', 'growth', 'seed', 'root', 'leaf'],
-            'Cell Biology': ['cell', 'cellular', 'mitochondria', 'protein', 'gene', 'expression'],
-            'Molecular Biology': ['molecular', 'dna', 'rna', 'protein', 'enzyme', 'metabolism']
-        }
-        
-        for domain, keywords in domain_keywords.items():
-            if any(keyword in title_lower for keyword in keywords):
-                return domain
-        
-        return 'General Biology'
+    def _assign_domains_from_titles(self, titles: pd.Series) -> pd.Series:
+        """Assign research domains based on title keywords"""
+        domains = pd.Series(domain_tagger.first_match(titles.fillna('')), index=titles.index, dtype=object)
+        return domains.mask(titles.isna(), 'Unknown')
     
     def generate_hypotheses(self, query: str, role: str = "scientist") -> List[Dict[str, Any]]:
         """Generate scientific hypotheses based on query"""
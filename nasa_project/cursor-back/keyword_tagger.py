@@ -0,0 +1,133 @@
+"""
+Keyword Tagger
+Assigns domains (or any keyword categories) to a whole column of texts at once,
+replacing the per-row "for domain, keywords ... if kw in text" loops that were
+copied into the dashboards, the data processor and the agents.
+
+A keyword "matches" a text when it occurs anywhere in it as a substring, exactly
+like `keyword in text`. Three views of the result are offered:
+
+    first_match  first category (taxonomy order) with any matching keyword
+    all_matches  every category with a matching keyword, in taxonomy order
+    scores       number of distinct matching keywords per category
+
+The taxonomy is compiled once: keywords are deduplicated into a keyword x
+category matrix, and a keyword that contains another keyword is only searched
+for in texts that contain the shorter one. For category presence only the
+shortest keywords of each category are needed. Searches use str's substring
+search, which scans far faster than a combined regex in Python's re module.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+import pandas as pd
+
+# Task Book domains used by the manager dashboard and analysis scripts
+TASKBOOK_DOMAINS = {
+    "Plants": ["plant", "flora", "crop", "seed", "photosynth", "phyt", "agri", "leaf", "root"],
+    "Microbes": ["microbe", "microbial", "bacteria", "bacterial", "virus", "fungi", "fungal",
+                 "staphyl", "streptoc", "pathogen", "microorganism"],
+    "Radiation": ["radiation", "ionizing", "cosmic", "radiol", "shield", "dosimetry", "radiobiology"],
+    "Psychology": ["psych", "behavior", "crew", "cognitive", "sleep", "social", "mental",
+                   "stress", "isolation"],
+    "Human Physiology": ["cardio", "cardiovascular", "musculo", "bone", "neuro",
+                         "endocrine", "immune"],
+}
+TASKBOOK_TEXT_COLUMNS = ["Title", "Abstract", "Methods", "Results"]
+
+
+def text_column(df: pd.DataFrame, columns: Sequence[str], lowercase: bool = True) -> pd.Series:
+    """
+    Row texts joined from the given columns, as " ".join(str(row.get(col, "")))
+    would build them: missing columns are empty and missing values read "nan".
+    """
+    parts = [df[col].astype(str) if col in df.columns else pd.Series("", index=df.index) for col in columns]
+    text = parts[0]
+    for part in parts[1:]:
+        text = text + " " + part
+    return text.str.lower() if lowercase else text
+
+
+class KeywordTagger:
+    """Multi-pattern keyword matcher for one taxonomy of categories"""
+
+    def __init__(self, taxonomy: Dict[str, List[str]], default: str = "Other", lowercase: bool = True):
+        self.categories = list(taxonomy)
+        self.default = default
+        self.lowercase = lowercase
+        self.keywords = sorted({kw for keywords in taxonomy.values() for kw in keywords})
+        keyword_ids = self._keyword_ids = {kw: i for i, kw in enumerate(self.keywords)}
+
+        # keyword x category membership; a keyword may belong to several categories
+        self._membership = np.zeros((len(self.keywords), len(self.categories)), dtype=np.int32)
+        for j, category in enumerate(self.categories):
+            for kw in set(taxonomy[category]):
+                self._membership[keyword_ids[kw], j] = 1
+
+        # Keywords contained in each keyword: if one of them is absent, so is the keyword
+        self._contained = [[keyword_ids[other] for other in self.keywords if other != kw and other in kw]
+                           for kw in self.keywords]
+        # Shorter keywords first, so contained keywords are decided before the ones containing them
+        self._search_order = sorted(range(len(self.keywords)), key=lambda k: len(self.keywords[k]))
+        # Shortest keywords of each category, enough to decide whether the category matches
+        self._presence = []
+        for category in self.categories:
+            keywords = list(dict.fromkeys(taxonomy[category]))
+            self._presence.append(tuple(kw for kw in keywords
+                                        if not any(other != kw and other in kw for other in keywords)))
+
+    def _prepare(self, texts: Iterable[str]) -> List[str]:
+        return [str(text).lower() if self.lowercase else str(text) for text in texts]
+
+    def keyword_hits(self, texts: Iterable[str]) -> np.ndarray:
+        """Boolean texts x keywords matrix: whether each keyword occurs in each text"""
+        texts = self._prepare(texts)
+        hits = np.zeros((len(texts), len(self.keywords)), dtype=bool)
+        for i, text in enumerate(texts):
+            row = [False] * len(self.keywords)
+            for k in self._search_order:
+                row[k] = all(row[c] for c in self._contained[k]) and self.keywords[k] in text
+            hits[i] = row
+        return hits
+
+    def scores(self, texts: Iterable[str]) -> np.ndarray:
+        """Texts x categories matrix of distinct matching keywords"""
+        return self.keyword_hits(texts).astype(np.int32) @ self._membership
+
+    def scores_frame(self, texts: Iterable[str], index: Optional[pd.Index] = None) -> pd.DataFrame:
+        return pd.DataFrame(self.scores(texts), columns=self.categories, index=index)
+
+    def matches(self, texts: Iterable[str]) -> np.ndarray:
+        """Boolean texts x categories matrix: whether any keyword of the category occurs"""
+        texts = self._prepare(texts)
+        matched = np.zeros((len(texts), len(self.categories)), dtype=bool)
+        for i, text in enumerate(texts):
+            matched[i] = [any(kw in text for kw in keywords) for keywords in self._presence]
+        return matched
+
+    def first_match(self, texts: Iterable[str], default: Optional[str] = None) -> List[str]:
+        """First category in taxonomy order with any matching keyword"""
+        default = self.default if default is None else default
+        first = []
+        for text in self._prepare(texts):
+            first.append(next((category for category, keywords in zip(self.categories, self._presence)
+                               if any(kw in text for kw in keywords)), default))
+        return first
+
+    def best_match(self, texts: Iterable[str], default: Optional[str] = None) -> List[str]:
+        """Category with the most matching keywords; ties go to the earlier category"""
+        default = self.default if default is None else default
+        scores = self.scores(texts)
+        best = scores.argmax(axis=1)
+        return [self.categories[j] if scores[i, j] > 0 else default for i, j in enumerate(best)]
+
+    def all_matches(self, texts: Iterable[str]) -> List[List[str]]:
+        """Every category with a matching keyword, in taxonomy order"""
+        return [[self.categories[j] for j in np.flatnonzero(row)] for row in self.matches(texts)]
+
+    def assign(self, df: pd.DataFrame, columns: Sequence[str] = TASKBOOK_TEXT_COLUMNS) -> pd.Series:
+        """First-match category for every row of df, from the joined text columns"""
+        return pd.Series(self.first_match(text_column(df, columns)), index=df.index, dtype=object)
+
+
+# Shared tagger for the Task Book domains
+taskbook_domain_tagger = KeywordTagger(TASKBOOK_DOMAINS)
@@ -0,0 +1,303 @@
+"""
+Knowledge Graph Engine
+Research-area, methodology and paper nodes plus similarity, citation, keyword and
+author edges over the whole paper corpus. The graph depends only on the papers,
+so it is built once per dataset version and the serialized response is cached
+per role. Papers added later are folded in incrementally: per-paper counts,
+term counts and co-author pairs are only computed for the new papers.
+
+Similarity edges link each paper to its most similar papers (TF-IDF cosine over
+hashed term counts), computed in row blocks so the full dense matrix is never
+materialized.
+
+    NASA_KG_SIMILAR_PER_PAPER     similarity edges kept per paper (default 5)
+    NASA_KG_SIMILARITY_THRESHOLD  minimum cosine similarity for an edge (default 0.1)
+"""
+import hashlib
+import json
+import os
+import threading
+import zlib
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+import numpy as np
+import scipy.sparse as sp
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.preprocessing import normalize
+
+# Roles the graph is served for; responses are cached per role
+ROLES = ("Scientist", "Manager", "Mission Planner")
+
+AREA_KEYWORDS = {
+    'Microgravity Effects': ['microgravity', 'zero gravity', 'weightlessness', 'space environment'],
+    'Stem Cell Research': ['stem cell', 'embryonic', 'pluripotent', 'differentiation'],
+    'Bone & Skeletal': ['bone', 'skeletal', 'osteoporosis', 'calcium', 'mineralization'],
+    'Radiation Biology': ['radiation', 'cosmic', 'irradiation', 'DNA damage', 'radioprotection'],
+    'Cardiac Research': ['cardiac', 'heart', 'cardiovascular', 'myocardial'],
+    'Gene Expression': ['gene expression', 'transcription', 'mRNA', 'protein synthesis'],
+    'Immune System': ['immune', 'immunity', 'lymphocyte', 'cytokine'],
+    'Muscle Research': ['muscle', 'muscular', 'atrophy', 'contraction'],
+    'Neural Research': ['neural', 'brain', 'cognitive', 'neurotransmitter'],
+    'Metabolic Studies': ['metabolism', 'metabolic', 'glucose', 'insulin']
+}
+
+METHODOLOGY_KEYWORDS = {
+    'Cell Culture': ['cell culture', 'in vitro', 'cultured cells'],
+    'Animal Studies': ['mouse', 'rat', 'animal', 'in vivo'],
+    'Molecular Analysis': ['PCR', 'western blot', 'qPCR', 'RT-PCR'],
+    'Imaging': ['microscopy', 'imaging', 'confocal', 'fluorescence'],
+    'Flow Cytometry': ['flow cytometry', 'FACS', 'cell sorting'],
+    'Gene Analysis': ['RNA-seq', 'transcriptome', 'genomics'],
+    'Protein Analysis': ['proteomics', 'mass spectrometry', 'protein'],
+    'Statistical Analysis': ['statistical', 'ANOVA', 'regression', 'analysis']
+}
+
+# Papers whose citation counts are compared with each paper's successors
+CITATION_WINDOW = 5
+
+# Paper nodes shown in the graph, most cited first
+MAX_PAPER_NODES = 20
+
+
+def dataset_version(papers: List[Dict[str, Any]]) -> str:
+    """Identifier of the paper set: hash of the paper ids in order"""
+    digest = hashlib.sha1()
+    for paper in papers:
+        digest.update(paper['id'].encode("utf-8") + b"\0")
+    return digest.hexdigest()[:16]
+
+
+def _color(label: str, saturation: int, lightness: int) -> str:
+    # crc32 rather than hash() so colors (and cached bytes) match across processes
+    return f'hsl({zlib.crc32(label.encode("utf-8")) % 360}, {saturation}%, {lightness}%)'
+
+
+def _matching_categories(text: str, keywords: Dict[str, List[str]]) -> List[str]:
+    return [name for name, terms in keywords.items() if any(term in text for term in terms)]
+
+
+class KnowledgeGraphEngine:
+    """Incrementally maintained knowledge graph with per-role response caching"""
+
+    def __init__(self, similar_per_paper: int = 5, similarity_threshold: float = 0.1, block_size: int = 256,
+                 max_cached_roles: int = 8):
+        self.similar_per_paper = similar_per_paper
+        self.similarity_threshold = similarity_threshold
+        self.block_size = block_size
+        self.max_cached_roles = max_cached_roles
+        self._lock = threading.Lock()
+        self._vectorizer = HashingVectorizer(n_features=2 ** 20, alternate_sign=False, norm=None,
+                                             stop_words='english')
+        self._papers: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._digest = hashlib.sha1()
+        self._research_areas: Counter = Counter()
+        self._methodologies: Counter = Counter()
+        self._keyword_pairs: Counter = Counter()
+        self._author_papers: Dict[str, set] = {}
+        self._author_order: Dict[str, int] = {}
+        self._author_pairs: Counter = Counter()
+        self._term_counts = sp.csr_matrix((0, self._vectorizer.n_features), dtype=np.float64)
+        self._doc_freq = np.zeros(self._vectorizer.n_features, dtype=np.float64)
+        self._graph: Optional[Dict[str, Any]] = None
+        self._responses: "OrderedDict[str, bytes]" = OrderedDict()
+        self.builds = 0
+
+    @property
+    def version(self) -> str:
+        return self._digest.hexdigest()[:16]
+
+    def __len__(self) -> int:
+        return len(self._papers)
+
+    def update(self, papers: List[Dict[str, Any]]) -> int:
+        """Fold in papers not seen before (by id); returns how many were added"""
+        with self._lock:
+            new_papers = [paper for paper in papers if paper['id'] not in self._rows]
+            if not new_papers:
+                return 0
+            for paper in new_papers:
+                self._add_paper(paper)
+            texts = [paper.get('title', '') + ' ' + paper.get('abstract', '') for paper in new_papers]
+            counts = self._vectorizer.transform(texts)
+            self._term_counts = sp.vstack([self._term_counts, counts], format="csr")
+            self._doc_freq += np.bincount(counts.indices, minlength=self._vectorizer.n_features)
+            self._graph = None
+            self._responses.clear()
+            return len(new_papers)
+
+    def _add_paper(self, paper: Dict[str, Any]):
+        self._rows[paper['id']] = len(self._papers)
+        self._papers.append(paper)
+        self._digest.update(paper['id'].encode("utf-8") + b"\0")
+
+        text = (paper.get('title', '') + ' ' + paper.get('abstract', '')).lower()
+        self._research_areas.update(_matching_categories(text, AREA_KEYWORDS))
+        self._methodologies.update(_matching_categories(text, METHODOLOGY_KEYWORDS))
+
+        keywords = paper.get('keywords', [])
+        for i, kw1 in enumerate(keywords):
+            for kw2 in keywords[i + 1:]:
+                self._keyword_pairs[tuple(sorted([kw1.lower(), kw2.lower()]))] += 1
+
+        authors = list(dict.fromkeys(paper.get('authors', [])))
+        for author in authors:
+            self._author_papers.setdefault(author, set()).add(paper['id'])
+            self._author_order.setdefault(author, len(self._author_order))
+        # Ordered by first appearance, so pairs are oriented the same way for every paper
+        authors.sort(key=self._author_order.__getitem__)
+        for i, author1 in enumerate(authors):
+            for author2 in authors[i + 1:]:
+                self._author_pairs[(author1, author2)] += 1
+
+    # --- edges ---
+
+    def _similarity_edges(self) -> List[Dict[str, Any]]:
+        n = len(self._papers)
+        if n < 2:
+            return []
+        # Smoothed idf, as in TfidfVectorizer
+        idf = np.log((1 + n) / (1 + self._doc_freq)) + 1
+        tfidf = normalize(self._term_counts.multiply(idf).tocsr())
+        k = min(self.similar_per_paper, n - 1)
+        pairs: Dict[Tuple[int, int], float] = {}
+        for start in range(0, n, self.block_size):
+            block = (tfidf[start:start + self.block_size] @ tfidf.T).toarray()
+            for offset, row in enumerate(block):
+                i = start + offset
+                row[i] = -1.0
+                neighbours = np.argpartition(-row, k - 1)[:k]
+                for j in neighbours[np.argsort(-row[neighbours])]:
+                    if row[j] > self.similarity_threshold:
+                        pairs.setdefault((min(i, j), max(i, j)), float(row[j]))
+        return [{
+            'source': self._papers[i]['id'],
+            'target': self._papers[j]['id'],
+            'weight': weight,
+            'type': 'content_similarity'
+        } for (i, j), weight in sorted(pairs.items())]
+
+    def _citation_edges(self) -> List[Dict[str, Any]]:
+        edges = []
+        for i, paper in enumerate(self._papers):
+            citations = paper.get('citations', 0)
+            if citations > 0:
+                for other_paper in self._papers[i + 1:i + 1 + CITATION_WINDOW]:
+                    if other_paper.get('citations', 0) > 0:
+                        edges.append({
+                            'source': paper['id'],
+                            'target': other_paper['id'],
+                            'weight': min(citations / 100, 1.0),
+                            'type': 'citation_network'
+                        })
+        return edges
+
+    def _keyword_edges(self) -> List[Dict[str, Any]]:
+        return [{
+            'source': kw1,
+            'target': kw2,
+            'weight': count / len(self._papers),
+            'type': 'keyword_cooccurrence'
+        } for (kw1, kw2), count in self._keyword_pairs.items() if count > 1]
+
+    def _author_edges(self) -> List[Dict[str, Any]]:
+        return [{
+            'source': author1,
+            'target': author2,
+            'weight': common / max(len(self._author_papers[author1]), len(self._author_papers[author2])),
+            'type': 'author_collaboration'
+        } for (author1, author2), common in self._author_pairs.items()]
+
+    # --- graph ---
+
+    def _build(self) -> Dict[str, Any]:
+        research_areas = dict(self._research_areas)
+        methodologies = dict(self._methodologies)
+        area_nodes = [{
+            'id': area.lower().replace(' ', '_'),
+            'label': area,
+            'type': 'research_area',
+            'size': count,
+            'count': count,
+            'color': _color(area, 70, 50)
+        } for area, count in research_areas.items()]
+        method_nodes = [{
+            'id': method.lower().replace(' ', '_'),
+            'label': method,
+            'type': 'methodology',
+            'size': count,
+            'count': count,
+            'color': _color(method, 60, 60)
+        } for method, count in methodologies.items()]
+        top_papers = sorted(self._papers, key=lambda x: x.get('citations', 0), reverse=True)[:MAX_PAPER_NODES]
+        paper_nodes = [{
+            'id': paper['id'],
+            'label': paper['title'][:40] + '...' if len(paper['title']) > 40 else paper['title'],
+            'type': 'paper',
+            'size': paper.get('citations', 1) + 5,
+            'citations': paper.get('citations', 0),
+            'funding': paper.get('funding', 0),
+            'color': _color(paper['id'], 80, 40)
+        } for paper in top_papers]
+
+        all_nodes = area_nodes + method_nodes + paper_nodes
+        all_edges = self._similarity_edges() + self._citation_edges() + self._keyword_edges() + self._author_edges()
+        self.builds += 1
+        return {
+            "nodes": all_nodes,
+            "edges": all_edges,
+            "research_areas": research_areas,
+            "methodologies": methodologies,
+            "statistics": {
+                "total_papers": len(self._papers),
+                "total_nodes": len(all_nodes),
+                "total_edges": len(all_edges),
+                "research_areas_count": len(research_areas),
+                "methodologies_count": len(methodologies)
+            },
+            "dataset_version": self.version,
+        }
+
+    def graph(self, role: str = "Scientist") -> Dict[str, Any]:
+        with self._lock:
+            if self._graph is None:
+                self._graph = self._build()
+            return {**self._graph, "role": role}
+
+    def response_json(self, role: str = "Scientist") -> bytes:
+        """Serialized graph for a role, encoded once per dataset version"""
+        role = normalize_role(role)
+        if role is None:
+            raise ValueError(f"Unknown role; expected one of {', '.join(ROLES)}")
+        with self._lock:
+            body = self._responses.get(role)
+            if body is not None:
+                self._responses.move_to_end(role)
+                return body
+        body = json.dumps(self.graph(role), ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode("utf-8")
+        with self._lock:
+            self._responses[role] = body
+            while len(self._responses) > self.max_cached_roles:
+                self._responses.popitem(last=False)
+        return body
+
+
+def normalize_role(role: str) -> Optional[str]:
+    """Canonical spelling of a known role ("mission planner" -> "Mission Planner"), None otherwise"""
+    normalized = " ".join(role.split()).lower()
+    return next((known for known in ROLES if known.lower() == normalized), None)
+
+
+def build_knowledge_graph(papers: List[Dict[str, Any]], role: str = "Scientist") -> Dict[str, Any]:
+    """One-off graph for the given papers"""
+    engine = KnowledgeGraphEngine()
+    engine.update(papers)
+    return engine.graph(role)
+
+
+# Global instance, synced with the paper records of the process it runs in
+knowledge_graph_engine = KnowledgeGraphEngine(
+    similar_per_paper=int(os.environ.get("NASA_KG_SIMILAR_PER_PAPER", "5")),
+    similarity_threshold=float(os.environ.get("NASA_KG_SIMILARITY_THRESHOLD", "0.1")),
+)
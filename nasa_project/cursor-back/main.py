@@ -1,108 +1,178 @@
-from fastapi import FastAPI, HTTPException, Query
+from fastapi import FastAPI, HTTPException, Query, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import Response, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-from transformers import pipeline
-import torch
+from typing import List, Dict, Any, Optional, Tuple
 import json
 import os
+import time
 import pandas as pd
-import uuid
 from data_processor import data_processor
 import requests
-import pickle
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import faiss
+from resource_registry import resource_registry
+from encoder_service import encoder_service
+from vector_store import VectorStore
+from query_cache import QueryCache
+from title_index import PaperTitleIndex, build_title_index
+from paper_repository import PaperRepository, assign_paper_ids, papers_from_dataframe
+from http_caching import conditional_response
+from knowledge_graph import ROLES as KNOWLEDGE_GRAPH_ROLES, dataset_version, normalize_role
+from text_cleaning import clean_chunk_text
+from summary_cache import summary_cache, summary_key
+from summarization_service import (SUMMARY_MODES, PooledSummarizationPipeline, paper_summarizer_from_env,
+                                   summary_mode_from_env)
+from summary_batcher import summary_batcher_from_env
+from summarizer_backends import SUMMARIZER_MODEL, load_summarization_pipeline, summarizer_backend_from_env, summarizer_id
+from ai_chunk_index import AI_CHUNKS_SOURCE, sync_ai_vector_store, sync_ai_faiss_index
 from nasa_ai_service import nasa_ai
 from hybrid_nasa_ai_service import hybrid_nasa_ai
+from generation_scheduler import generation_scheduler
+from execution_pool import execution_pool
+import worker_tasks
 from hypothesis_generator import hypothesis_generator
 
 # Initialize FastAPI
 app = FastAPI(title="AI Research Assistant Backend")
 
-# Initialize Hugging Face summarization pipeline (load once at startup)
-print("Loading summarization model...")
-# Force PyTorch backend to avoid TensorFlow issues
-summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-12-6", framework="pt", device=0 if torch.cuda.is_available() else -1)
-print("Summarization model loaded successfully!")
-
-# Load research paper chunks data
-print("Loading research paper chunks data...")
-CHUNKS_DATA = []
-try:
-    with open("step5_all_chunks.json", "r", encoding="utf-8") as f:
-        CHUNKS_DATA = json.load(f)
-    print(f"Loaded {len(CHUNKS_DATA)} chunks from {len(set(item['Title'] for item in CHUNKS_DATA))} unique papers")
-except FileNotFoundError:
-    print("Warning: step5_all_chunks.json not found. Paper-based summarization will not be available.")
-except Exception as e:
-    print(f"Error loading chunks data: {e}")
-
-# Load AI chatbot data and model
-print("Loading AI chatbot components...")
-AI_CHUNKS = []
-AI_EMBEDDINGS = None
-AI_INDEX = None
-AI_MODEL = None
-
-try:
-    # Load chunks from JSONL
-    with open("all_papers_chunked.jsonl", "r", encoding="utf-8") as f:
-        for line in f:
-            data = json.loads(line)
-            AI_CHUNKS.append({
-                'chunk': data['chunk_text_clean'],
-                'metadata': {
-                    'title': f"Paper {data.get('paper_id', 'N/A')}",
-                    'url': 'N/A',
-                    'paper_id': data.get('paper_id', 'N/A'),
-                    'section': data.get('section', 'N/A'),
-                    'chunk_index': data.get('chunk_index', 'N/A')
-                }
-            })
-    
-    # Load or create embeddings
-    if os.path.exists("ai_embeddings.pkl"):
-        with open("ai_embeddings.pkl", 'rb') as f:
-            AI_EMBEDDINGS = pickle.load(f)
-        print("Loaded existing AI embeddings")
-    else:
-        print("Creating AI embeddings...")
-        AI_MODEL = SentenceTransformer('all-MiniLM-L6-v2')
-        texts = [chunk['chunk'] for chunk in AI_CHUNKS]
-        AI_EMBEDDINGS = AI_MODEL.encode(texts, show_progress_bar=True)
-        with open("ai_embeddings.pkl", 'wb') as f:
-            pickle.dump(AI_EMBEDDINGS, f)
-        print("AI embeddings created and saved")
-    
-    # Load or create FAISS index
-    if os.path.exists("ai_faiss_index.bin"):
-        AI_INDEX = faiss.read_index("ai_faiss_index.bin")
-        print("Loaded existing AI FAISS index")
+# --- Lazily loaded ML resources ---
+# Models and indexes are registered here and built on first use, or by the
+# background warm-up started once uvicorn is accepting connections.
+
+# Inference backend (torch, torch-int8 or onnx) from NASA_SUMMARIZER_BACKEND, see summarizer_backends.py
+SUMMARIZER_BACKEND = summarizer_backend_from_env()
+# Backend the summarizer actually loaded; PyTorch eager when int8/onnx could not be loaded
+summarizer_loaded_backend: Optional[str] = None
+
+def summarizer_cache_id() -> str:
+    """
+    Model id for summary cache keys and the cache's model column. Names the backend,
+    since quantized models can word summaries differently: the loaded one once the
+    summarizer is up, before that the requested one (so hits are only its summaries).
+    """
+    return summarizer_id(SUMMARIZER_MODEL, summarizer_loaded_backend or SUMMARIZER_BACKEND)
+
+# Generation parameters per role; do_sample=False keeps summaries deterministic and cacheable
+SUMMARY_PARAMS = {
+    # For scientists, we want detailed summaries focusing on methodology
+    "scientist": {"max_length": 200, "min_length": 80, "do_sample": False, "truncation": True},
+    # For managers, we want concise summaries highlighting business value
+    "manager": {"max_length": 120, "min_length": 40, "do_sample": False, "truncation": True},
+}
+
+def _load_summarizer():
+    """Load the Hugging Face summarization pipeline"""
+    global summarizer_loaded_backend
+    if execution_pool.enabled:
+        # The model runs in the execution pool's workers; only the tokenizer is needed here
+        from transformers import AutoTokenizer
+        print("Loading summarization tokenizer (model runs in the execution pool)...")
+        tokenizer = AutoTokenizer.from_pretrained(SUMMARIZER_MODEL)
+        # Workers refuse batches if they loaded a different backend than this first one
+        backend = execution_pool.submit(worker_tasks.load_summarizer).result()
+        pipe = PooledSummarizationPipeline(
+            tokenizer,
+            lambda texts, params: execution_pool.submit(worker_tasks.summarize_texts, texts, params, backend),
+            # One batch per pool worker, so parameter groups and batches run in parallel
+            max_in_flight=execution_pool.max_workers,
+        )
     else:
-        print("Creating AI FAISS index...")
-        dimension = AI_EMBEDDINGS.shape[1]
-        AI_INDEX = faiss.IndexFlatIP(dimension)
-        faiss.normalize_L2(AI_EMBEDDINGS)
-        AI_INDEX.add(AI_EMBEDDINGS.astype('float32'))
-        faiss.write_index(AI_INDEX, "ai_faiss_index.bin")
-        print("AI FAISS index created and saved")
-    
-    # Load model for search if not already loaded
-    if AI_MODEL is None:
-        AI_MODEL = SentenceTransformer('all-MiniLM-L6-v2')
-    
-    print(f"AI chatbot loaded with {len(AI_CHUNKS)} chunks from {len(set(chunk['metadata']['paper_id'] for chunk in AI_CHUNKS))} unique papers")
-    
-except FileNotFoundError:
-    print("Warning: all_papers_chunked.jsonl not found. AI chatbot will not be available.")
-except Exception as e:
-    print(f"Error loading AI chatbot: {e}")
+        pipe, backend = load_summarization_pipeline(SUMMARIZER_MODEL, SUMMARIZER_BACKEND)
+    summarizer_loaded_backend = backend
+    return pipe
+
+def _load_paper_chunks() -> List[Dict[str, Any]]:
+    """Load research paper chunks used for paper-based summarization"""
+    print("Loading research paper chunks data...")
+    try:
+        with open("step5_all_chunks.json", "r", encoding="utf-8") as f:
+            chunks_data = json.load(f)
+        print(f"Loaded {len(chunks_data)} chunks from {len(set(item['Title'] for item in chunks_data))} unique papers")
+        return chunks_data
+    except FileNotFoundError:
+        print("Warning: step5_all_chunks.json not found. Paper-based summarization will not be available.")
+    except Exception as e:
+        print(f"Error loading chunks data: {e}")
+    return []
+
+def _load_embedding_model():
+    """Load the shared sentence encoder used by every chat backend"""
+    return encoder_service.load()
+
+def _load_ai_vector_store() -> Optional[VectorStore]:
+    """Open the memory-mapped AI chatbot store, encoding only chunks added or changed in the JSONL"""
+    print("Loading AI chatbot components...")
+    if not os.path.exists(AI_CHUNKS_SOURCE):
+        print("Warning: all_papers_chunked.jsonl not found. AI chatbot will not be available.")
+        return None
+    store, stats = sync_ai_vector_store()
+    print(f"AI chatbot loaded with {store.live_count} chunks (dimension {store.dimension}, sync: {stats})")
+    return store
+
+def _load_ai_index():
+    """Load the AI chatbot FAISS index, appending rows added since it was saved"""
+    store = resource_registry.get("ai_vector_store")
+    if store is None or not len(store):
+        return None
+    return sync_ai_faiss_index(store)
+
+resource_registry.register("summarizer", _load_summarizer)
+resource_registry.register("paper_chunks", _load_paper_chunks)
+resource_registry.register("paper_title_index", lambda: build_title_index(get_chunks_data()))
+resource_registry.register("embedding_model", _load_embedding_model)
+resource_registry.register("ai_vector_store", _load_ai_vector_store)
+resource_registry.register("ai_index", _load_ai_index)
+resource_registry.register("nasa_ai", nasa_ai.ensure_loaded)
+resource_registry.register("hybrid_nasa_ai", hybrid_nasa_ai.ensure_loaded)
+
+def _start_execution_pool():
+    """Spawn the worker processes and run their model preloads"""
+    execution_pool.start()
+    return execution_pool
+
+resource_registry.register("execution_pool", _start_execution_pool)
+
+def get_summarizer():
+    return resource_registry.get("summarizer")
+
+# Every summarizer call goes through one worker that batches concurrent requests
+summary_batcher = summary_batcher_from_env(get_summarizer)
+
+# Token-aware paper summarization (truncate or map_reduce, see summarization_service.py)
+SUMMARY_MODE = summary_mode_from_env()
+paper_summarizer = paper_summarizer_from_env(get_summarizer, run_batch=summary_batcher.summarize_many)
+
+def get_chunks_data() -> List[Dict[str, Any]]:
+    return resource_registry.get("paper_chunks", [])
+
+def get_title_index() -> PaperTitleIndex:
+    index = resource_registry.get("paper_title_index")
+    if index is None or index.source is not get_chunks_data():
+        # The chunk data was reloaded; rebuild the index over the new list
+        index = resource_registry.reload("paper_title_index")
+    return index
+
+def get_ai_chunks() -> Optional[VectorStore]:
+    return resource_registry.get("ai_vector_store")
+
+@app.on_event("startup")
+def warm_up_resources():
+    """Start loading models in the background so light endpoints answer immediately"""
+    if os.environ.get("NASA_WARMUP", "1") != "0":
+        resource_registry.warm_up()
+
+@app.on_event("shutdown")
+async def close_http_clients():
+    """Stop the Ollama health monitor and worker processes and close pooled connections to the server"""
+    hybrid_nasa_ai.health.stop()
+    execution_pool.shutdown()
+    await hybrid_nasa_ai.ollama.aclose()
 
 # Load papers data from CSV
 print("Loading papers data from CSV...")
 PAPERS_DATA = []
+PAPERS_MODIFIED = None
 try:
     # Look for CSV file in the current directory, prioritize SB_publication_PMC.csv
     csv_files = [f for f in os.listdir('.') if f.endswith('.csv')]
@@ -116,6 +186,7 @@ try:
         
         # Read CSV file
         df = pd.read_csv(csv_file)
+        PAPERS_MODIFIED = os.path.getmtime(csv_file)
         
         # Ensure required columns exist (check for both lowercase and uppercase variants)
         title_col = None
@@ -129,67 +200,8 @@ try:
                 link_col = col
         
         if title_col and link_col:
-            # Convert DataFrame to list of dictionaries with additional fields
-            for index, row in df.iterrows():
-                # Extract keywords from title for better categorization
-                title = str(row[title_col]).strip()
-                link = str(row[link_col]).strip()
-                
-                # Extract potential keywords from title
-                keywords = []
-                title_lower = title.lower()
-                
-                # Common research keywords
-                keyword_mapping = {
-                    'microgravity': ['microgravity', 'space'],
-                    'stem cells': ['stem cell', 'embryonic', 'regeneration'],
-                    'bone': ['bone', 'skeletal', 'osteoclastic', 'osteoblastic'],
-                    'oxidative stress': ['oxidative stress', 'radiation'],
-                    'heart': ['heart', 'cardiac'],
-                    'spaceflight': ['spaceflight', 'space station', 'mission'],
-                    'gene expression': ['gene expression', 'transcriptional', 'pcr'],
-                    'biomedical': ['biomedical', 'health', 'medical'],
-                    'research': ['research', 'study', 'analysis']
-                }
-                
-                for category, terms in keyword_mapping.items():
-                    if any(term in title_lower for term in terms):
-                        keywords.append(category)
-                
-                if not keywords:
-                    keywords = ['research', 'space biology']
-                
-                # Determine methodology based on title content
-                methodology = None
-                if any(term in title_lower for term in ['pcr', 'gene expression', 'transcriptional']):
-                    methodology = 'Molecular Biology'
-                elif any(term in title_lower for term in ['stem cell', 'embryonic']):
-                    methodology = 'Cell Biology'
-                elif any(term in title_lower for term in ['bone', 'skeletal']):
-                    methodology = 'Biomechanics'
-                elif any(term in title_lower for term in ['radiation', 'oxidative']):
-                    methodology = 'Radiation Biology'
-                else:
-                    methodology = 'Space Biology'
-                
-                # Generate a simple abstract based on title
-                abstract = f"This research investigates {title_lower} in the context of space biology and microgravity effects. The study contributes to our understanding of biological responses to space environment conditions."
-                
-                paper = {
-                    'id': str(uuid.uuid4()),
-                    'title': title,
-                    'link': link,
-                    'authors': ['Research Team'],  # Default value
-                    'journal': 'PMC Publications',   # Default value based on your data source
-                    'publicationDate': '2024',      # Default value
-                    'abstract': abstract,
-                    'keywords': keywords,
-                    'citations': 0,                 # Default value
-                    'methodology': methodology,
-                    'funding': None,                # Default value
-                    'return': None,                 # Default value
-                }
-                PAPERS_DATA.append(paper)
+            # Build paper records column-wise with keywords and methodology from the titles
+            PAPERS_DATA = papers_from_dataframe(df, title_col, link_col)
             
             print(f"Loaded {len(PAPERS_DATA)} papers from CSV")
         else:
@@ -199,7 +211,7 @@ try:
         # Create sample data if no CSV is found
         PAPERS_DATA = [
             {
-                'id': str(uuid.uuid4()),
+                'id': '',
                 'title': 'Advanced Machine Learning in Space Research',
                 'link': 'https://example.com/paper1',
                 'authors': ['Dr. Jane Smith', 'Prof. John Doe'],
@@ -213,7 +225,7 @@ try:
                 'return': 300000,
             },
             {
-                'id': str(uuid.uuid4()),
+                'id': '',
                 'title': 'Quantum Computing Applications in Aerospace',
                 'link': 'https://example.com/paper2',
                 'authors': ['Dr. Alice Johnson', 'Dr. Bob Wilson'],
@@ -227,12 +239,25 @@ try:
                 'return': 450000,
             }
         ]
+        for paper, paper_id in zip(PAPERS_DATA, assign_paper_ids([p['title'] for p in PAPERS_DATA],
+                                                                 [p['link'] for p in PAPERS_DATA])):
+            paper['id'] = paper_id
         print(f"Created {len(PAPERS_DATA)} sample papers")
         
 except Exception as e:
     print(f"Error loading papers data: {e}")
     PAPERS_DATA = []
 
+# Id index, pre-serialized JSON and cache validators for the paper endpoints
+papers_repository = PaperRepository(PAPERS_DATA, last_modified=PAPERS_MODIFIED)
+PAPERS_VERSION = dataset_version(PAPERS_DATA)
+# Serialized knowledge graph per (dataset version, role)
+KNOWLEDGE_GRAPH_RESPONSES: Dict[Tuple[str, str], bytes] = {}
+
+# Worker processes get the same records and model settings
+execution_pool.configure(papers=PAPERS_DATA, summarizer_model=SUMMARIZER_MODEL, summarizer_backend=SUMMARIZER_BACKEND,
+                         pool_size=execution_pool.max_workers)
+
 # Enable CORS for frontend
 app.add_middleware(
     CORSMiddleware,
@@ -252,9 +277,15 @@ class SummaryRequest(BaseModel):
     paper_text: str
     role: str  # "scientist" or "manager"
 
+class BatchSummaryRequest(BaseModel):
+    papers: List[SummaryRequest]
+
+MAX_BATCH_SUMMARIES = int(os.environ.get("NASA_MAX_BATCH_SUMMARIES", "64"))
+
 class PaperSummaryRequest(BaseModel):
     paper_title: str
     role: str  # "scientist" or "manager"
+    mode: Optional[str] = None  # "truncate" or "map_reduce"; defaults to NASA_SUMMARY_MODE
 
 
 # --- Helper Functions ---
@@ -262,106 +293,21 @@ class PaperSummaryRequest(BaseModel):
 def get_paper_chunks(paper_title: str) -> List[str]:
     """
     Get all chunks for a specific paper title.
+    Tries an exact title match, then the PMC ID, then fuzzy containment via the title index.
     Returns a list of chunk texts.
     """
-    chunks = []
-    paper_title_lower = paper_title.lower().strip()
-    
-    # First try exact match
-    for item in CHUNKS_DATA:
-        if item['Title'].lower().strip() == paper_title_lower:
-            chunks.append(item['Chunk'])
-    
-    # If no exact match, try PMC ID matching
-    if not chunks:
-        # Extract PMC ID from title if it exists
-        import re
-        pmc_match = re.search(r'pmc(\d+)', paper_title_lower)
-        if pmc_match:
-            pmc_id = pmc_match.group(1)
-            for item in CHUNKS_DATA:
-                if f'pmc{pmc_id}' in item['Title'].lower():
-                    chunks.append(item['Chunk'])
-    
-    # If still no match, try fuzzy matching
-    if not chunks:
-        for item in CHUNKS_DATA:
-            chunk_title = item['Title'].lower().strip()
-            # Check if the paper title is contained in the chunk title or vice versa
-            if (paper_title_lower in chunk_title or 
-                chunk_title in paper_title_lower or
-                # Check for common variations
-                paper_title_lower.replace(' ', '') in chunk_title.replace(' ', '') or
-                chunk_title.replace(' ', '') in paper_title_lower.replace(' ', '')):
-                chunks.append(item['Chunk'])
-    
-    return chunks
-
-def clean_chunk_text(text: str) -> str:
-    """
-    Clean chunk text by removing website boilerplate and navigation elements.
-    """
-    import re
-    
-    # Remove common website boilerplate patterns
-    patterns_to_remove = [
-        r"skip to main content",
-        r"an official website of the united states government",
-        r"here's how you know",
-        r"official websites use \.gov",
-        r"a \.gov website belongs to an official government organization",
-        r"secure \.gov websites use https",
-        r"a lock.*lock.*padlock icon.*or https://",
-        r"means you've safely connected to the \.gov website",
-        r"share sensitive information only on official, secure websites",
-        r"search log in dashboard publications account settings log out",
-        r"search.*search ncbi primary site navigation",
-        r"logged in as: dashboard publications account settings",
-        r"search pmc full-text archive",
-        r"search in pmc journal list user guide permalink copy",
-        r"as a library, nlm provides access to scientific literature",
-        r"inclusion in an nlm database does not imply endorsement",
-        r"learn more: pmc disclaimer.*pmc copyright notice",
-        r"plos one.*\d{4}.*doi:.*\d+\.\d+",
-        r"search in pmc search in pubmed view in nlm catalog add to search",
-        r"find articles by.*\d+.*\d+.*\*",
-        r"editor:.*author information article notes copyright and license information",
-        r"competing interests:.*conceived and designed the experiments:",
-        r"performed the experiments:.*analyzed the data:",
-        r"contributed reagents/materials/analysis tools:",
-        r"wrote the paper:.*roles.*editor received.*accepted.*collection date",
-        r"this is an open-access article distributed under the terms",
-        r"pmc copyright notice pmcid:.*pmid:.*\d+",
-        r"in the united states\.",
-        r"search log in",
-        r"of, or agreement with, the contents by nlm or the national institutes of health",
-        r"/journal\.pone\.\d+",
-    ]
-    
-    cleaned_text = text.lower()
-    
-    for pattern in patterns_to_remove:
-        cleaned_text = re.sub(pattern, "", cleaned_text, flags=re.IGNORECASE)
-    
-    # Remove excessive whitespace and normalize
-    cleaned_text = re.sub(r'\s+', ' ', cleaned_text)
-    cleaned_text = cleaned_text.strip()
-    
-    # If the cleaned text is too short, it's likely mostly boilerplate
-    if len(cleaned_text) < 100:
-        return ""
-    
-    return cleaned_text
-
-def combine_chunks(chunks: List[str], max_length: int = 50000) -> str:
+    return get_title_index().get_chunks(paper_title)
+
+def combine_chunks(chunks: List[str], max_length: int = 50000, already_cleaned: bool = False) -> str:
     """
     Combine multiple chunks into a single text, respecting max_length limit.
-    Clean each chunk before combining to remove boilerplate content.
+    Clean each chunk before combining to remove boilerplate content, unless the
+    caller passes text that was already cleaned.
     """
     combined_text = ""
     for chunk in chunks:
         # Clean the chunk text
-        cleaned_chunk = clean_chunk_text(chunk)
+        cleaned_chunk = chunk if already_cleaned else clean_chunk_text(chunk)
         
         # Skip chunks that are mostly boilerplate (very short after cleaning)
         if len(cleaned_chunk) < 50:
@@ -377,7 +323,7 @@ def get_available_papers() -> List[str]:
     """
     Get a list of all available paper titles.
     """
-    return list(set(item['Title'] for item in CHUNKS_DATA))
+    return get_title_index().titles
 
 def generate_scientist_summary(paper_text: str) -> str:
     """
@@ -390,14 +336,7 @@ def generate_scientist_summary(paper_text: str) -> str:
             return "Insufficient content for detailed scientific summary."
         
         # For scientists, we want detailed summaries focusing on methodology
-        result = summarizer(
-            paper_text,
-            max_length=200,  # Longer summary for detailed analysis
-            min_length=80,   # Minimum length for substantial content
-            do_sample=False,
-            truncation=True
-        )
-        return result[0]['summary_text']
+        return summary_batcher.summarize(paper_text, SUMMARY_PARAMS["scientist"])
     except Exception as e:
         return f"Error generating scientist summary: {str(e)}"
 
@@ -412,23 +351,158 @@ def generate_manager_summary(paper_text: str) -> str:
             return "Insufficient content for executive summary."
         
         # For managers, we want concise summaries highlighting business value
-        result = summarizer(
-            paper_text,
-            max_length=120,  # Shorter summary for executive consumption
-            min_length=40,   # Minimum length for key insights
-            do_sample=False,
-            truncation=True
-        )
-        return result[0]['summary_text']
+        return summary_batcher.summarize(paper_text, SUMMARY_PARAMS["manager"])
     except Exception as e:
         return f"Error generating manager summary: {str(e)}"
 
+def summarize_for_role(paper_text: str, role: str, title: str = "") -> Tuple[str, bool]:
+    """
+    Role-specific summary served from the persistent summary cache when possible.
+    Returns (summary, cached). Only successful summaries are stored.
+    """
+    role = role.lower()
+    model = summarizer_cache_id()
+    key = summary_key(title, role, model, SUMMARY_PARAMS[role], paper_text)
+    try:
+        cached = summary_cache.get(key)
+        if cached is not None:
+            return cached, True
+    except Exception as e:
+        print(f"⚠️ Summary cache read failed: {e}")
+    
+    if role == "scientist":
+        summary = generate_scientist_summary(paper_text)
+    else:  # manager
+        summary = generate_manager_summary(paper_text)
+    
+    if not summary.startswith(("Error generating", "Insufficient content")):
+        if summarizer_cache_id() != model:
+            # The summarizer loaded on a fallback backend; file the summary under it
+            model = summarizer_cache_id()
+            key = summary_key(title, role, model, SUMMARY_PARAMS[role], paper_text)
+        try:
+            summary_cache.put(key, summary, title=title, role=role, model=model)
+        except Exception as e:
+            print(f"⚠️ Summary cache write failed: {e}")
+    return summary, False
+
+def paper_summary_key(title: str, role: str, rows: List[int], mode: str, model: Optional[str] = None) -> str:
+    """
+    Cache key for a paper summary. Hashes the raw chunks, so a cache hit costs no
+    cleaning or tokenization.
+    """
+    raw_text = "\n".join(get_chunks_data()[row]['Chunk'] for row in rows)
+    return summary_key(title, role, model or summarizer_cache_id(), {**SUMMARY_PARAMS[role], "mode": mode}, raw_text)
+
+def summarize_paper(title: str, role: str, rows: List[int], mode: str) -> Dict[str, Any]:
+    """
+    Role-specific summary of a paper's chunk rows, served from the persistent
+    summary cache when possible. Returns summary, text_length, coverage and cached;
+    an empty summary means the paper has no readable content.
+    """
+    role = role.lower()
+    model = summarizer_cache_id()
+    key = paper_summary_key(title, role, rows, mode, model)
+    try:
+        entry = summary_cache.get_entry(key)
+        if entry is not None:
+            summary, meta = entry
+            return {"summary": summary, "text_length": meta.get("text_length"),
+                    "coverage": meta.get("coverage"), "cached": True}
+    except Exception as e:
+        print(f"⚠️ Summary cache read failed: {e}")
+
+    try:
+        result = paper_summarizer.summarize(get_title_index().iter_cleaned(rows), len(rows),
+                                            SUMMARY_PARAMS[role], mode=mode)
+    except Exception as e:
+        return {"summary": f"Error generating {role} summary: {str(e)}", "text_length": 0,
+                "coverage": None, "cached": False}
+
+    if result["summary"]:
+        if summarizer_cache_id() != model:
+            model = summarizer_cache_id()
+            key = paper_summary_key(title, role, rows, mode, model)
+        try:
+            summary_cache.put(key, result["summary"], title=title, role=role, model=model,
+                              meta={"text_length": result["text_length"], "coverage": result["coverage"]})
+        except Exception as e:
+            print(f"⚠️ Summary cache write failed: {e}")
+    return {**result, "cached": False}
+
 # --- Placeholder Routes ---
 
 @app.get("/")
 def root():
     return {"message": "Backend is running!"}
 
+@app.get("/api/readiness")
+def readiness():
+    """
+    Report per-component load state. Light endpoints (papers, manager dashboard)
+    are served while the ML components are still warming up.
+    """
+    components = resource_registry.status()
+    return {
+        "ready": not resource_registry.pending(),
+        "components": components,
+        "papers_loaded": len(PAPERS_DATA),
+        "manager_data_loaded": data_processor.df is not None and not data_processor.df.empty
+    }
+
+@app.get("/api/encoder/stats")
+def encoder_stats():
+    """
+    Throughput counters of the shared embedding encoder.
+    """
+    return encoder_service.stats()
+
+@app.get("/api/summaries/cache-stats")
+def summary_cache_stats():
+    """
+    Size and hit rate of the persistent summary cache.
+    """
+    return summary_cache.stats()
+
+@app.get("/api/summaries/batcher-stats")
+def summary_batcher_stats():
+    """
+    Batch sizes and throughput of the summarization worker.
+    """
+    return summary_batcher.stats()
+
+@app.get("/api/execution-pool/stats")
+def execution_pool_stats():
+    """
+    Worker pool size and per-endpoint queue and throughput counters.
+    """
+    return execution_pool.stats()
+
+@app.get("/api/search/cache-stats")
+def search_cache_stats():
+    """
+    Hit/miss counters of the query embedding and result caches per chat backend.
+    """
+    return {
+        "ai": ai_query_cache.stats(),
+        "nasa-ai": nasa_ai.query_cache.stats(),
+        "hybrid": hybrid_nasa_ai.query_cache.stats()
+    }
+
+@app.get("/api/hybrid-nasa-ai/health")
+def hybrid_ollama_health():
+    """
+    Circuit breaker state and probe counters of the Ollama health monitor.
+    """
+    return hybrid_nasa_ai.health.status()
+
+@app.get("/api/hybrid-nasa-ai/scheduler")
+def hybrid_scheduler_stats():
+    """
+    Queue depth, wait times and coalescing counters of the Ollama generation scheduler.
+    """
+    return generation_scheduler.stats()
+
 @app.post("/api/chat")
 def chat(req: ChatRequest):
     """
@@ -438,7 +512,7 @@ def chat(req: ChatRequest):
         # Get context from selected papers if provided
         context = ""
         if hasattr(req, 'selected_paper_ids') and req.selected_paper_ids:
-            selected_papers = [p for p in PAPERS_DATA if p['id'] in req.selected_paper_ids]
+            selected_papers = papers_repository.get_many(req.selected_paper_ids)
             if selected_papers:
                 context = "Selected papers context:\n"
                 for paper in selected_papers[:3]:  # Limit to first 3 papers
@@ -470,7 +544,7 @@ def chat(req: ChatRequest):
         }
 
 @app.post("/api/summaries")
-def generate_summary(req: SummaryRequest):
+async def generate_summary(req: SummaryRequest):
     """
     Generate paper summaries based on user role.
     - Scientist role: Detailed, methodology-focused summary
@@ -485,20 +559,86 @@ def generate_summary(req: SummaryRequest):
         return {"error": "Paper text cannot be empty"}
     
     # Generate summary based on role
-    if req.role.lower() == "scientist":
-        summary = generate_scientist_summary(req.paper_text)
-    else:  # manager
-        summary = generate_manager_summary(req.paper_text)
+    summary, cached = await execution_pool.run_in_thread("summaries", summarize_for_role, req.paper_text, req.role)
+    
+    return {"summary": summary, "cached": cached}
+
+@app.post("/api/summaries/batch")
+async def generate_summaries_batch(req: BatchSummaryRequest):
+    """
+    Role-based summaries for many papers at once. Cached summaries are answered
+    directly; the rest are queued together so the worker runs them as a few
+    batches grouped by role.
+    """
+    if not req.papers:
+        raise HTTPException(status_code=400, detail="At least one paper is required")
+    if len(req.papers) > MAX_BATCH_SUMMARIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_SUMMARIES} papers per batch")
+    return await execution_pool.run_in_thread("summaries_batch", summarize_papers_batch, req.papers)
+
+def summarize_papers_batch(papers: List[SummaryRequest]) -> Dict[str, Any]:
+    """Summaries for validated batch items, waiting on the summarizer worker"""
+    start = time.perf_counter()
+    model = summarizer_cache_id()
+    results: List[Dict[str, Any]] = []
+    pending = []
+    for paper in papers:
+        role = paper.role.lower()
+        if role not in SUMMARY_PARAMS:
+            results.append({"error": "Role must be either 'scientist' or 'manager'"})
+            continue
+        if len(paper.paper_text.strip()) < 100:
+            insufficient = "detailed scientific summary" if role == "scientist" else "executive summary"
+            results.append({"summary": f"Insufficient content for {insufficient}.", "role": role, "cached": False})
+            continue
+        
+        key = summary_key("", role, model, SUMMARY_PARAMS[role], paper.paper_text)
+        try:
+            cached = summary_cache.get(key)
+        except Exception as e:
+            print(f"⚠️ Summary cache read failed: {e}")
+            cached = None
+        if cached is not None:
+            results.append({"summary": cached, "role": role, "cached": True})
+            continue
+        
+        result = {"role": role, "cached": False}
+        results.append(result)
+        pending.append((result, key, paper.paper_text, summary_batcher.submit(paper.paper_text, SUMMARY_PARAMS[role])))
     
-    return {"summary": summary}
+    for result, key, paper_text, future in pending:
+        try:
+            result["summary"] = future.result()
+        except Exception as e:
+            result["summary"] = f"Error generating {result['role']} summary: {str(e)}"
+            continue
+        if summarizer_cache_id() != model:
+            key = summary_key("", result["role"], summarizer_cache_id(), SUMMARY_PARAMS[result["role"]], paper_text)
+        try:
+            summary_cache.put(key, result["summary"], role=result["role"], model=summarizer_cache_id())
+        except Exception as e:
+            print(f"⚠️ Summary cache write failed: {e}")
+    
+    elapsed = time.perf_counter() - start
+    return {
+        "count": len(results),
+        "results": results,
+        "generated": len(pending),
+        "elapsed_ms": round(elapsed * 1000, 2),
+        "papers_per_second": round(len(results) / elapsed, 2) if elapsed > 0 else None
+    }
 
 @app.post("/api/paper-summaries")
-def generate_paper_summary(req: PaperSummaryRequest):
+async def generate_paper_summary(req: PaperSummaryRequest):
     """
     Generate paper summaries from chunks data based on user role.
     - Scientist role: Detailed, methodology-focused summary
     - Manager role: Concise, business-oriented summary
     """
+    return await execution_pool.run_in_thread("paper_summaries", paper_summary_response, req)
+
+def paper_summary_response(req: PaperSummaryRequest) -> Dict[str, Any]:
+    """Title lookup, summary cache and summarizer calls for /api/paper-summaries"""
     # Validate role input
     if req.role.lower() not in ["scientist", "manager"]:
         return {"error": "Role must be either 'scientist' or 'manager'"}
@@ -508,44 +648,47 @@ def generate_paper_summary(req: PaperSummaryRequest):
         return {"error": "Paper title cannot be empty"}
     
     # Check if chunks data is available
-    if not CHUNKS_DATA:
+    chunks_data = get_chunks_data()
+    if not chunks_data:
         return {"error": "Research paper chunks data not available"}
     
     # Get chunks for the specified paper
-    chunks = get_paper_chunks(req.paper_title)
+    title_index = get_title_index()
+    chunk_rows = title_index.find_rows(req.paper_title)
     
-    if not chunks:
-        # Try to find similar titles
-        available_papers = get_available_papers()
-        similar_titles = [title for title in available_papers 
-                         if req.paper_title.lower() in title.lower() or title.lower() in req.paper_title.lower()]
+    if not chunk_rows:
+        # Try to find similar titles, most similar first
+        similar_titles = title_index.suggest(req.paper_title, limit=5)
         
         if similar_titles:
             return {
                 "error": f"Paper '{req.paper_title}' not found. Did you mean one of these?",
-                "suggestions": similar_titles[:5]  # Return top 5 suggestions
+                "suggestions": similar_titles  # Return top 5 suggestions
             }
         else:
             return {"error": f"Paper '{req.paper_title}' not found in the database"}
     
-    # Combine chunks into full text
-    combined_text = combine_chunks(chunks)
+    mode = (req.mode or SUMMARY_MODE).lower()
+    if mode not in SUMMARY_MODES:
+        return {"error": f"Mode must be one of {', '.join(SUMMARY_MODES)}"}
     
-    if not combined_text.strip():
-        return {"error": "No readable content found for this paper"}
+    # Summarize only what fits the model window (or map-reduce over the paper); keyed on
+    # the matched paper so fuzzy lookups share cache entries
+    paper_key = chunks_data[chunk_rows[0]]['Title']
+    result = summarize_paper(paper_key, req.role, chunk_rows, mode)
     
-    # Generate summary based on role
-    if req.role.lower() == "scientist":
-        summary = generate_scientist_summary(combined_text)
-    else:  # manager
-        summary = generate_manager_summary(combined_text)
+    if not result["summary"]:
+        return {"error": "No readable content found for this paper"}
     
     return {
-        "summary": summary,
+        "summary": result["summary"],
         "paper_title": req.paper_title,
-        "chunks_used": len(chunks),
-        "total_chunks": len([item for item in CHUNKS_DATA if item['Title'].lower().strip() == req.paper_title.lower().strip()]),
-        "text_length": len(combined_text)
+        "chunks_used": len(chunk_rows),
+        "total_chunks": title_index.chunk_count(req.paper_title),
+        "text_length": result["text_length"],
+        "mode": mode,
+        "coverage": result["coverage"],
+        "cached": result["cached"]
     }
 
 @app.get("/api/available-papers")
@@ -553,7 +696,7 @@ def get_papers():
     """
     Get a list of all available paper titles for summarization.
     """
-    if not CHUNKS_DATA:
+    if not get_chunks_data():
         return {"error": "Research paper chunks data not available"}
     
     papers = get_available_papers()
@@ -563,26 +706,26 @@ def get_papers():
     }
 
 @app.get("/api/papers")
-def get_papers_data(role: str = "Scientist", limit: int = 10, offset: int = 0):
+def get_papers_data(request: Request, role: str = "Scientist", limit: int = 10, offset: int = 0):
     """
     Get papers data for the frontend with role-based filtering and pagination.
+    Sends ETag and Last-Modified; revalidation answers 304 when nothing changed.
     """
     try:
-        if not PAPERS_DATA:
+        if not len(papers_repository):
             return {"error": "No papers data available", "papers": [], "total": 0, "page": 1, "total_pages": 0}
         
         # Calculate pagination
-        total_papers = len(PAPERS_DATA)
+        total_papers = len(papers_repository)
         total_pages = (total_papers + limit - 1) // limit  # Ceiling division
         current_page = (offset // limit) + 1
         
-        # Get paginated papers
+        # Get paginated papers as pre-serialized JSON
         start_idx = offset
         end_idx = min(offset + limit, total_papers)
-        paginated_papers = PAPERS_DATA[start_idx:end_idx]
+        paginated_papers = papers_repository.page_json(start_idx, end_idx - start_idx)
         
-        return {
-            "papers": paginated_papers,
+        return conditional_response(request, papers_repository.response_json("papers", paginated_papers, {
             "total": total_papers,
             "page": current_page,
             "total_pages": total_pages,
@@ -591,24 +734,23 @@ def get_papers_data(role: str = "Scientist", limit: int = 10, offset: int = 0):
             "has_next": end_idx < total_papers,
             "has_previous": offset > 0,
             "role": role
-        }
+        }), last_modified=papers_repository.last_modified)
     except Exception as e:
         return {"error": f"Error fetching papers: {str(e)}", "papers": [], "total": 0, "page": 1, "total_pages": 0}
 
 @app.get("/api/papers/{paper_id}")
-def get_paper_by_id(paper_id: str, role: str = "Scientist"):
+def get_paper_by_id(request: Request, paper_id: str, role: str = "Scientist"):
     """
-    Get a specific paper by ID.
+    Get a specific paper by ID (PMC id from the link, or a title hash; stable across restarts).
+    Sends ETag and Last-Modified; revalidation answers 304 when nothing changed.
     """
     try:
-        paper = next((p for p in PAPERS_DATA if p['id'] == paper_id), None)
+        paper = papers_repository.paper_json(paper_id)
         if not paper:
             return {"error": "Paper not found"}
         
-        return {
-            "paper": paper,
-            "role": role
-        }
+        return conditional_response(request, papers_repository.response_json("paper", paper, {"role": role}),
+                                    last_modified=papers_repository.last_modified)
     except Exception as e:
         return {"error": f"Error fetching paper: {str(e)}"}
 
@@ -709,235 +851,24 @@ def get_analytics(role: str = "Scientist"):
         return {"error": "Invalid role specified"}
 
 @app.get("/api/knowledge-graph")
-def knowledge_graph(role: str = "Scientist"):
+async def knowledge_graph(request: Request, role: str = "Scientist"):
     """
     Get knowledge graph data based on role using 100% real data analysis.
+    The graph is built in the execution pool once per dataset version; the
+    serialized response is cached per role and served with ETag validators.
     """
+    # Only known roles reach the caches, so arbitrary role strings cannot evict them
+    role = normalize_role(role)
+    if role is None:
+        raise HTTPException(status_code=400, detail=f"Role must be one of: {', '.join(KNOWLEDGE_GRAPH_ROLES)}")
     try:
-        import re
-        from collections import defaultdict, Counter
-        from sklearn.feature_extraction.text import TfidfVectorizer
-        from sklearn.metrics.pairwise import cosine_similarity
-        import numpy as np
-        
-        # Extract real research areas from abstracts and titles
-        def extract_research_areas():
-            research_areas = defaultdict(int)
-            area_keywords = {
-                'Microgravity Effects': ['microgravity', 'zero gravity', 'weightlessness', 'space environment'],
-                'Stem Cell Research': ['stem cell', 'embryonic', 'pluripotent', 'differentiation'],
-                'Bone & Skeletal': ['bone', 'skeletal', 'osteoporosis', 'calcium', 'mineralization'],
-                'Radiation Biology': ['radiation', 'cosmic', 'irradiation', 'DNA damage', 'radioprotection'],
-                'Cardiac Research': ['cardiac', 'heart', 'cardiovascular', 'myocardial'],
-                'Gene Expression': ['gene expression', 'transcription', 'mRNA', 'protein synthesis'],
-                'Immune System': ['immune', 'immunity', 'lymphocyte', 'cytokine'],
-                'Muscle Research': ['muscle', 'muscular', 'atrophy', 'contraction'],
-                'Neural Research': ['neural', 'brain', 'cognitive', 'neurotransmitter'],
-                'Metabolic Studies': ['metabolism', 'metabolic', 'glucose', 'insulin']
-            }
-            
-            for paper in PAPERS_DATA:
-                text = (paper.get('title', '') + ' ' + paper.get('abstract', '')).lower()
-                for area, keywords in area_keywords.items():
-                    for keyword in keywords:
-                        if keyword in text:
-                            research_areas[area] += 1
-                            break
-            
-            return dict(research_areas)
-        
-        # Extract real methodologies from papers
-        def extract_methodologies():
-            methodologies = defaultdict(int)
-            methodology_keywords = {
-                'Cell Culture': ['cell culture', 'in vitro', 'cultured cells'],
-                'Animal Studies': ['mouse', 'rat', 'animal', 'in vivo'],
-                'Molecular Analysis': ['PCR', 'western blot', 'qPCR', 'RT-PCR'],
-                'Imaging': ['microscopy', 'imaging', 'confocal', 'fluorescence'],
-                'Flow Cytometry': ['flow cytometry', 'FACS', 'cell sorting'],
-                'Gene Analysis': ['RNA-seq', 'transcriptome', 'genomics'],
-                'Protein Analysis': ['proteomics', 'mass spectrometry', 'protein'],
-                'Statistical Analysis': ['statistical', 'ANOVA', 'regression', 'analysis']
-            }
-            
-            for paper in PAPERS_DATA:
-                text = (paper.get('title', '') + ' ' + paper.get('abstract', '')).lower()
-                for method, keywords in methodology_keywords.items():
-                    for keyword in keywords:
-                        if keyword in text:
-                            methodologies[method] += 1
-                            break
-            
-            return dict(methodologies)
-        
-        # Calculate real paper similarities using TF-IDF
-        def calculate_paper_similarities():
-            if len(PAPERS_DATA) < 2:
-                return []
-            
-            # Prepare text data
-            texts = []
-            paper_ids = []
-            for paper in PAPERS_DATA[:50]:  # Limit for performance
-                text = paper.get('title', '') + ' ' + paper.get('abstract', '')
-                texts.append(text)
-                paper_ids.append(paper['id'])
-            
-            # Calculate TF-IDF similarity
-            vectorizer = TfidfVectorizer(max_features=1000, stop_words='english')
-            tfidf_matrix = vectorizer.fit_transform(texts)
-            similarity_matrix = cosine_similarity(tfidf_matrix)
-            
-            # Extract significant similarities
-            similarities = []
-            for i in range(len(paper_ids)):
-                for j in range(i + 1, len(paper_ids)):
-                    similarity = similarity_matrix[i][j]
-                    if similarity > 0.1:  # Threshold for meaningful similarity
-                        similarities.append({
-                            'source': paper_ids[i],
-                            'target': paper_ids[j],
-                            'weight': float(similarity),
-                            'type': 'content_similarity'
-                        })
-            
-            return similarities
-        
-        # Generate real citation network
-        def generate_citation_network():
-            citation_edges = []
-            for i, paper in enumerate(PAPERS_DATA[:30]):  # Limit for performance
-                citations = paper.get('citations', 0)
-                if citations > 0:
-                    # Find papers that might cite this one (simplified)
-                    for j, other_paper in enumerate(PAPERS_DATA[i+1:i+6]):
-                        if other_paper.get('citations', 0) > 0:
-                            citation_edges.append({
-                                'source': paper['id'],
-                                'target': other_paper['id'],
-                                'weight': min(citations / 100, 1.0),
-                                'type': 'citation_network'
-                            })
-            return citation_edges
-        
-        # Generate real keyword co-occurrence network
-        def generate_keyword_network():
-            keyword_cooccurrence = defaultdict(int)
-            paper_keywords = []
-            
-            for paper in PAPERS_DATA:
-                keywords = paper.get('keywords', [])
-                if keywords:
-                    paper_keywords.append(keywords)
-                    # Count co-occurrences
-                    for i, kw1 in enumerate(keywords):
-                        for kw2 in keywords[i+1:]:
-                            pair = tuple(sorted([kw1.lower(), kw2.lower()]))
-                            keyword_cooccurrence[pair] += 1
-            
-            # Create keyword network edges
-            keyword_edges = []
-            for (kw1, kw2), count in keyword_cooccurrence.items():
-                if count > 1:  # Only significant co-occurrences
-                    keyword_edges.append({
-                        'source': kw1,
-                        'target': kw2,
-                        'weight': count / len(PAPERS_DATA),
-                        'type': 'keyword_cooccurrence'
-                    })
-            
-            return keyword_edges
-        
-        # Generate real author collaboration network
-        def generate_author_network():
-            author_papers = defaultdict(list)
-            for paper in PAPERS_DATA:
-                authors = paper.get('authors', [])
-                for author in authors:
-                    author_papers[author].append(paper['id'])
-            
-            # Find collaborations
-            collaboration_edges = []
-            authors = list(author_papers.keys())
-            for i, author1 in enumerate(authors[:20]):  # Limit for performance
-                for author2 in authors[i+1:21]:
-                    papers1 = set(author_papers[author1])
-                    papers2 = set(author_papers[author2])
-                    common_papers = papers1.intersection(papers2)
-                    if len(common_papers) > 0:
-                        collaboration_edges.append({
-                            'source': author1,
-                            'target': author2,
-                            'weight': len(common_papers) / max(len(papers1), len(papers2)),
-                            'type': 'author_collaboration'
-                        })
-            
-            return collaboration_edges
-        
-        # Generate the complete knowledge graph
-        research_areas = extract_research_areas()
-        methodologies = extract_methodologies()
-        paper_similarities = calculate_paper_similarities()
-        citation_network = generate_citation_network()
-        keyword_network = generate_keyword_network()
-        author_network = generate_author_network()
-        
-        # Create research area nodes
-        area_nodes = []
-        for area, count in research_areas.items():
-            area_nodes.append({
-                'id': area.lower().replace(' ', '_'),
-                'label': area,
-                'type': 'research_area',
-                'size': count,
-                'count': count,
-                'color': f'hsl({hash(area) % 360}, 70%, 50%)'
-            })
-        
-        # Create methodology nodes
-        method_nodes = []
-        for method, count in methodologies.items():
-            method_nodes.append({
-                'id': method.lower().replace(' ', '_'),
-                'label': method,
-                'type': 'methodology',
-                'size': count,
-                'count': count,
-                'color': f'hsl({hash(method) % 360}, 60%, 60%)'
-            })
-        
-        # Create paper nodes (top papers by citations)
-        top_papers = sorted(PAPERS_DATA, key=lambda x: x.get('citations', 0), reverse=True)[:20]
-        paper_nodes = []
-        for paper in top_papers:
-            paper_nodes.append({
-                'id': paper['id'],
-                'label': paper['title'][:40] + '...' if len(paper['title']) > 40 else paper['title'],
-                'type': 'paper',
-                'size': paper.get('citations', 1) + 5,
-                'citations': paper.get('citations', 0),
-                'funding': paper.get('funding', 0),
-                'color': f'hsl({hash(paper['id']) % 360}, 80%, 40%)'
-            })
-        
-        # Combine all nodes and edges
-        all_nodes = area_nodes + method_nodes + paper_nodes
-        all_edges = paper_similarities + citation_network + keyword_network + author_network
-        
-        return {
-            "nodes": all_nodes,
-            "edges": all_edges,
-            "research_areas": research_areas,
-            "methodologies": methodologies,
-            "statistics": {
-                "total_papers": len(PAPERS_DATA),
-                "total_nodes": len(all_nodes),
-                "total_edges": len(all_edges),
-                "research_areas_count": len(research_areas),
-                "methodologies_count": len(methodologies)
-            },
-            "role": role
-        }
+        key = (PAPERS_VERSION, role)
+        body = KNOWLEDGE_GRAPH_RESPONSES.get(key)
+        if body is None:
+            version, body = await execution_pool.run("knowledge_graph", worker_tasks.knowledge_graph, role)
+            if version == PAPERS_VERSION and len(KNOWLEDGE_GRAPH_RESPONSES) < 32:
+                KNOWLEDGE_GRAPH_RESPONSES[key] = body
+        return conditional_response(request, body, last_modified=papers_repository.last_modified)
     except Exception as e:
         return {"error": f"Error generating knowledge graph: {str(e)}"}
 
@@ -974,7 +905,7 @@ def gap_finder(role: str = "Scientist"):
         }
 
 @app.post("/api/hypothesis")
-def generate_hypotheses(request: dict):
+async def generate_hypotheses(request: dict):
     """
     Generate scientific hypotheses based on research query.
     """
@@ -990,7 +921,7 @@ def generate_hypotheses(request: dict):
             }
         
         # Generate hypotheses using the hypothesis generator
-        hypotheses = hypothesis_generator.generate_hypotheses(query, role)
+        hypotheses = await execution_pool.run("hypothesis", worker_tasks.generate_hypotheses, query, role)
         
         # Add metadata
         metadata = {
@@ -1066,6 +997,50 @@ def get_budget_simulation(
     except Exception as e:
         return {"success": False, "error": f"Error running simulation: {str(e)}"}
 
+class BudgetScenario(BaseModel):
+    domain: str
+    adjustment_percentage: float
+
+class BatchBudgetSimulationRequest(BaseModel):
+    scenarios: List[BudgetScenario] = []  # explicit (domain, adjustment) pairs
+    domains: List[str] = []  # grid: every domain (default: all domains) ...
+    adjustments: List[float] = []  # ... at every adjustment percentage
+    allocation: Dict[str, float] = {}  # portfolio: one adjustment per domain, applied together
+
+MAX_BUDGET_SCENARIOS = int(os.environ.get("NASA_MAX_BUDGET_SCENARIOS", "10000"))
+
+@app.post("/api/manager/budget-simulation/batch")
+def simulate_budget_batch(req: BatchBudgetSimulationRequest):
+    """
+    Simulate many budget adjustments in one request: explicit scenarios, a
+    domains x adjustments grid, and/or a portfolio allocation whose adjustments
+    are applied together and totalled. Projections are computed together from
+    the per-domain totals.
+    """
+    if not req.scenarios and not req.adjustments and not req.allocation:
+        raise HTTPException(status_code=400, detail="Provide scenarios, adjustments or an allocation")
+    grid_domains = (req.domains or data_processor.get_domains()) if req.adjustments else []
+    n_scenarios = len(req.scenarios) + len(grid_domains) * len(req.adjustments) + len(req.allocation)
+    if n_scenarios > MAX_BUDGET_SCENARIOS:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BUDGET_SCENARIOS} scenarios per batch")
+    adjustments = ([s.adjustment_percentage for s in req.scenarios] + req.adjustments +
+                   list(req.allocation.values()))
+    if any(adjustment < -100 or adjustment > 200 for adjustment in adjustments):
+        raise HTTPException(status_code=400, detail="Adjustment percentage must be between -100 and 200")
+    
+    try:
+        scenarios = [(s.domain, s.adjustment_percentage) for s in req.scenarios]
+        scenarios += [(domain, adjustment) for domain in grid_domains for adjustment in req.adjustments]
+        data = {"simulations": data_processor.get_budget_simulations(scenarios)}
+        if req.allocation:
+            data["portfolio"] = data_processor.get_portfolio_simulation(req.allocation)
+        # Plain numbers only, so json.dumps can skip FastAPI's generic encoder
+        body = json.dumps({"success": True, "data": data}, ensure_ascii=False, allow_nan=False,
+                          separators=(",", ":")).encode("utf-8")
+        return Response(body, media_type="application/json")
+    except Exception as e:
+        return {"success": False, "error": f"Error running simulations: {str(e)}"}
+
 @app.get("/api/manager/emerging-areas")
 def get_emerging_areas():
     """
@@ -1115,20 +1090,15 @@ def get_cross_domain_synergy():
         return {"success": False, "error": f"Error fetching cross-domain synergy: {str(e)}"}
 
 @app.get("/api/manager/dashboard-summary")
-def get_dashboard_summary():
+def get_dashboard_summary(request: Request):
     """
     Get comprehensive dashboard summary for manager
     """
     try:
-        summary = {
-            "domain_analytics": data_processor.get_domain_analytics(),
-            "investment_recommendations": data_processor.get_investment_recommendations(),
-            "red_flag_alerts": data_processor.get_red_flag_alerts(),
-            "emerging_areas": data_processor.get_emerging_areas(),
-            "project_status": data_processor.get_project_status_overview(),
-            "last_updated": data_processor.last_update.isoformat() if data_processor.last_update else None
-        }
-        return {"success": True, "data": summary}
+        # Serialized once per data load; refresh_data invalidates it
+        body = data_processor.dashboard_summary_json()
+        last_update = data_processor.last_update
+        return conditional_response(request, body, last_modified=last_update.timestamp() if last_update else None)
     except Exception as e:
         return {"success": False, "error": f"Error fetching dashboard summary: {str(e)}"}
 
@@ -1590,7 +1560,7 @@ def analyze_mission_with_ai(mission_params: MissionPlannerRequest) -> MissionPla
         """
         
         # Generate AI analysis
-        result = summarizer(prompt, max_length=500, min_length=100, do_sample=False)
+        result = get_summarizer()(prompt, max_length=500, min_length=100, do_sample=False)
         ai_analysis = result[0]['summary_text']
         
         # Extract structured data based on mission parameters and real-time data
@@ -1944,39 +1914,68 @@ class ChatResponse(BaseModel):
     sources: List[Dict[str, Any]]
     timestamp: str
     session_id: str
+    metadata: Dict[str, Any] = {}
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str]
+    top_k: int = 8
+    backend: str = "ai"  # "ai", "nasa-ai" or "hybrid"
+
+MAX_BATCH_QUERIES = int(os.environ.get("NASA_MAX_BATCH_QUERIES", "512"))
+
+# Recent query embeddings and results for the AI chatbot search
+ai_query_cache = QueryCache()
 
 def search_ai_chunks(query: str, top_k: int = 5) -> List[Dict[str, Any]]:
     """Search for relevant chunks using FAISS."""
-    if AI_MODEL is None or AI_INDEX is None:
-        return []
+    return search_ai_chunks_batch([query], top_k)[0]
+
+def search_ai_chunks_batch(queries: List[str], top_k: int = 5) -> List[List[Dict[str, Any]]]:
+    """Search chunks for many queries with one encoder pass and one (N, d) FAISS search."""
+    ai_chunks = get_ai_chunks()
+    ai_index = resource_registry.get("ai_index")
+    ai_model = resource_registry.get("embedding_model")
+    if not queries or ai_chunks is None or ai_model is None or ai_index is None:
+        return [[] for _ in queries]
     
     try:
-        # Encode query
-        query_embedding = AI_MODEL.encode([query])
-        faiss.normalize_L2(query_embedding)
-        
-        # Search
-        scores, indices = AI_INDEX.search(query_embedding.astype('float32'), top_k)
-        
-        # Format results
+        return ai_query_cache.search(list(queries), top_k, (ai_chunks.version, id(ai_index)),
+                                     lambda texts: _encode_ai_queries(ai_model, texts),
+                                     lambda embeddings: _search_ai_embeddings(ai_chunks, ai_index, embeddings, top_k))
+    except Exception as e:
+        print(f"Error in search_ai_chunks_batch: {e}")
+        return [[] for _ in queries]
+
+def _encode_ai_queries(ai_model, queries: List[str]) -> np.ndarray:
+    query_embeddings = np.ascontiguousarray(ai_model.encode(queries), dtype='float32')
+    faiss.normalize_L2(query_embeddings)
+    return query_embeddings
+
+def _search_ai_embeddings(ai_chunks: VectorStore, ai_index, query_embeddings: np.ndarray, top_k: int) -> List[List[Dict[str, Any]]]:
+    # Search, over-fetching enough to skip tombstoned rows
+    fetch_k = top_k + min(ai_chunks.deleted_count, top_k * 4)
+    scores, indices = ai_index.search(query_embeddings, fetch_k)
+    
+    # Format results
+    batch_results = []
+    for row_scores, row_indices in zip(scores, indices):
         results = []
-        for score, idx in zip(scores[0], indices[0]):
-            if idx < len(AI_CHUNKS):
-                chunk = AI_CHUNKS[idx]
+        for score, idx in zip(row_scores, row_indices):
+            if len(results) >= top_k:
+                break
+            if 0 <= idx < len(ai_chunks) and not ai_chunks.is_deleted(idx):
+                chunk = ai_chunks[idx]
                 results.append({
                     'id': int(idx),
-                    'title': chunk['metadata']['title'],
+                    'title': f"Paper {chunk['paper_id']}",
                     'snippet': chunk['chunk'][:200] + "..." if len(chunk['chunk']) > 200 else chunk['chunk'],
-                    'url': chunk['metadata']['url'],
+                    'url': 'N/A',
                     'score': float(score),
-                    'paper_id': chunk['metadata']['paper_id'],
-                    'section': chunk['metadata']['section']
+                    'paper_id': chunk['paper_id'],
+                    'section': chunk['section']
                 })
-        
-        return results
-    except Exception as e:
-        print(f"Error in search_ai_chunks: {e}")
-        return []
+        batch_results.append(results)
+    return batch_results
 
 def generate_ai_response(query: str, search_results: List[Dict[str, Any]]) -> str:
     """Generate detailed AI response based on search results."""
@@ -1987,7 +1986,7 @@ def generate_ai_response(query: str, search_results: List[Dict[str, Any]]) -> st
     query_lower = query.lower()
     
     if any(word in query_lower for word in ['hello', 'hi', 'hey', 'how are you']):
-        return f"Hello! I'm your NASA Bioscience Research Assistant. I have access to {len(AI_CHUNKS)} research chunks from 572 unique publications and I'm here to help you explore the fascinating world of space biology. What would you like to know about?"
+        return f"Hello! I'm your NASA Bioscience Research Assistant. I have access to {get_ai_chunks().live_count if get_ai_chunks() else 0} research chunks from 572 unique publications and I'm here to help you explore the fascinating world of space biology. What would you like to know about?"
     
     if any(word in query_lower for word in ['thank', 'thanks']):
         return "You're welcome! I'm always here to help you explore NASA's bioscience research. Feel free to ask me anything about space biology, astronaut health, or related topics!"
@@ -2087,7 +2086,7 @@ def ai_chat_endpoint(request: ChatMessage):
     AI-powered chat endpoint for research assistance.
     """
     try:
-        if not AI_CHUNKS or AI_MODEL is None or AI_INDEX is None:
+        if not get_ai_chunks() or resource_registry.get("embedding_model") is None or resource_registry.get("ai_index") is None:
             raise HTTPException(status_code=503, detail="AI chatbot is not available")
         
         # Search for relevant chunks
@@ -2165,13 +2164,13 @@ def nasa_ai_chat_endpoint(request: ChatMessage):
         )
 
 @app.post("/api/hybrid-nasa-ai-chat", response_model=ChatResponse)
-def hybrid_nasa_ai_chat_endpoint(request: ChatMessage):
+async def hybrid_nasa_ai_chat_endpoint(request: ChatMessage):
     """
     Hybrid NASA AI-powered chat endpoint combining Ollama model with RAG system.
     """
     try:
         # Use the hybrid NASA AI service
-        result = hybrid_nasa_ai.chat(request.message)
+        result = await hybrid_nasa_ai.achat(request.message)
         
         # Convert sources to clean format
         clean_sources = []
@@ -2186,7 +2185,13 @@ def hybrid_nasa_ai_chat_endpoint(request: ChatMessage):
         
         # Format the response with hybrid AI branding
         response_type = result.get("response_type", "Hybrid AI")
-        ollama_status = "✅ Ollama Model Active" if result.get("ollama_available", False) else "⚠️ RAG System Only"
+        breaker = result.get("ollama_breaker", {})
+        if result.get("ollama_available", False):
+            ollama_status = "✅ Ollama Model Active"
+        elif breaker.get("state") == "open" and breaker.get("retry_in_seconds"):
+            ollama_status = f"⚠️ RAG System Only (Ollama unreachable, retrying in {breaker['retry_in_seconds']:.0f}s)"
+        else:
+            ollama_status = "⚠️ RAG System Only"
         
         formatted_response = f"""🤖 **NASA Hybrid AI Assistant** ({response_type})
 
@@ -2202,7 +2207,13 @@ def hybrid_nasa_ai_chat_endpoint(request: ChatMessage):
             response=formatted_response,
             sources=clean_sources,
             timestamp=str(pd.Timestamp.now()),
-            session_id=request.session_id
+            session_id=request.session_id,
+            metadata={
+                "response_type": response_type,
+                "ollama_available": result.get("ollama_available", False),
+                "degraded": result.get("degraded", False),
+                "ollama_breaker": breaker
+            }
         )
         
     except Exception as e:
@@ -2213,6 +2224,64 @@ def hybrid_nasa_ai_chat_endpoint(request: ChatMessage):
             session_id=request.session_id
         )
 
+@app.post("/api/hybrid-nasa-ai-chat/stream")
+async def hybrid_nasa_ai_chat_stream_endpoint(request: ChatMessage):
+    """
+    Streaming variant of the hybrid chat as Server-Sent Events: a "sources" event,
+    then "token" events as Ollama generates, then a final "done" event.
+    """
+    if not request.message.strip():
+        raise HTTPException(status_code=400, detail="Please enter a question about NASA space biology research.")
+    
+    async def event_stream():
+        try:
+            async for event in hybrid_nasa_ai.stream_hybrid_response(request.message):
+                event["session_id"] = request.session_id
+                yield f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+        except Exception as e:
+            yield f"event: error\ndata: {json.dumps({'type': 'error', 'detail': str(e)})}\n\n"
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
+
+@app.post("/api/search/batch")
+def batch_search_endpoint(request: BatchSearchRequest):
+    """
+    Retrieve sources for many questions in one call (evaluation jobs, frontend prefetching).
+    All queries are encoded in one forward pass and searched with a single index call.
+    """
+    if not request.queries:
+        raise HTTPException(status_code=400, detail="queries must not be empty")
+    if len(request.queries) > MAX_BATCH_QUERIES:
+        raise HTTPException(status_code=400, detail=f"At most {MAX_BATCH_QUERIES} queries per batch")
+    top_k = max(1, min(request.top_k, 50))
+    
+    start = time.perf_counter()
+    if request.backend == "ai":
+        if not get_ai_chunks() or resource_registry.get("embedding_model") is None or resource_registry.get("ai_index") is None:
+            raise HTTPException(status_code=503, detail="AI chatbot is not available")
+        batch_results = search_ai_chunks_batch(request.queries, top_k=top_k)
+    elif request.backend == "nasa-ai":
+        batch_results = nasa_ai.search_context_batch(request.queries, top_k=top_k)
+    elif request.backend == "hybrid":
+        batch_results = hybrid_nasa_ai.search_context_batch(request.queries, top_k=top_k)
+    else:
+        raise HTTPException(status_code=400, detail="backend must be 'ai', 'nasa-ai' or 'hybrid'")
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    
+    return {
+        "backend": request.backend,
+        "top_k": top_k,
+        "count": len(batch_results),
+        "results": [
+            {"query": query, "sources": sources}
+            for query, sources in zip(request.queries, batch_results)
+        ],
+        "elapsed_ms": round(elapsed_ms, 2),
+        "queries_per_second": round(len(batch_results) / (elapsed_ms / 1000), 1) if elapsed_ms else 0,
+        "timestamp": str(pd.Timestamp.now())
+    }
+
 if __name__ == "__main__":
     import uvicorn
     print("🚀 Starting NASA AI Research Assistant Backend...")
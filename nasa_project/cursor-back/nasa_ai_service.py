@@ -1,11 +1,14 @@
 import os
 import sys
 import json
-import pickle
+import threading
 import numpy as np
-from sentence_transformers import SentenceTransformer
 import faiss
 import re
+from encoder_service import encoder_service
+from vector_store import open_rag_chunk_store
+from ann_index import rag_search_index
+from query_cache import QueryCache
 from typing import List, Dict, Any, Optional
 
 class NASAAI:
@@ -17,16 +20,27 @@ class NASAAI:
         self.chunks = None
         # Use absolute path to avoid issues
         self.rag_system_path = os.path.abspath(rag_system_path)
+        self.query_cache = QueryCache()
+        self._loaded = False
+        self._load_lock = threading.Lock()
         print(f"RAG system path: {self.rag_system_path}")
-        self.load_models()
+    
+    def ensure_loaded(self) -> "NASAAI":
+        """Load models on first use instead of at import time"""
+        if not self._loaded:
+            with self._load_lock:
+                if not self._loaded:
+                    self.load_models()
+                    self._loaded = True
+        return self
     
     def load_models(self):
         """Load the lightweight NASA AI models"""
         try:
             print("Loading NASA AI models...")
             
-            # Load embedding model
-            self.embedding_model = SentenceTransformer("all-MiniLM-L6-v2")
+            # Use the process-wide shared embedding model
+            self.embedding_model = encoder_service.load()
             
             # Load RAG components
             faiss_path = os.path.join(self.rag_system_path, "faiss_index.bin")
@@ -34,8 +48,11 @@ class NASAAI:
             
             if os.path.exists(faiss_path) and os.path.exists(chunks_path):
                 self.faiss_index = faiss.read_index(faiss_path)
-                with open(chunks_path, "rb") as f:
-                    self.chunks = pickle.load(f)
+                # Chunk metadata is memory-mapped from a store rebuilt whenever chunks.pkl changes
+                self.chunks = open_rag_chunk_store(self.rag_system_path, self.faiss_index,
+                                                   encoder_service.model_name, encoder_service.encode)
+                # Swap in an IVF/HNSW index when NASA_ANN_INDEX asks for one
+                self.faiss_index = rag_search_index(self.faiss_index, self.chunks)
                 print(f"✅ NASA AI loaded successfully with {len(self.chunks)} research chunks")
             else:
                 print("❌ RAG system files not found")
@@ -45,15 +62,29 @@ class NASAAI:
     
     def search_context(self, query: str, top_k: int = 8) -> List[Dict[str, Any]]:
         """Search for relevant context using RAG"""
-        if not self.embedding_model or not self.faiss_index or not self.chunks:
-            return []
+        return self.search_context_batch([query], top_k)[0]
+    
+    def search_context_batch(self, queries: List[str], top_k: int = 8) -> List[List[Dict[str, Any]]]:
+        """Search context for many queries with one encoder pass and one (N, d) index search"""
+        self.ensure_loaded()
+        if not queries or not self.embedding_model or not self.faiss_index or not self.chunks:
+            return [[] for _ in queries]
         
         try:
-            query_embedding = self.embedding_model.encode([query])
-            D, I = self.faiss_index.search(query_embedding, top_k)
-            
+            return self.query_cache.search(list(queries), top_k, (self.chunks.version, id(self.faiss_index)),
+                                           self.embedding_model.encode,
+                                           lambda embeddings: self._search_embeddings(embeddings, top_k))
+        except Exception as e:
+            print(f"Search error: {e}")
+            return [[] for _ in queries]
+    
+    def _search_embeddings(self, query_embeddings: np.ndarray, top_k: int) -> List[List[Dict[str, Any]]]:
+        D, I = self.faiss_index.search(query_embeddings, top_k)
+        
+        batch_results = []
+        for row_ids, row_scores in zip(I, D):
             results = []
-            for i, score in zip(I[0], D[0]):
+            for i, score in zip(row_ids, row_scores):
                 if i != -1:
                     chunk = self.chunks[i]
                     results.append({
@@ -63,14 +94,13 @@ class NASAAI:
                         'section': chunk.get('section', 'N/A'),
                         'score': float(score)
                     })
-            return results
-        except Exception as e:
-            print(f"Search error: {e}")
-            return []
+            batch_results.append(results)
+        return batch_results
     
-    def generate_response(self, query: str) -> str:
-        """Generate enhanced response using NASA AI"""
-        context_results = self.search_context(query, top_k=8)
+    def generate_response(self, query: str, context_results: Optional[List[Dict[str, Any]]] = None) -> str:
+        """Generate enhanced response using NASA AI; pass context_results to reuse a retrieval"""
+        if context_results is None:
+            context_results = self.search_context(query, top_k=8)
         
         if not context_results:
             return "I don't have enough relevant information in the NASA research database to answer that question accurately."
@@ -215,9 +245,9 @@ The findings represent decades of scientific investigation and continue to infor
                     "confidence": "Low"
                 }
             
-            # Generate response
-            response = self.generate_response(message)
+            # Retrieve once and share it between the answer and the sources
             context_results = self.search_context(message, top_k=8)
+            response = self.generate_response(message, context_results)
             
             # Format sources
             sources_info = f"Based on {len(context_results)} NASA research papers"
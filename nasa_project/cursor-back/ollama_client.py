@@ -0,0 +1,107 @@
+"""
+Ollama HTTP Client
+Pooled, persistent HTTP sessions to the Ollama server for the hybrid chat: an
+async client for the FastAPI handlers (with token streaming) and a sync client
+for the blocking code paths. Transports can be injected so the client can be
+exercised against ollama_stub.py without a running server.
+"""
+import json
+import threading
+import httpx
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+DEFAULT_BASE_URL = "http://localhost:11434"
+
+
+class OllamaClient:
+    """Keeps one connection pool per mode open to the Ollama server"""
+
+    def __init__(self, base_url: str = DEFAULT_BASE_URL, timeout: float = 30.0, connect_timeout: float = 5.0,
+                 max_connections: int = 20, transport: Optional[httpx.AsyncBaseTransport] = None,
+                 sync_transport: Optional[httpx.BaseTransport] = None):
+        self.base_url = base_url.rstrip("/")
+        # Streaming reads can pause between tokens; the read timeout bounds each gap, not the whole answer
+        self.timeout = httpx.Timeout(timeout, connect=connect_timeout)
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections)
+        self._transport = transport
+        self._sync_transport = sync_transport
+        self._async_client: Optional[httpx.AsyncClient] = None
+        self._sync_client: Optional[httpx.Client] = None
+        self._lock = threading.Lock()
+
+    # --- connection pools ---
+
+    @property
+    def async_client(self) -> httpx.AsyncClient:
+        if self._async_client is None or self._async_client.is_closed:
+            self._async_client = httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout,
+                                                   limits=self.limits, transport=self._transport)
+        return self._async_client
+
+    @property
+    def sync_client(self) -> httpx.Client:
+        if self._sync_client is None or self._sync_client.is_closed:
+            with self._lock:
+                if self._sync_client is None or self._sync_client.is_closed:
+                    self._sync_client = httpx.Client(base_url=self.base_url, timeout=self.timeout,
+                                                     limits=self.limits, transport=self._sync_transport)
+        return self._sync_client
+
+    async def aclose(self):
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+        if self._sync_client is not None:
+            self._sync_client.close()
+            self._sync_client = None
+
+    # --- requests ---
+
+    @staticmethod
+    def _payload(model: str, prompt: str, options: Optional[Dict[str, Any]], stream: bool) -> Dict[str, Any]:
+        payload = {"model": model, "prompt": prompt, "stream": stream}
+        if options:
+            payload["options"] = options
+        return payload
+
+    @staticmethod
+    def _model_names(data: Dict[str, Any]) -> List[str]:
+        return [model.get("name", "") for model in data.get("models", [])]
+
+    async def list_models(self) -> List[str]:
+        """Names of the models the server has pulled"""
+        response = await self.async_client.get("/api/tags")
+        response.raise_for_status()
+        return self._model_names(response.json())
+
+    def list_models_sync(self, timeout: Optional[float] = 5.0) -> List[str]:
+        response = self.sync_client.get("/api/tags", timeout=timeout)
+        response.raise_for_status()
+        return self._model_names(response.json())
+
+    async def generate(self, model: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        """Whole completion in one response"""
+        response = await self.async_client.post("/api/generate", json=self._payload(model, prompt, options, False))
+        response.raise_for_status()
+        return response.json().get("response", "")
+
+    def generate_sync(self, model: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> str:
+        response = self.sync_client.post("/api/generate", json=self._payload(model, prompt, options, False))
+        response.raise_for_status()
+        return response.json().get("response", "")
+
+    async def stream(self, model: str, prompt: str, options: Optional[Dict[str, Any]] = None) -> AsyncIterator[str]:
+        """Yield completion fragments as Ollama emits them (one JSON object per line)"""
+        async with self.async_client.stream("POST", "/api/generate",
+                                            json=self._payload(model, prompt, options, True)) as response:
+            response.raise_for_status()
+            async for line in response.aiter_lines():
+                if not line.strip():
+                    continue
+                data = json.loads(line)
+                if data.get("error"):
+                    raise RuntimeError(data["error"])
+                if data.get("response"):
+                    yield data["response"]
+                if data.get("done"):
+                    break
@@ -0,0 +1,164 @@
+"""
+Ollama Health Monitor
+A circuit breaker in front of the Ollama server plus a background thread that
+probes /api/tags. Chat requests check the breaker instead of calling a dead
+server: after repeated failures it opens and requests go straight to the RAG
+path; once the backoff expires a single half-open probe decides whether to close
+it again. Backoff doubles on every failed probe up to a ceiling.
+
+    NASA_OLLAMA_PROBE_INTERVAL        seconds between probes while healthy (default 30)
+    NASA_OLLAMA_FAILURE_THRESHOLD     consecutive failures that open the breaker (default 3)
+    NASA_OLLAMA_BACKOFF_SECONDS       first open period (default 5)
+    NASA_OLLAMA_MAX_BACKOFF_SECONDS   longest open period (default 300)
+"""
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitBreaker:
+    """Closed → open after repeated failures, half-open probe after an exponential backoff"""
+
+    def __init__(self, failure_threshold: int = 3, base_backoff: float = 5.0, max_backoff: float = 300.0):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.state = OPEN  # Unknown until the first probe succeeds
+        self.consecutive_failures = 0
+        self.backoff = base_backoff
+        self.retry_at = 0.0
+        self.times_opened = 0
+        self.last_error: Optional[str] = None
+        self.last_success_at: Optional[float] = None
+        self.last_failure_at: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_closed(self) -> bool:
+        return self.state == CLOSED
+
+    def retry_in(self) -> float:
+        return max(0.0, self.retry_at - time.monotonic()) if self.state == OPEN else 0.0
+
+    def try_half_open(self) -> bool:
+        """Claim the single probe allowed once the backoff has expired"""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() >= self.retry_at:
+                self.state = HALF_OPEN
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self.state != CLOSED:
+                print("✅ Ollama circuit closed")
+            self.state = CLOSED
+            self.consecutive_failures = 0
+            self.backoff = self.base_backoff
+            self.last_error = None
+            self.last_success_at = time.time()
+
+    def record_failure(self, error: Any = None):
+        with self._lock:
+            self.consecutive_failures += 1
+            self.last_error = str(error) if error is not None else None
+            self.last_failure_at = time.time()
+            # Failures reported while already open leave the backoff alone
+            if self.state == HALF_OPEN or (self.state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+                self._open()
+
+    def _open(self):
+        self.state = OPEN
+        self.retry_at = time.monotonic() + self.backoff
+        self.times_opened += 1
+        print(f"⚠️ Ollama circuit open, next probe in {self.backoff:.0f}s ({self.last_error})")
+        self.backoff = min(self.backoff * 2, self.max_backoff)
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.consecutive_failures,
+                "retry_in_seconds": round(self.retry_in(), 1),
+                "times_opened": self.times_opened,
+                "last_error": self.last_error,
+                "last_success_at": self.last_success_at,
+            }
+
+
+class OllamaHealthMonitor:
+    """Background thread probing Ollama and feeding the breaker"""
+
+    def __init__(self, probe_fn: Callable[[], Any], breaker: Optional[CircuitBreaker] = None,
+                 interval: float = 30.0):
+        self.probe_fn = probe_fn
+        self.breaker = breaker or CircuitBreaker()
+        self.interval = interval
+        self.probes = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._probe_lock = threading.Lock()
+
+    def probe_now(self) -> bool:
+        """Probe once and update the breaker; returns whether Ollama is usable"""
+        with self._probe_lock:
+            self.probes += 1
+            try:
+                self.probe_fn()
+            except Exception as e:
+                self.breaker.record_failure(e)
+                return False
+            self.breaker.record_success()
+            return True
+
+    def start(self) -> "OllamaHealthMonitor":
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="ollama-health", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+
+    def wake(self):
+        """Probe as soon as the breaker allows, e.g. after a request failed"""
+        self._wake.set()
+
+    def _run(self):
+        # The breaker starts open with no backoff, so the first probe runs immediately
+        while not self._stop.is_set():
+            if self.breaker.is_closed:
+                self.probe_now()
+            elif self.breaker.try_half_open():
+                self.probe_now()
+            if self.breaker.is_closed:
+                delay = self.interval
+            else:
+                delay = min(self.interval, self.breaker.retry_in()) or 0.5
+            self._wake.wait(delay)
+            self._wake.clear()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            **self.breaker.snapshot(),
+            "monitor_running": self._thread is not None and self._thread.is_alive(),
+            "probe_interval_seconds": self.interval,
+            "probes": self.probes,
+        }
+
+
+def health_monitor_from_env(probe_fn: Callable[[], Any]) -> OllamaHealthMonitor:
+    breaker = CircuitBreaker(
+        failure_threshold=int(os.environ.get("NASA_OLLAMA_FAILURE_THRESHOLD", "3")),
+        base_backoff=float(os.environ.get("NASA_OLLAMA_BACKOFF_SECONDS", "5")),
+        max_backoff=float(os.environ.get("NASA_OLLAMA_MAX_BACKOFF_SECONDS", "300")),
+    )
+    return OllamaHealthMonitor(probe_fn, breaker, interval=float(os.environ.get("NASA_OLLAMA_PROBE_INTERVAL", "30")))
@@ -0,0 +1,72 @@
+"""
+Ollama Stub Server
+Mimics the parts of the Ollama API the hybrid chat uses (/api/tags and
+/api/generate, streaming and non-streaming) so the backend can be run and tested
+without a model server:
+
+    python ollama_stub.py --port 11435
+    OLLAMA_BASE_URL=http://localhost:11435 python main.py
+"""
+import argparse
+import asyncio
+import json
+from typing import Any, Dict, Optional
+from fastapi import FastAPI
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+
+STUB_MODEL = "Ravurijeetendra12/ollama-nasa-model:latest"
+
+
+class GenerateRequest(BaseModel):
+    model: str
+    prompt: str
+    stream: bool = True
+    options: Optional[Dict[str, Any]] = None
+
+
+def stub_completion(prompt: str) -> str:
+    """Deterministic answer derived from the question in the prompt"""
+    question = prompt.strip().splitlines()[-1] if prompt.strip() else ""
+    for line in prompt.splitlines():
+        if line.startswith(("User Question:", "Question:")):
+            question = line.split(":", 1)[1].strip()
+            break
+    return f"Stub answer about {question} based on NASA research."
+
+
+def create_app(token_delay: float = 0.0, models: Optional[list] = None) -> FastAPI:
+    app = FastAPI(title="Ollama Stub")
+    model_names = models if models is not None else [STUB_MODEL]
+
+    @app.get("/api/tags")
+    def tags():
+        return {"models": [{"name": name, "model": name, "size": 0} for name in model_names]}
+
+    @app.post("/api/generate")
+    async def generate(request: GenerateRequest):
+        text = stub_completion(request.prompt)
+        if not request.stream:
+            return {"model": request.model, "response": text, "done": True}
+
+        async def lines():
+            for token in text.split(" "):
+                if token_delay:
+                    await asyncio.sleep(token_delay)
+                yield json.dumps({"model": request.model, "response": token + " ", "done": False}) + "\n"
+            yield json.dumps({"model": request.model, "response": "", "done": True}) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    return app
+
+
+app = create_app()
+
+if __name__ == "__main__":
+    import uvicorn
+    parser = argparse.ArgumentParser(description="Stub Ollama server for local testing")
+    parser.add_argument("--port", type=int, default=11435)
+    parser.add_argument("--token-delay", type=float, default=0.02, help="Seconds between streamed tokens")
+    args = parser.parse_args()
+    uvicorn.run(create_app(token_delay=args.token_delay), host="127.0.0.1", port=args.port)
@@ -0,0 +1,157 @@
+"""
+Paper Repository
+The publication records served by /api/papers, built column-wise from the CSV
+instead of row by row, with an id → row index for O(1) lookups. Papers do not
+change after loading, so each one is serialized to JSON once and pages are
+assembled from the stored bytes.
+
+Paper ids are derived from the content (PMC id of the link, or a title hash), so
+they are the same across restarts and server processes.
+"""
+import hashlib
+import json
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, List, Optional
+import pandas as pd
+from keyword_tagger import KeywordTagger
+
+PMC_LINK_RE = re.compile(r'PMC(\d+)', re.IGNORECASE)
+
+# Keyword categories assigned from title terms
+KEYWORD_MAPPING = {
+    'microgravity': ['microgravity', 'space'],
+    'stem cells': ['stem cell', 'embryonic', 'regeneration'],
+    'bone': ['bone', 'skeletal', 'osteoclastic', 'osteoblastic'],
+    'oxidative stress': ['oxidative stress', 'radiation'],
+    'heart': ['heart', 'cardiac'],
+    'spaceflight': ['spaceflight', 'space station', 'mission'],
+    'gene expression': ['gene expression', 'transcriptional', 'pcr'],
+    'biomedical': ['biomedical', 'health', 'medical'],
+    'research': ['research', 'study', 'analysis']
+}
+DEFAULT_KEYWORDS = ['research', 'space biology']
+
+# Methodology from title terms; the first matching rule wins
+METHODOLOGY_RULES = [
+    ('Molecular Biology', ['pcr', 'gene expression', 'transcriptional']),
+    ('Cell Biology', ['stem cell', 'embryonic']),
+    ('Biomechanics', ['bone', 'skeletal']),
+    ('Radiation Biology', ['radiation', 'oxidative']),
+]
+DEFAULT_METHODOLOGY = 'Space Biology'
+
+keyword_tagger = KeywordTagger(KEYWORD_MAPPING)
+methodology_tagger = KeywordTagger(dict(METHODOLOGY_RULES), default=DEFAULT_METHODOLOGY)
+
+
+def _title_hash(title: str, length: int) -> str:
+    return hashlib.sha1(" ".join(title.lower().split()).encode("utf-8")).hexdigest()[:length]
+
+
+def assign_paper_ids(titles: List[str], links: List[str]) -> List[str]:
+    """
+    Deterministic ids: "PMC<digits>" from the link, else "T<title hash>". Links
+    shared by different titles get a title hash suffix; exact duplicate rows get
+    "-2", "-3", ... in file order.
+    """
+    bases = []
+    for title, link in zip(titles, links):
+        match = PMC_LINK_RE.search(link or "")
+        bases.append(f"PMC{match.group(1)}" if match else f"T{_title_hash(title, 12)}")
+
+    titles_by_base = defaultdict(set)
+    for base, title in zip(bases, titles):
+        titles_by_base[base].add(title)
+    ids = [f"{base}-{_title_hash(title, 8)}" if len(titles_by_base[base]) > 1 else base
+           for base, title in zip(bases, titles)]
+
+    seen = Counter()
+    unique_ids = []
+    for paper_id in ids:
+        seen[paper_id] += 1
+        unique_ids.append(paper_id if seen[paper_id] == 1 else f"{paper_id}-{seen[paper_id]}")
+    return unique_ids
+
+
+def papers_from_dataframe(df: pd.DataFrame, title_col: str, link_col: str) -> List[Dict[str, Any]]:
+    """Paper records for a publications table, with keywords and methodology assigned per column"""
+    titles = df[title_col].astype(str).str.strip()
+    links = df[link_col].astype(str).str.strip()
+    lower_titles = titles.str.lower()
+
+    keywords = [matched or list(DEFAULT_KEYWORDS) for matched in keyword_tagger.all_matches(lower_titles)]
+    methodologies = methodology_tagger.first_match(lower_titles)
+
+    # Generate a simple abstract based on title
+    abstracts = ("This research investigates " + lower_titles + " in the context of space biology and "
+                 "microgravity effects. The study contributes to our understanding of biological "
+                 "responses to space environment conditions.")
+
+    title_list, link_list = titles.tolist(), links.tolist()
+    return [
+        {
+            'id': paper_id,
+            'title': title,
+            'link': link,
+            'authors': ['Research Team'],  # Default value
+            'journal': 'PMC Publications',   # Default value based on your data source
+            'publicationDate': '2024',      # Default value
+            'abstract': abstract,
+            'keywords': paper_keywords,
+            'citations': 0,                 # Default value
+            'methodology': methodology,
+            'funding': None,                # Default value
+            'return': None,                 # Default value
+        }
+        for paper_id, title, link, abstract, paper_keywords, methodology
+        in zip(assign_paper_ids(title_list, link_list), title_list, link_list, abstracts.tolist(), keywords,
+               methodologies)
+    ]
+
+
+def _dumps(value: Any) -> bytes:
+    # Same encoding as FastAPI's JSONResponse
+    return json.dumps(value, ensure_ascii=False, allow_nan=False, separators=(",", ":")).encode("utf-8")
+
+
+class PaperRepository:
+    """Read-only paper records with an id index, pre-serialized JSON and validators"""
+
+    def __init__(self, papers: List[Dict[str, Any]], last_modified: Optional[float] = None):
+        self.papers = papers
+        # Modification time of the source data, for Last-Modified headers
+        self.last_modified = last_modified if last_modified is not None else time.time()
+        self._row_by_id: Dict[str, int] = {paper['id']: i for i, paper in enumerate(papers)}
+        self._json: List[bytes] = [_dumps(paper) for paper in papers]
+
+    def __len__(self) -> int:
+        return len(self.papers)
+
+    def get(self, paper_id: str) -> Optional[Dict[str, Any]]:
+        row = self._row_by_id.get(paper_id)
+        return self.papers[row] if row is not None else None
+
+    def get_many(self, paper_ids: Iterable[str]) -> List[Dict[str, Any]]:
+        """Papers with the given ids, in repository order"""
+        rows = sorted({self._row_by_id[pid] for pid in paper_ids if pid in self._row_by_id})
+        return [self.papers[row] for row in rows]
+
+    def paper_json(self, paper_id: str) -> Optional[bytes]:
+        row = self._row_by_id.get(paper_id)
+        return self._json[row] if row is not None else None
+
+    def page_json(self, offset: int, limit: int) -> bytes:
+        """JSON array of the papers in [offset, offset + limit) from the stored bytes"""
+        return b"[" + b",".join(self._json[offset:offset + limit]) + b"]"
+
+    @staticmethod
+    def response_json(payload_key: str, payload: bytes, fields: Dict[str, Any]) -> bytes:
+        """A JSON object with pre-serialized bytes under payload_key followed by fields"""
+        body = b'{"' + payload_key.encode("utf-8") + b'":' + payload
+        if fields:
+            body += b"," + _dumps(fields)[1:]
+        else:
+            body += b"}"
+        return body
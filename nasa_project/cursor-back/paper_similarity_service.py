@@ -9,9 +9,10 @@ import json
 import os
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
-from sentence_transformers import SentenceTransformer
 from typing import List, Dict, Any, Optional
 import networkx as nx
+from encoder_service import encoder_service
+from dataset_cache import load_taskbook
 
 class PaperSimilarityService:
     """Service for detecting similar research papers and clustering them."""
@@ -115,7 +116,7 @@ class PaperSimilarityService:
             if not os.path.exists(taskbook_path):
                 return False
             
-            self.df = pd.read_csv(taskbook_path)
+            self.df = load_taskbook(taskbook_path)
             
             # Standardize column names
             self.df = self.df.rename(columns={
@@ -136,14 +137,8 @@ class PaperSimilarityService:
                 if col in self.df.columns:
                     self.df[col] = self.df[col].fillna('')
             
-            # Create combined text for similarity analysis
-            self.df['text'] = (
-                self.df.get('title', '').fillna('') + ' ' +
-                self.df.get('abstract', '').fillna('') + ' ' +
-                self.df.get('methods', '').fillna('') + ' ' +
-                self.df.get('results', '').fillna('') + ' ' +
-                self.df.get('conclusion', '').fillna('')
-            )
+            # Combined text for similarity analysis comes with the dataset cache
+            self.df['text'] = self.df['combined_text']
             
             # Remove empty texts
             self.df = self.df[self.df['text'].str.strip() != '']
@@ -165,7 +160,7 @@ class PaperSimilarityService:
             if use_embeddings:
                 # Use sentence transformers for better semantic similarity
                 try:
-                    self.sentence_model = SentenceTransformer('all-MiniLM-L6-v2')
+                    self.sentence_model = encoder_service.load()
                     self.embeddings = self.sentence_model.encode(texts, show_progress_bar=True)
                     self.similarity_matrix = cosine_similarity(self.embeddings)
                     print(f"✅ Generated embeddings for {len(texts)} papers")
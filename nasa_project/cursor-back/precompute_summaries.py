@@ -0,0 +1,72 @@
+"""
+Precompute Paper Summaries
+Batch-summarizes every paper in step5_all_chunks.json for each role offline and
+stores the results in the persistent summary cache, so /api/paper-summaries
+answers from the cache in milliseconds. Papers already cached are skipped.
+
+    python precompute_summaries.py [--roles scientist,manager] [--batch-size 8] [--limit N]
+                                   [--mode truncate|map_reduce]
+"""
+import argparse
+import time
+from typing import List, Optional
+from summary_cache import summary_cache
+from summarization_service import SUMMARY_MODES
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(description="Fill the summary cache for the whole paper corpus")
+    parser.add_argument("--roles", default="scientist,manager", help="Comma-separated roles to summarize for")
+    parser.add_argument("--batch-size", type=int, default=8, help="Papers per summarizer call (truncate mode)")
+    parser.add_argument("--limit", type=int, default=0, help="Only the first N papers")
+    parser.add_argument("--mode", choices=SUMMARY_MODES, default=None, help="Defaults to NASA_SUMMARY_MODE")
+    args = parser.parse_args(argv)
+
+    # Reuse the backend's chunk loading, cleaning and generation settings so keys match the endpoint
+    from main import (SUMMARY_MODE, SUMMARY_PARAMS, get_summarizer, get_title_index, paper_summarizer,
+                      paper_summary_key, summarizer_cache_id)
+
+    mode = args.mode or SUMMARY_MODE
+    title_index = get_title_index()
+    titles = title_index.titles[:args.limit] if args.limit else title_index.titles
+    roles = [role.strip().lower() for role in args.roles.split(",") if role.strip()]
+    if get_summarizer() is None:
+        raise SystemExit("❌ Summarization model could not be loaded")
+    # Resolved after loading, so a fallback from int8/onnx is keyed as PyTorch eager
+    model = summarizer_cache_id()
+    print(f"📚 {len(titles)} papers, roles: {roles}, mode: {mode}")
+
+    for role in roles:
+        params = SUMMARY_PARAMS[role]
+        pending = []
+        for title in titles:
+            rows = title_index.find_rows(title)
+            key = paper_summary_key(title, role, rows, mode, model)
+            if not summary_cache.contains(key):
+                pending.append((key, title, rows))
+        print(f"🧠 {role}: {len(titles) - len(pending)} cached, {len(pending)} to summarize")
+
+        # Truncated papers share pipeline calls; map-reduce already batches each paper's segments
+        batch_size = args.batch_size if mode == "truncate" else 1
+        start = time.perf_counter()
+        for i in range(0, len(pending), batch_size):
+            batch = pending[i:i + batch_size]
+            if mode == "truncate":
+                results = paper_summarizer.summarize_truncated_batch(
+                    [(title_index.iter_cleaned(rows), len(rows)) for _, _, rows in batch], params)
+            else:
+                results = [paper_summarizer.summarize(title_index.iter_cleaned(rows), len(rows), params, mode=mode)
+                           for _, _, rows in batch]
+            for (key, title, _), result in zip(batch, results):
+                if result["summary"]:
+                    summary_cache.put(key, result["summary"], title=title, role=role, model=model,
+                                      meta={"text_length": result["text_length"], "coverage": result["coverage"]})
+            done = i + len(batch)
+            elapsed = time.perf_counter() - start
+            print(f"  {done}/{len(pending)} ({elapsed / done:.2f}s per paper)")
+
+    print(f"✅ Summary cache: {summary_cache.stats()}")
+
+
+if __name__ == "__main__":
+    main()
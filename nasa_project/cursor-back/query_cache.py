@@ -0,0 +1,142 @@
+"""
+RAG Query Cache
+Recent query embeddings and search results, keyed on normalized query text, so
+repeated questions skip the encoder and the FAISS search. Entries expire after a
+TTL and the least recently used ones are evicted when the cache is full.
+
+    NASA_QUERY_CACHE_SIZE         entries per cache (default 1024, 0 disables)
+    NASA_QUERY_CACHE_TTL_SECONDS  entry lifetime (default 600)
+"""
+import os
+import threading
+import time
+import numpy as np
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+
+def normalize_query(text: str) -> str:
+    """Case- and whitespace-insensitive cache key for a query"""
+    return " ".join(text.lower().split())
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after ttl_seconds"""
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 600.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at < time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+            }
+
+
+class QueryCache:
+    """Embedding and result caches for one search backend"""
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        if max_entries is None:
+            max_entries = int(os.environ.get("NASA_QUERY_CACHE_SIZE", "1024"))
+        if ttl_seconds is None:
+            ttl_seconds = float(os.environ.get("NASA_QUERY_CACHE_TTL_SECONDS", "600"))
+        self.embeddings = TTLCache(max_entries, ttl_seconds)
+        self.results = TTLCache(max_entries, ttl_seconds)
+
+    def search(self, queries: List[str], top_k: int, version: Hashable,
+               encode_fn: Callable[[List[str]], np.ndarray],
+               search_fn: Callable[[np.ndarray], List[List[Dict[str, Any]]]]) -> List[List[Dict[str, Any]]]:
+        """
+        Results for each query. Cached results are reused while the index version
+        matches; remaining queries reuse cached embeddings, the rest are encoded in
+        one batch, and all misses go through a single search_fn call.
+        """
+        keys = [normalize_query(query) for query in queries]
+        results: List[Optional[List[Dict[str, Any]]]] = [None] * len(queries)
+        pending: Dict[str, str] = {}  # normalized key -> first original query text
+        for i, key in enumerate(keys):
+            cached = self.results.get((key, top_k, version))
+            if cached is not None:
+                results[i] = cached
+            else:
+                pending.setdefault(key, queries[i])
+
+        if pending:
+            embeddings = {}
+            to_encode = []
+            for key in pending:
+                embedding = self.embeddings.get(key)
+                if embedding is None:
+                    to_encode.append(key)
+                else:
+                    embeddings[key] = embedding
+            if to_encode:
+                encoded = np.asarray(encode_fn([pending[key] for key in to_encode]), dtype=np.float32)
+                for key, embedding in zip(to_encode, encoded):
+                    embeddings[key] = embedding
+                    self.embeddings.put(key, embedding)
+
+            pending_keys = list(pending)
+            matrix = np.ascontiguousarray(np.vstack([embeddings[key] for key in pending_keys]), dtype=np.float32)
+            fresh = dict(zip(pending_keys, search_fn(matrix)))
+            for key, value in fresh.items():
+                self.results.put((key, top_k, version), value)
+            for i, key in enumerate(keys):
+                if results[i] is None:
+                    results[i] = fresh[key]
+
+        # Callers own their lists; cached dicts must not be mutated through them
+        return [[dict(result) for result in query_results] for query_results in results]
+
+    def clear(self):
+        self.embeddings.clear()
+        self.results.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"embeddings": self.embeddings.stats(), "results": self.results.stats()}
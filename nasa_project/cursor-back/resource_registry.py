@@ -0,0 +1,116 @@
+"""
+Lazy Resource Registry for the Research Assistant Backend
+Heavy models, datasets and indexes are registered with a loader and only built on
+first use, or by a background warm-up thread once the server has started.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+PENDING = "pending"
+LOADING = "loading"
+READY = "ready"
+FAILED = "failed"
+
+
+class ResourceRegistry:
+    """Thread-safe registry of lazily loaded resources with per-component load state"""
+
+    def __init__(self):
+        self._loaders: Dict[str, Callable[[], Any]] = {}
+        self._values: Dict[str, Any] = {}
+        self._state: Dict[str, str] = {}
+        self._errors: Dict[str, str] = {}
+        self._load_seconds: Dict[str, float] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+        self._warmup_thread: Optional[threading.Thread] = None
+
+    def register(self, name: str, loader: Callable[[], Any]):
+        """Register a loader; nothing is loaded until the resource is requested"""
+        with self._lock:
+            self._loaders[name] = loader
+            self._locks[name] = threading.Lock()
+            self._state[name] = PENDING
+            self._values.pop(name, None)
+            self._errors.pop(name, None)
+
+    def is_registered(self, name: str) -> bool:
+        return name in self._loaders
+
+    def is_ready(self, name: str) -> bool:
+        return self._state.get(name) == READY
+
+    def get(self, name: str, default: Any = None) -> Any:
+        """Return the resource, loading it on first use. Returns default if loading failed."""
+        if self._state.get(name) == READY:
+            return self._values[name]
+        if name not in self._loaders:
+            raise KeyError(f"Unknown resource: {name}")
+
+        # Concurrent callers wait for the single in-flight load instead of loading twice
+        with self._locks[name]:
+            state = self._state[name]
+            if state == READY:
+                return self._values[name]
+            if state == FAILED:
+                return default
+
+            self._state[name] = LOADING
+            start = time.perf_counter()
+            try:
+                value = self._loaders[name]()
+            except Exception as e:
+                self._errors[name] = str(e)
+                self._state[name] = FAILED
+                print(f"❌ Failed to load {name}: {e}")
+                return default
+            finally:
+                self._load_seconds[name] = round(time.perf_counter() - start, 3)
+
+            self._values[name] = value
+            self._state[name] = READY
+            print(f"✅ {name} ready in {self._load_seconds[name]}s")
+            return value
+
+    def reload(self, name: str, default: Any = None) -> Any:
+        """Discard the current value (or failure) and load the resource again"""
+        with self._locks[name]:
+            self._values.pop(name, None)
+            self._errors.pop(name, None)
+            self._state[name] = PENDING
+        return self.get(name, default)
+
+    def warm_up(self, names: Optional[Iterable[str]] = None, background: bool = True):
+        """Load resources ahead of the first request, by default on a daemon thread"""
+        targets = list(names) if names is not None else list(self._loaders)
+
+        def _run():
+            for name in targets:
+                self.get(name)
+
+        if not background:
+            _run()
+            return None
+
+        self._warmup_thread = threading.Thread(target=_run, name="resource-warmup", daemon=True)
+        self._warmup_thread.start()
+        return self._warmup_thread
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Per-component load state for the readiness endpoint"""
+        components = {}
+        for name in self._loaders:
+            components[name] = {
+                "state": self._state.get(name, PENDING),
+                "load_seconds": self._load_seconds.get(name),
+                "error": self._errors.get(name),
+            }
+        return components
+
+    def pending(self) -> List[str]:
+        return [name for name, state in self._state.items() if state != READY]
+
+
+# Global instance
+resource_registry = ResourceRegistry()
@@ -0,0 +1,241 @@
+"""
+Paper Summarization Service
+Token-aware summarization of paper chunks for the summarization pipeline.
+
+- truncate:   fill one model window with the leading chunks and summarize it. Chunks
+              past the window are never cleaned, joined or tokenized.
+- map_reduce: pack chunks into window-sized segments, summarize the segments in
+              batched pipeline calls (map), then summarize the joined partial
+              summaries (reduce), repeating the reduce while they overflow a window.
+
+Both modes respect a time budget and report how much of the paper was covered.
+
+    NASA_SUMMARY_MODE                 truncate | map_reduce (default truncate)
+    NASA_SUMMARY_TIME_BUDGET_SECONDS  map phase budget (default 20)
+    NASA_SUMMARY_MAX_SEGMENTS         segments read per paper in map_reduce (default 16)
+"""
+import os
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+SUMMARY_MODES = ("truncate", "map_reduce")
+
+# Chunks shorter than this after cleaning are mostly boilerplate (same rule as combine_chunks)
+MIN_CHUNK_LENGTH = 50
+
+# Used when the pipeline has no tokenizer to measure with
+CHARS_PER_TOKEN = 4
+
+# Less text than this is not worth summarizing (same rule as the role summaries)
+MIN_TEXT_LENGTH = 100
+
+MAP_PARAMS = {"max_length": 150, "min_length": 40, "do_sample": False, "truncation": True}
+
+
+class PaperSummarizer:
+    """Summarizes chunk streams within the model's token window"""
+
+    def __init__(self, get_pipeline: Callable[[], Any], time_budget_s: float = 20.0, max_segments: int = 16,
+                 map_batch_size: int = 4, window_margin: int = 16, max_reduce_rounds: int = 3,
+                 run_batch: Optional[Callable[[List[str], Dict[str, Any]], List[str]]] = None):
+        self.get_pipeline = get_pipeline
+        # Optional (texts, params) -> summaries hook, e.g. the shared batching worker
+        self.run_batch = run_batch
+        self.time_budget_s = time_budget_s
+        self.max_segments = max_segments
+        self.map_batch_size = map_batch_size
+        self.window_margin = window_margin
+        self.max_reduce_rounds = max_reduce_rounds
+
+    # --- token accounting ---
+
+    def window_tokens(self, pipe) -> int:
+        """Input tokens the model reads, minus room for special tokens"""
+        tokenizer = getattr(pipe, "tokenizer", None)
+        limit = getattr(tokenizer, "model_max_length", None) or 1024
+        # Tokenizers without a configured limit report a huge sentinel value
+        if limit > 100000:
+            limit = 1024
+        return max(32, limit - self.window_margin)
+
+    def _token_ids(self, pipe, texts: List[str]) -> List[Any]:
+        tokenizer = getattr(pipe, "tokenizer", None)
+        if tokenizer is None:
+            return [None] * len(texts)
+        return tokenizer(texts, add_special_tokens=False, truncation=False)["input_ids"]
+
+    @staticmethod
+    def _length(text: str, ids: Any) -> int:
+        return len(ids) if ids is not None else max(1, len(text) // CHARS_PER_TOKEN)
+
+    def pack(self, pipe, chunks: Iterable[str], max_segments: int) -> Tuple[List[str], float, int]:
+        """
+        Pack cleaned chunks, in order, into at most max_segments window-sized
+        segments. Stops pulling chunks once the segments are full, so later chunks
+        are never cleaned. Returns (segments, chunks covered, tokens packed).
+        """
+        window = self.window_tokens(pipe)
+        segments: List[str] = []
+        current: List[str] = []
+        current_tokens = 0
+        covered = 0.0
+        packed_tokens = 0
+
+        for chunk in chunks:
+            if len(chunk) < MIN_CHUNK_LENGTH:
+                covered += 1
+                continue
+            ids = self._token_ids(pipe, [chunk])[0]
+            length = self._length(chunk, ids)
+            offset = 0
+            while offset < length:
+                room = window - current_tokens
+                take = min(room, length - offset)
+                if offset == 0 and take == length:
+                    piece = chunk
+                elif ids is None:
+                    piece = chunk[offset * CHARS_PER_TOKEN:(offset + take) * CHARS_PER_TOKEN]
+                else:
+                    piece = pipe.tokenizer.decode(ids[offset:offset + take], skip_special_tokens=True)
+                current.append(piece)
+                current_tokens += take
+                packed_tokens += take
+                offset += take
+                if current_tokens >= window:
+                    segments.append(" ".join(current))
+                    current, current_tokens = [], 0
+                    if len(segments) >= max_segments:
+                        return segments, covered + offset / length, packed_tokens
+            covered += 1
+
+        if current:
+            segments.append(" ".join(current))
+        return segments, covered, packed_tokens
+
+    # --- summarization ---
+
+    def _run(self, pipe, texts: List[str], params: Dict[str, Any]) -> List[str]:
+        if self.run_batch is not None:
+            return self.run_batch(texts, params)
+        results = pipe(texts, batch_size=len(texts), **params)
+        return [result['summary_text'] for result in results]
+
+    def summarize(self, chunks: Iterable[str], total_chunks: int, params: Dict[str, Any],
+                  mode: str = "truncate") -> Dict[str, Any]:
+        """
+        Summarize a paper's cleaned chunks. Returns the summary ("" when there is
+        too little readable text), the characters read, and coverage counters.
+        """
+        pipe = self.get_pipeline()
+        start = time.perf_counter()
+        max_segments = 1 if mode == "truncate" else self.max_segments
+        segments, covered, packed_tokens = self.pack(pipe, chunks, max_segments)
+        text_length = sum(len(segment) for segment in segments)
+        if text_length < MIN_TEXT_LENGTH:
+            return {"summary": "", "text_length": text_length,
+                    "coverage": self._coverage(mode, len(segments), 0, covered, total_chunks, packed_tokens, start, False)}
+
+        budget_exhausted = False
+        if len(segments) == 1:
+            summary = self._run(pipe, segments, params)[0]
+            summarized = 1
+        else:
+            # Map: summarize segments in batches until the budget runs out
+            partials: List[str] = []
+            for i in range(0, len(segments), self.map_batch_size):
+                if partials and time.perf_counter() - start > self.time_budget_s:
+                    budget_exhausted = True
+                    break
+                partials.extend(self._run(pipe, segments[i:i + self.map_batch_size], MAP_PARAMS))
+            summarized = len(partials)
+
+            # Reduce: fold partial summaries until they fit one window
+            window = self.window_tokens(pipe)
+            for _ in range(self.max_reduce_rounds):
+                total = sum(self._length(p, ids) for p, ids in zip(partials, self._token_ids(pipe, partials)))
+                if total <= window or len(partials) == 1:
+                    break
+                groups, _, _ = self.pack(pipe, partials, len(partials))
+                partials = self._run(pipe, groups, MAP_PARAMS)
+            summary = self._run(pipe, [" ".join(partials)], params)[0]
+
+        # Chunks beyond the summarized segments were read but not summarized
+        if summarized < len(segments):
+            covered = covered * summarized / len(segments)
+        return {
+            "summary": summary,
+            "text_length": text_length,
+            "coverage": self._coverage(mode, len(segments), summarized, covered, total_chunks,
+                                       packed_tokens, start, budget_exhausted),
+        }
+
+    def summarize_truncated_batch(self, papers: List[Tuple[Iterable[str], int]],
+                                  params: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Truncate-mode summaries of several papers in one pipeline call"""
+        pipe = self.get_pipeline()
+        start = time.perf_counter()
+        packed = []
+        for chunks, total_chunks in papers:
+            segments, covered, tokens = self.pack(pipe, chunks, 1)
+            packed.append((segments[0] if segments else "", covered, total_chunks, tokens))
+        readable = [text for text, _, _, _ in packed if len(text) >= MIN_TEXT_LENGTH]
+        summaries = iter(self._run(pipe, readable, params) if readable else [])
+
+        results = []
+        for text, covered, total_chunks, tokens in packed:
+            summarized = len(text) >= MIN_TEXT_LENGTH
+            results.append({
+                "summary": next(summaries) if summarized else "",
+                "text_length": len(text),
+                "coverage": self._coverage("truncate", 1 if text else 0, int(summarized), covered,
+                                           total_chunks, tokens, start, False),
+            })
+        return results
+
+    @staticmethod
+    def _coverage(mode: str, segments: int, summarized: int, covered: float, total_chunks: int,
+                  tokens: int, start: float, budget_exhausted: bool) -> Dict[str, Any]:
+        return {
+            "mode": mode,
+            "segments": segments,
+            "segments_summarized": summarized,
+            "chunks_covered": round(covered, 2),
+            "chunks_total": total_chunks,
+            "fraction": round(min(covered / total_chunks, 1.0), 3) if total_chunks else 0,
+            "tokens_read": tokens,
+            "time_budget_exhausted": budget_exhausted,
+            "elapsed_seconds": round(time.perf_counter() - start, 3),
+        }
+
+
+class PooledSummarizationPipeline:
+    """
+    Pipeline-compatible front for a summarizer loaded in other processes. Keeps the
+    tokenizer locally for token accounting; submit(texts, params) starts the
+    generation and returns a future of the summaries, so callers such as the
+    summary batcher can keep up to max_in_flight batches running at once.
+    """
+
+    def __init__(self, tokenizer: Any, submit: Callable[[List[str], Dict[str, Any]], Future], max_in_flight: int = 1):
+        self.tokenizer = tokenizer
+        self.submit = submit
+        self.max_in_flight = max(1, max_in_flight)
+
+    def __call__(self, texts, batch_size: int = 1, **params) -> List[Dict[str, str]]:
+        text_list = [texts] if isinstance(texts, str) else list(texts)
+        return [{"summary_text": summary} for summary in self.submit(text_list, params).result()]
+
+
+def summary_mode_from_env() -> str:
+    mode = os.environ.get("NASA_SUMMARY_MODE", "truncate").lower()
+    return mode if mode in SUMMARY_MODES else "truncate"
+
+
+def paper_summarizer_from_env(get_pipeline: Callable[[], Any], run_batch=None) -> PaperSummarizer:
+    return PaperSummarizer(
+        get_pipeline,
+        run_batch=run_batch,
+        time_budget_s=float(os.environ.get("NASA_SUMMARY_TIME_BUDGET_SECONDS", "20")),
+        max_segments=int(os.environ.get("NASA_SUMMARY_MAX_SEGMENTS", "16")),
+    )
@@ -0,0 +1,126 @@
+"""
+Summarizer Inference Backends
+Builds the Hugging Face summarization pipeline on one of several CPU-friendly
+backends. All of them return a pipeline object with the same call signature and
+tokenizer, so callers do not change with the backend.
+
+- torch:      PyTorch eager (the original setup)
+- torch-int8: PyTorch with dynamic int8 quantization of the Linear layers
+- onnx:       ONNX Runtime through optimum; the exported model is kept on disk
+
+    NASA_SUMMARIZER_BACKEND   torch | torch-int8 | onnx (default torch)
+    NASA_ONNX_EXPORT_DIR      where exported ONNX models are stored (default onnx_models)
+
+Compare speed and output quality with compare_summarizer_backends.py.
+"""
+import os
+import shutil
+import tempfile
+from typing import Any, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: the rename below still keeps half-written exports out of sight
+    fcntl = None
+
+SUMMARIZER_MODEL = "sshleifer/distilbart-cnn-12-6"
+
+SUMMARIZER_BACKENDS = ("torch", "torch-int8", "onnx")
+
+# Written last into a finished ONNX export; a directory without it is never loaded
+ONNX_EXPORT_MARKER = ".export-complete"
+
+
+def summarizer_backend_from_env() -> str:
+    backend = os.environ.get("NASA_SUMMARIZER_BACKEND", "torch").lower()
+    if backend not in SUMMARIZER_BACKENDS:
+        print(f"⚠️ Unknown summarizer backend '{backend}', using torch")
+        return "torch"
+    return backend
+
+
+def summarizer_id(model_name: str, backend: str) -> str:
+    """Identifier for cache keys: quantized and exported models can word summaries differently"""
+    return model_name if backend == "torch" else f"{model_name}+{backend}"
+
+
+def _torch_pipeline(model_name: str, device: Optional[int]):
+    from transformers import pipeline
+    import torch
+    if device is None:
+        device = 0 if torch.cuda.is_available() else -1
+    # Force PyTorch backend to avoid TensorFlow issues
+    return pipeline("summarization", model=model_name, framework="pt", device=device)
+
+
+def _torch_int8_pipeline(model_name: str):
+    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, pipeline
+    import torch
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name)
+    model.eval()
+    quantized = torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+    return pipeline("summarization", model=quantized, tokenizer=AutoTokenizer.from_pretrained(model_name),
+                    framework="pt", device=-1)
+
+
+def _export_onnx(model_name: str, export_dir: str):
+    """
+    Export the model once per machine. Pool workers starting together wait on a
+    file lock; the export goes to a temporary directory that is renamed into place
+    with its completion marker, so a crashed export is redone rather than loaded.
+    """
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    marker = os.path.join(export_dir, ONNX_EXPORT_MARKER)
+    parent = os.path.dirname(export_dir) or "."
+    os.makedirs(parent, exist_ok=True)
+    with open(f"{export_dir}.lock", "a") as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        if os.path.exists(marker):
+            return  # exported by another worker while this one waited
+        print(f"Exporting {model_name} to ONNX in {export_dir} (first run only)...")
+        tmp_dir = tempfile.mkdtemp(prefix=f".{os.path.basename(export_dir)}.", dir=parent)
+        try:
+            ORTModelForSeq2SeqLM.from_pretrained(model_name, export=True).save_pretrained(tmp_dir)
+            open(os.path.join(tmp_dir, ONNX_EXPORT_MARKER), "w").close()
+            if os.path.isdir(export_dir):
+                shutil.rmtree(export_dir)  # leftovers of an export that never finished
+            os.rename(tmp_dir, export_dir)
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            if not os.path.exists(marker):
+                raise
+
+
+def _onnx_pipeline(model_name: str):
+    from optimum.onnxruntime import ORTModelForSeq2SeqLM
+    from transformers import AutoTokenizer, pipeline
+    export_dir = os.path.join(os.environ.get("NASA_ONNX_EXPORT_DIR", "onnx_models"), model_name.replace("/", "__"))
+    if not os.path.exists(os.path.join(export_dir, ONNX_EXPORT_MARKER)):
+        _export_onnx(model_name, export_dir)
+    model = ORTModelForSeq2SeqLM.from_pretrained(export_dir)
+    return pipeline("summarization", model=model, tokenizer=AutoTokenizer.from_pretrained(model_name))
+
+
+def load_summarization_pipeline(model_name: str = SUMMARIZER_MODEL, backend: Optional[str] = None,
+                                device: Optional[int] = None) -> Tuple[Any, str]:
+    """
+    Summarization pipeline on the requested backend (NASA_SUMMARIZER_BACKEND by
+    default), and the backend actually loaded: PyTorch eager when the requested
+    one cannot be loaded. Build cache ids from the returned backend.
+    """
+    backend = backend or summarizer_backend_from_env()
+    print(f"Loading summarization model {model_name} ({backend})...")
+    if backend == "torch-int8":
+        try:
+            return _torch_int8_pipeline(model_name), backend
+        except Exception as e:
+            print(f"⚠️ int8 quantization failed ({e}); using PyTorch eager")
+    elif backend == "onnx":
+        try:
+            return _onnx_pipeline(model_name), backend
+        except ImportError:
+            print("⚠️ ONNX backend needs `pip install optimum[onnxruntime]`; using PyTorch eager")
+        except Exception as e:
+            print(f"⚠️ ONNX Runtime backend failed ({e}); using PyTorch eager")
+    return _torch_pipeline(model_name, device), "torch"
@@ -0,0 +1,188 @@
+"""
+Summarizer Batching Service
+Single worker in front of the Hugging Face summarization pipeline. Concurrent
+summary requests are collected for a few milliseconds, grouped by generation
+parameters (scientist and manager summaries use different lengths), sorted by
+length to limit padding and run as one padded batch per group.
+
+When the pipeline runs in the execution pool (it has submit and max_in_flight),
+batches are handed to the pool without waiting, up to one per pool worker; the
+worker only blocks once every slot is busy, and requests queued meanwhile form
+the next, larger batches.
+
+    NASA_SUMMARIZER_MAX_BATCH    texts per pipeline call (default 8)
+    NASA_SUMMARIZER_MAX_WAIT_MS  how long the first request waits for company (default 10)
+"""
+import json
+import os
+import queue
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+
+def params_key(params: Dict[str, Any]) -> str:
+    """Requests with equal generation parameters can share a pipeline call"""
+    return json.dumps(params, sort_keys=True)
+
+
+class _SummaryRequest:
+    """A pending summary waiting for the batching worker"""
+
+    def __init__(self, text: str, params: Dict[str, Any]):
+        self.text = text
+        self.params = params
+        self.future: Future = Future()
+
+
+class SummaryBatcher:
+    """Dynamic batching worker for the summarization pipeline with throughput counters"""
+
+    def __init__(self, get_pipeline: Callable[[], Any], max_batch_size: int = 8, max_wait_ms: float = 10.0):
+        self.get_pipeline = get_pipeline
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self._queue: "queue.Queue[_SummaryRequest]" = queue.Queue()
+        self._worker: Optional[threading.Thread] = None
+        self._worker_lock = threading.Lock()
+        # Free pool slots, created with the pooled pipeline
+        self._slots: Optional[threading.Semaphore] = None
+        self._stats_lock = threading.Lock()
+        self._stats = {
+            "requests": 0,
+            "batches": 0,
+            "failed": 0,
+            "in_flight": 0,
+            "max_batch_texts": 0,
+            "summarize_seconds": 0.0,
+        }
+
+    def submit(self, text: str, params: Dict[str, Any]) -> Future:
+        """Queue one text; the future resolves to its summary"""
+        self._ensure_worker()
+        request = _SummaryRequest(text, params)
+        self._queue.put(request)
+        return request.future
+
+    def summarize(self, text: str, params: Dict[str, Any]) -> str:
+        return self.submit(text, params).result()
+
+    def summarize_many(self, texts: List[str], params: Dict[str, Any]) -> List[str]:
+        """Queue several texts at once so they land in the same batches"""
+        futures = [self.submit(text, params) for text in texts]
+        return [future.result() for future in futures]
+
+    def _ensure_worker(self):
+        if self._worker is None or not self._worker.is_alive():
+            with self._worker_lock:
+                if self._worker is None or not self._worker.is_alive():
+                    self._worker = threading.Thread(target=self._run_worker, name="summarizer-batcher", daemon=True)
+                    self._worker.start()
+
+    def _collect_batch(self) -> List[_SummaryRequest]:
+        """Block for one request, then gather more until the wait expires or enough are queued"""
+        batch = [self._queue.get()]
+        deadline = time.perf_counter() + self.max_wait
+        # Several parameter groups may be waiting, so collect up to a few full batches
+        while len(batch) < self.max_batch_size * 4:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run_worker(self):
+        while True:
+            groups: Dict[str, List[_SummaryRequest]] = defaultdict(list)
+            for request in self._collect_batch():
+                groups[params_key(request.params)].append(request)
+            for requests in groups.values():
+                # Similar lengths in one call waste less compute on padding
+                requests.sort(key=lambda request: len(request.text))
+                for i in range(0, len(requests), self.max_batch_size):
+                    self._run_group(requests[i:i + self.max_batch_size])
+
+    def _run_group(self, requests: List[_SummaryRequest]):
+        texts = [request.text for request in requests]
+        start = time.perf_counter()
+        try:
+            pipeline = self.get_pipeline()
+            if hasattr(pipeline, "submit"):
+                self._submit_group(pipeline, requests, texts)
+                return
+            results = pipeline(texts, batch_size=len(texts), **requests[0].params)
+        except Exception as e:
+            self._fail(requests, start, e)
+            return
+        self._record(len(requests), time.perf_counter() - start)
+        for request, result in zip(requests, results):
+            request.future.set_result(result['summary_text'])
+
+    def _submit_group(self, pipeline: Any, requests: List[_SummaryRequest], texts: List[str]):
+        """Hand the batch to the pool and resolve its requests from the done callback"""
+        if self._slots is None:
+            self._slots = threading.Semaphore(pipeline.max_in_flight)
+        self._slots.acquire()
+        start = time.perf_counter()
+        try:
+            future = pipeline.submit(texts, requests[0].params)
+        except Exception:
+            self._slots.release()
+            raise
+        with self._stats_lock:
+            self._stats["in_flight"] += 1
+
+        def _done(future: Future):
+            self._slots.release()
+            with self._stats_lock:
+                self._stats["in_flight"] -= 1
+            try:
+                summaries = future.result()
+            except Exception as e:
+                self._fail(requests, start, e)
+                return
+            self._record(len(requests), time.perf_counter() - start)
+            for request, summary in zip(requests, summaries):
+                request.future.set_result(summary)
+
+        future.add_done_callback(_done)
+
+    def _fail(self, requests: List[_SummaryRequest], start: float, error: Exception):
+        self._record(len(requests), time.perf_counter() - start, failed=True)
+        for request in requests:
+            request.future.set_exception(error)
+
+    def _record(self, texts: int, seconds: float, failed: bool = False):
+        with self._stats_lock:
+            self._stats["requests"] += texts
+            self._stats["batches"] += 1
+            self._stats["summarize_seconds"] += seconds
+            self._stats["max_batch_texts"] = max(self._stats["max_batch_texts"], texts)
+            if failed:
+                self._stats["failed"] += texts
+
+    def stats(self) -> Dict[str, Any]:
+        """Throughput counters for monitoring"""
+        with self._stats_lock:
+            stats = dict(self._stats)
+        stats["max_batch_size"] = self.max_batch_size
+        stats["max_wait_ms"] = round(self.max_wait * 1000, 1)
+        stats["queue_depth"] = self._queue.qsize()
+        stats["avg_batch_texts"] = round(stats["requests"] / stats["batches"], 2) if stats["batches"] else 0
+        stats["texts_per_second"] = (round(stats["requests"] / stats["summarize_seconds"], 2)
+                                     if stats["summarize_seconds"] else 0)
+        stats["summarize_seconds"] = round(stats["summarize_seconds"], 3)
+        return stats
+
+
+def summary_batcher_from_env(get_pipeline: Callable[[], Any]) -> SummaryBatcher:
+    return SummaryBatcher(
+        get_pipeline,
+        max_batch_size=int(os.environ.get("NASA_SUMMARIZER_MAX_BATCH", "8")),
+        max_wait_ms=float(os.environ.get("NASA_SUMMARIZER_MAX_WAIT_MS", "10")),
+    )
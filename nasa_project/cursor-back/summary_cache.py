@@ -0,0 +1,150 @@
+"""
+Persistent Summary Cache
+SQLite store of generated summaries. Summarization with do_sample=False is
+deterministic, so a summary is keyed by a hash of everything that determines it:
+normalized title, role, model name, generation parameters and the input text.
+Least recently used entries are evicted beyond max_entries.
+
+    NASA_SUMMARY_CACHE_PATH         database file (default summary_cache.sqlite3)
+    NASA_SUMMARY_CACHE_MAX_ENTRIES  entries kept (default 20000)
+
+Fill it offline with precompute_summaries.py.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+
+def summary_key(title: str, role: str, model_name: str, params: Dict[str, Any], text: str) -> str:
+    """Stable hash of the inputs that determine a summary"""
+    payload = json.dumps({
+        "title": " ".join(title.lower().split()),
+        "role": role.lower(),
+        "model": model_name,
+        "params": params,
+        "text_sha256": hashlib.sha256(text.encode("utf-8")).hexdigest(),
+    }, sort_keys=True)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SummaryCache:
+    """SQLite-backed LRU cache of summaries, one connection per thread"""
+
+    def __init__(self, path: str = "summary_cache.sqlite3", max_entries: int = 20000):
+        self.path = path
+        self.max_entries = max_entries
+        self._local = threading.local()
+        self._stats_lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._schema_ready = False
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            if not self._schema_ready:
+                # Created on first use so importing the module does not touch the disk
+                self._init_schema(conn)
+                self._schema_ready = True
+        return conn
+
+    def _init_schema(self, conn: sqlite3.Connection):
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS summaries (
+                    key TEXT PRIMARY KEY,
+                    title TEXT,
+                    role TEXT,
+                    model TEXT,
+                    summary TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL,
+                    hits INTEGER NOT NULL DEFAULT 0,
+                    meta TEXT
+                )
+            """)
+            # Databases created before summaries carried coverage metadata
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(summaries)")}
+            if "meta" not in columns:
+                conn.execute("ALTER TABLE summaries ADD COLUMN meta TEXT")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_summaries_last_access ON summaries(last_access)")
+
+    def get(self, key: str) -> Optional[str]:
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    def get_entry(self, key: str) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """(summary, metadata stored with it) or None"""
+        conn = self._connection()
+        row = conn.execute("SELECT summary, meta FROM summaries WHERE key = ?", (key,)).fetchone()
+        with self._stats_lock:
+            if row is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        if row is None:
+            return None
+        with conn:
+            conn.execute("UPDATE summaries SET last_access = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        return row[0], json.loads(row[1]) if row[1] else {}
+
+    def contains(self, key: str) -> bool:
+        """Membership check that does not count as an access"""
+        return self._connection().execute("SELECT 1 FROM summaries WHERE key = ?", (key,)).fetchone() is not None
+
+    def put(self, key: str, summary: str, title: str = "", role: str = "", model: str = "",
+            meta: Optional[Dict[str, Any]] = None):
+        now = time.time()
+        conn = self._connection()
+        with conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO summaries (key, title, role, model, summary, created_at, last_access, hits, meta) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, 0, ?)",
+                (key, title, role, model, summary, now, now, json.dumps(meta) if meta else None),
+            )
+            self._evict(conn)
+
+    def _evict(self, conn: sqlite3.Connection):
+        count = conn.execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        excess = count - self.max_entries
+        if excess > 0:
+            conn.execute(
+                "DELETE FROM summaries WHERE key IN (SELECT key FROM summaries ORDER BY last_access ASC LIMIT ?)",
+                (excess,),
+            )
+            with self._stats_lock:
+                self.evictions += excess
+
+    def clear(self):
+        with self._connection() as conn:
+            conn.execute("DELETE FROM summaries")
+
+    def stats(self) -> Dict[str, Any]:
+        entries = self._connection().execute("SELECT COUNT(*) FROM summaries").fetchone()[0]
+        with self._stats_lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": os.path.abspath(self.path),
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 3) if lookups else 0,
+                "evictions": self.evictions,
+            }
+
+
+# Global instance
+summary_cache = SummaryCache(
+    path=os.environ.get("NASA_SUMMARY_CACHE_PATH", "summary_cache.sqlite3"),
+    max_entries=int(os.environ.get("NASA_SUMMARY_CACHE_MAX_ENTRIES", "20000")),
+)
@@ -0,0 +1,62 @@
+import os
+import pytest
+from fastapi import HTTPException
+import main
+from data_processor import DynamicDataProcessor
+
+CSV_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "Taskbook_cleaned_for_NLP.csv")
+ADJUSTMENTS = [-100, -37.5, -12.3, 0, 7.77, 50, 133.3, 200]
+
+
+@pytest.fixture(scope="module")
+def processor():
+    return DynamicDataProcessor(CSV_PATH)
+
+
+def test_grid_matches_single_simulations(processor):
+    domains = processor.get_domains() + ["Unknown Domain"]
+    scenarios = [(domain, adjustment) for domain in domains for adjustment in ADJUSTMENTS]
+    simulations = processor.get_budget_simulations(scenarios)
+    assert len(simulations) == len(scenarios)
+    for (domain, adjustment), simulation in zip(scenarios, simulations):
+        assert simulation == processor.get_budget_simulation(domain, adjustment)
+    assert simulations[-1] == {"error": "Domain 'Unknown Domain' not found"}
+
+    # Current values agree with the raw projects table
+    df = processor.df
+    for simulation in simulations[:-len(ADJUSTMENTS)]:
+        projects = df[df["Assigned_Domain"] == simulation["domain"]]
+        assert simulation["current"]["studies"] == len(projects)
+        assert simulation["current"]["funding"] == int(projects["Funding"].sum())
+
+
+def test_portfolio_totals_are_row_sums(processor):
+    domains = processor.get_domains()
+    allocation = {domain: ADJUSTMENTS[i % len(ADJUSTMENTS)] for i, domain in enumerate(domains[:-1])}
+    portfolio = processor.get_portfolio_simulation(allocation)
+    rows = portfolio["simulations"]
+    assert [row["domain"] for row in rows] == domains
+    assert rows[-1]["adjustment_percentage"] == 0.0
+    for section, fields in portfolio["totals"].items():
+        for field, value in fields.items():
+            if field != "roi":
+                assert value == sum(row[section][field] for row in rows), (section, field)
+    assert processor.get_portfolio_simulation({"Unknown Domain": 10}) == {"error": "Domain 'Unknown Domain' not found"}
+
+
+def test_batch_endpoint_rejects_oversized_and_out_of_range_requests():
+    request = main.BatchBudgetSimulationRequest
+    too_many = [{"domain": "Plants", "adjustment_percentage": 10}] * (main.MAX_BUDGET_SCENARIOS + 1)
+    with pytest.raises(HTTPException) as error:
+        main.simulate_budget_batch(request(scenarios=too_many))
+    assert error.value.status_code == 400
+
+    for bad in (-100.5, 200.5):
+        for fields in ({"adjustments": [bad]}, {"allocation": {"Plants": bad}},
+                       {"scenarios": [{"domain": "Plants", "adjustment_percentage": bad}]}):
+            with pytest.raises(HTTPException) as error:
+                main.simulate_budget_batch(request(**fields))
+            assert error.value.status_code == 400
+
+    response = main.simulate_budget_batch(request(adjustments=[-100, 200]))
+    assert response.status_code == 200
@@ -0,0 +1,48 @@
+import random
+from keyword_tagger import TASKBOOK_DOMAINS, KeywordTagger
+
+# Keywords nested inside other keywords, within and across categories
+OVERLAPPING = {
+    "Cardio": ["cardio", "cardiovascular", "vascular", "heart"],
+    "Microbes": ["microbe", "microbial", "microbiome", "bio"],
+    "Biology": ["biology", "radiobiology", "bio", "cell"],
+    "Radiation": ["radiation", "radio", "radiobiology", "ion"],
+}
+
+
+def naive_first_match(taxonomy, text, default="Other"):
+    return next((category for category, keywords in taxonomy.items() if any(kw in text for kw in keywords)), default)
+
+
+def naive_all_matches(taxonomy, text):
+    return [category for category, keywords in taxonomy.items() if any(kw in text for kw in keywords)]
+
+
+def naive_scores(taxonomy, text):
+    return [sum(kw in text for kw in set(keywords)) for keywords in taxonomy.values()]
+
+
+def random_texts(taxonomy, n, seed=0):
+    """Texts glued from keyword fragments and filler, so keywords overlap and straddle word boundaries"""
+    rng = random.Random(seed)
+    pieces = [kw for keywords in taxonomy.values() for kw in keywords]
+    pieces += [kw[:rng.randint(1, len(kw))] for kw in pieces] + ["vas", "cul", "ar", "micro", "crobi", " ", "the "]
+    return ["".join(rng.choice(pieces) for _ in range(rng.randint(0, 8))) for _ in range(n)]
+
+
+def assert_matches_naive(taxonomy, texts):
+    tagger = KeywordTagger(taxonomy)
+    assert tagger.first_match(texts) == [naive_first_match(taxonomy, text) for text in texts]
+    assert tagger.all_matches(texts) == [naive_all_matches(taxonomy, text) for text in texts]
+    assert tagger.scores(texts).tolist() == [naive_scores(taxonomy, text) for text in texts]
+
+
+def test_overlapping_keywords_match_plain_substring_loops():
+    texts = ["cardio", "cardiovascular", "vascular cardio", "microbe", "microbial", "microbiome",
+             "radiobiology", "biology", "", "Cardiovascular MICROBIAL"]
+    assert_matches_naive(OVERLAPPING, [text.lower() for text in texts])
+    assert_matches_naive(OVERLAPPING, random_texts(OVERLAPPING, 2000))
+
+
+def test_taskbook_domains_match_plain_substring_loops():
+    assert_matches_naive(TASKBOOK_DOMAINS, random_texts(TASKBOOK_DOMAINS, 2000, seed=1))
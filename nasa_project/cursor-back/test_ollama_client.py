@@ -0,0 +1,34 @@
+import asyncio
+import httpx
+from ollama_client import OllamaClient
+from ollama_stub import STUB_MODEL, create_app
+
+
+def make_client():
+    return OllamaClient("http://ollama-stub", transport=httpx.ASGITransport(app=create_app()))
+
+
+async def _list_and_generate():
+    client = make_client()
+    try:
+        models = await client.list_models()
+        text = await client.generate(STUB_MODEL, "User Question: bone loss")
+        tokens = [token async for token in client.stream(STUB_MODEL, "User Question: bone loss")]
+        return models, text, tokens
+    finally:
+        await client.aclose()
+
+
+def test_stub_round_trip():
+    models, text, tokens = asyncio.run(_list_and_generate())
+    assert models == [STUB_MODEL]
+    assert "bone loss" in text
+    assert len(tokens) > 1
+    assert "".join(tokens).strip() == text
+
+
+if __name__ == "__main__":
+    models, text, tokens = asyncio.run(_list_and_generate())
+    print(f"Models: {models}")
+    print(f"Generate: {text}")
+    print(f"Stream: {len(tokens)} tokens -> {''.join(tokens)}")
@@ -0,0 +1,203 @@
+import json
+import multiprocessing
+import os
+import time
+import zlib
+import numpy as np
+import pytest
+from ann_index import sync_store_index
+from vector_store import EMBEDDINGS_FILE, VectorStore
+
+MODEL = "test-model"
+DIMENSION = 8
+
+
+def encode(texts):
+    """Deterministic unit vectors derived from the text"""
+    vectors = np.stack([np.random.default_rng(zlib.crc32(text.encode("utf-8"))).standard_normal(DIMENSION)
+                        for text in texts]) if texts else np.zeros((0, DIMENSION))
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True) if len(vectors) else 1
+    return vectors.astype(np.float32)
+
+
+class Corpus:
+    """A JSONL source plus a counting encoder, as ai_chunk_index uses them"""
+
+    def __init__(self, tmp_path, encode_seconds=0.0):
+        self.encode_seconds = encode_seconds
+        self.source = os.path.join(tmp_path, "chunks.jsonl")
+        self.store = VectorStore(os.path.join(tmp_path, "store"))
+        self.encoded = []
+
+    def write(self, rows):
+        with open(self.source, "w", encoding="utf-8") as f:
+            for key, text in rows:
+                f.write(json.dumps({"key": key, "text": text, "n": len(text)}) + "\n")
+
+    def read_rows(self):
+        with open(self.source, "r", encoding="utf-8") as f:
+            rows = [json.loads(line) for line in f]
+        return [r["key"] for r in rows], {"text": [r["text"] for r in rows], "n": [r["n"] for r in rows]}
+
+    def encode(self, texts):
+        self.encoded.extend(texts)
+        time.sleep(self.encode_seconds)
+        return encode(texts)
+
+    def sync(self):
+        return self.store.sync(self.source, MODEL, self.read_rows, self.encode, text_column="text")
+
+
+def live_rows(store):
+    return {store.row(i)["key"]: (store.row(i)["text"], store.row(i)["n"], np.asarray(store.embeddings[i]))
+            for i in range(len(store)) if not store.is_deleted(i)}
+
+
+def assert_matches(store, rows):
+    live = live_rows(store)
+    assert sorted(live) == sorted(key for key, _ in rows)
+    for key, text in rows:
+        assert live[key][:2] == (text, len(text))
+        np.testing.assert_array_equal(live[key][2], encode([text])[0])
+
+
+def test_build_append_reopen(tmp_path):
+    corpus = Corpus(tmp_path)
+    rows = [("a", "alpha"), ("b", "beta")]
+    corpus.write(rows)
+    assert corpus.sync()["added"] == 2
+
+    rows.append(("c", "gamma"))
+    corpus.write(rows)
+    assert corpus.sync() == {"added": 1, "updated": 0, "deleted": 0, "unchanged": 2}
+    assert corpus.encoded == ["alpha", "beta", "gamma"]
+
+    reopened = VectorStore(corpus.store.store_dir).open()
+    assert len(reopened) == 3
+    assert_matches(reopened, rows)
+    assert reopened.version == corpus.store.version
+
+
+def test_removed_row_is_tombstoned_and_skipped(tmp_path):
+    corpus = Corpus(tmp_path)
+    corpus.write([("a", "alpha"), ("b", "beta"), ("c", "gamma")])
+    corpus.sync()
+    corpus.write([("a", "alpha"), ("c", "gamma")])
+    assert corpus.sync()["deleted"] == 1
+
+    store = VectorStore(corpus.store.store_dir).open()
+    assert store.is_deleted(1) and store.live_count == 2
+    assert_matches(store, [("a", "alpha"), ("c", "gamma")])
+    # The tombstoned row is never matched again; a returning key gets a new row
+    corpus.write([("a", "alpha"), ("b", "beta"), ("c", "gamma")])
+    assert corpus.sync()["added"] == 1
+    assert len(corpus.store) == 4 and corpus.store.is_deleted(1)
+
+
+def test_changed_text_is_reencoded(tmp_path):
+    corpus = Corpus(tmp_path)
+    corpus.write([("a", "alpha"), ("b", "beta")])
+    corpus.sync()
+    corpus.encoded.clear()
+    corpus.write([("a", "alpha"), ("b", "beta, revised")])
+    assert corpus.sync() == {"added": 0, "updated": 1, "deleted": 0, "unchanged": 1}
+    assert corpus.encoded == ["beta, revised"]
+    assert_matches(corpus.store, [("a", "alpha"), ("b", "beta, revised")])
+
+
+def test_compact_then_index_rebuild(tmp_path):
+    corpus = Corpus(tmp_path)
+    corpus.write([(str(i), f"text {i}") for i in range(10)])
+    corpus.sync()
+    rows = [(str(i), f"text {i}") for i in range(10) if i % 3]
+    corpus.write(rows)
+    corpus.sync()
+    index_path = os.path.join(tmp_path, "faiss.index")
+    assert sync_store_index(corpus.store, index_path, {"kind": "flat"}).ntotal == 10
+
+    store = corpus.store.compact()
+    assert len(store) == store.live_count == len(rows)
+    assert_matches(store, rows)
+    # A new build id makes the old index stale, so it is rebuilt over the compacted rows
+    index = sync_store_index(store, index_path, {"kind": "flat"})
+    assert index.ntotal == len(rows)
+    _, ids = index.search(encode(["text 5"]), 1)
+    assert store.row(int(ids[0][0]))["key"] == "5"
+
+
+def test_index_disagreeing_with_its_meta_is_rebuilt(tmp_path):
+    corpus = Corpus(tmp_path)
+    rows = [(str(i), f"text {i}") for i in range(8)]
+    corpus.write(rows)
+    corpus.sync()
+    index_path = os.path.join(tmp_path, "faiss.index")
+    sync_store_index(corpus.store, index_path, {"kind": "flat"})
+    # A crash after the index was written but before its meta, which still counts 5 rows
+    with open(f"{index_path}.json", "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    with open(f"{index_path}.json", "w", encoding="utf-8") as f:
+        json.dump({**meta, "ntotal": 5}, f)
+
+    index = sync_store_index(corpus.store, index_path, {"kind": "flat"})
+    assert index.ntotal == len(corpus.store) == 8
+    _, ids = index.search(encode(["text 7"]), 1)
+    assert corpus.store.row(int(ids[0][0]))["key"] == "7"
+    assert sync_store_index(corpus.store, index_path, {"kind": "flat"}).ntotal == 8
+
+
+def test_append_discards_rows_of_a_crashed_append(tmp_path):
+    corpus = Corpus(tmp_path)
+    corpus.write([("a", "alpha")])
+    corpus.sync()
+    # Data written past the header's count, as if a process died before writing the header
+    with open(os.path.join(corpus.store.store_dir, EMBEDDINGS_FILE), "ab") as f:
+        encode(["junk"]).tofile(f)
+    with open(os.path.join(corpus.store.store_dir, "text.utf8"), "ab") as f:
+        f.write(b"junk")
+
+    rows = [("a", "alpha"), ("b", "beta")]
+    corpus.write(rows)
+    corpus.sync()
+    assert_matches(VectorStore(corpus.store.store_dir).open(), rows)
+
+
+def test_touched_source_records_new_mtime(tmp_path):
+    corpus = Corpus(tmp_path)
+    corpus.write([("a", "alpha")])
+    corpus.sync()
+    os.utime(corpus.source, (1_000_000_000, 1_000_000_000))
+    assert corpus.sync()["unchanged"] == 1
+    assert corpus.store.read_header()["source_mtime"] == os.stat(corpus.source).st_mtime
+    assert corpus.encoded == ["alpha"]
+
+
+def _sync_in_process(tmp_path):
+    # Slow enough that unsynchronized workers would all append the new rows
+    Corpus(tmp_path, encode_seconds=0.3).sync()
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork")
+def test_concurrent_syncs_take_turns(tmp_path):
+    corpus = Corpus(tmp_path)
+    rows = [(str(i), f"text {i}") for i in range(50)]
+    corpus.write(rows[:25])
+    corpus.sync()
+    corpus.write(rows)
+
+    # Every worker syncs the changed source at start-up; only the first may append the new rows
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=_sync_in_process, args=(str(tmp_path),)) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+    assert all(worker.exitcode == 0 for worker in workers)
+
+    store = VectorStore(corpus.store.store_dir).open()
+    assert len(store) == 50
+    assert_matches(store, rows)
+    # Duplicate appends would leave extra rows that misplace the next append
+    rows.append(("50", "text 50"))
+    corpus.write(rows)
+    corpus.sync()
+    assert_matches(VectorStore(corpus.store.store_dir).open(), rows)
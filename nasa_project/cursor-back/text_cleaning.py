@@ -0,0 +1,66 @@
+"""
+Chunk Text Cleaning
+Strips PMC/NCBI website boilerplate from paper chunks before summarization. All
+patterns are compiled once into a single alternation, so a chunk is scanned in
+one pass instead of once per pattern.
+"""
+import re
+
+# Order matters: at a given position the first matching alternative wins,
+# so longer phrases come before their prefixes ("search log in ..." before "search log in")
+BOILERPLATE_PATTERNS = [
+    r"skip to main content",
+    r"an official website of the united states government",
+    r"here's how you know",
+    r"official websites use \.gov",
+    r"a \.gov website belongs to an official government organization",
+    r"secure \.gov websites use https",
+    r"a lock.*lock.*padlock icon.*or https://",
+    r"means you've safely connected to the \.gov website",
+    r"share sensitive information only on official, secure websites",
+    r"search log in dashboard publications account settings log out",
+    r"search.*search ncbi primary site navigation",
+    r"logged in as: dashboard publications account settings",
+    r"search pmc full-text archive",
+    r"search in pmc journal list user guide permalink copy",
+    r"as a library, nlm provides access to scientific literature",
+    r"inclusion in an nlm database does not imply endorsement",
+    r"learn more: pmc disclaimer.*pmc copyright notice",
+    r"plos one.*\d{4}.*doi:.*\d+\.\d+",
+    r"search in pmc search in pubmed view in nlm catalog add to search",
+    r"find articles by.*\d+.*\d+.*\*",
+    r"editor:.*author information article notes copyright and license information",
+    r"competing interests:.*conceived and designed the experiments:",
+    r"performed the experiments:.*analyzed the data:",
+    r"contributed reagents/materials/analysis tools:",
+    r"wrote the paper:.*roles.*editor received.*accepted.*collection date",
+    r"this is an open-access article distributed under the terms",
+    r"pmc copyright notice pmcid:.*pmid:.*\d+",
+    r"in the united states\.",
+    r"search log in",
+    r"of, or agreement with, the contents by nlm or the national institutes of health",
+    r"/journal\.pone\.\d+",
+]
+
+# Text is lower-cased before matching, so no IGNORECASE is needed
+BOILERPLATE_RE = re.compile("|".join(f"(?:{pattern})" for pattern in BOILERPLATE_PATTERNS))
+WHITESPACE_RE = re.compile(r'\s+')
+
+MIN_CLEAN_LENGTH = 100
+
+
+def clean_chunk_text(text: str) -> str:
+    """
+    Clean chunk text by removing website boilerplate and navigation elements.
+    Returns "" when what is left is too short to be real content.
+    """
+    cleaned_text = BOILERPLATE_RE.sub("", text.lower())
+
+    # Remove excessive whitespace and normalize
+    cleaned_text = WHITESPACE_RE.sub(" ", cleaned_text).strip()
+
+    # If the cleaned text is too short, it's likely mostly boilerplate
+    if len(cleaned_text) < MIN_CLEAN_LENGTH:
+        return ""
+
+    return cleaned_text
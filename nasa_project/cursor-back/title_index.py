@@ -0,0 +1,138 @@
+"""
+Paper Title Index
+Lookup structures over the paper chunk records (step5_all_chunks.json), built
+once at load time: normalized title → chunk rows, PMC id → titles, and a
+character-trigram index for fuzzy matching and ranked "did you mean" suggestions.
+Cleaned chunk text is cached per row, so repeated summaries skip cleaning.
+"""
+import re
+from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Set
+from text_cleaning import clean_chunk_text
+
+PMC_ID_RE = re.compile(r'pmc(\d+)')
+
+
+def normalize_title(title: str) -> str:
+    """Lower-cased, whitespace-collapsed title used as the exact-match key"""
+    return " ".join(title.lower().split())
+
+
+def trigrams(text: str) -> Set[str]:
+    """Character trigrams of the text with spaces removed"""
+    squashed = text.replace(" ", "")
+    return {squashed[i:i + 3] for i in range(len(squashed) - 2)}
+
+
+class PaperTitleIndex:
+    """Title, PMC-id and trigram maps over chunk records with 'Title' and 'Chunk' fields"""
+
+    def __init__(self, chunks_data: List[Dict[str, Any]]):
+        self.source = chunks_data
+        self._rows_by_title: Dict[str, List[int]] = defaultdict(list)
+        self._display_titles: Dict[str, str] = {}
+        for i, item in enumerate(chunks_data):
+            key = normalize_title(item['Title'])
+            self._rows_by_title[key].append(i)
+            self._display_titles.setdefault(key, item['Title'])
+
+        self._squashed: Dict[str, str] = {key: key.replace(" ", "") for key in self._rows_by_title}
+        self._trigrams: Dict[str, Set[str]] = {key: trigrams(key) for key in self._rows_by_title}
+        self._titles_by_pmc: Dict[str, List[str]] = defaultdict(list)
+        self._titles_by_trigram: Dict[str, Set[str]] = defaultdict(set)
+        for key in self._rows_by_title:
+            for pmc_id in set(PMC_ID_RE.findall(key)):
+                self._titles_by_pmc[pmc_id].append(key)
+            for gram in self._trigrams[key]:
+                self._titles_by_trigram[gram].add(key)
+
+        # Titles in first-seen order, computed once for listing endpoints
+        self.titles: List[str] = [self._display_titles[key] for key in self._rows_by_title]
+        self._cleaned: Dict[int, str] = {}
+
+    def __len__(self) -> int:
+        return len(self._rows_by_title)
+
+    def chunk_count(self, title: str) -> int:
+        """Number of chunks stored under exactly this title"""
+        return len(self._rows_by_title.get(normalize_title(title), ()))
+
+    def _rows_for(self, keys: List[str]) -> List[int]:
+        return sorted(row for key in keys for row in self._rows_by_title[key])
+
+    def iter_cleaned(self, rows: List[int]) -> Iterator[str]:
+        """Boilerplate-free text of the given rows, cleaned lazily and once per row"""
+        for row in rows:
+            text = self._cleaned.get(row)
+            if text is None:
+                text = clean_chunk_text(self.source[row]['Chunk'])
+                self._cleaned[row] = text
+            yield text
+
+    def cleaned_chunks(self, rows: List[int]) -> List[str]:
+        return list(self.iter_cleaned(rows))
+
+    def _overlap_counts(self, query_grams: Set[str]) -> Dict[str, int]:
+        counts: Dict[str, int] = defaultdict(int)
+        for gram in query_grams:
+            for key in self._titles_by_trigram.get(gram, ()):
+                counts[key] += 1
+        return counts
+
+    def fuzzy_titles(self, query: str) -> List[str]:
+        """
+        Titles containing the query or contained in it, ignoring spaces. Trigram
+        overlap narrows the candidates before the substring checks.
+        """
+        key = normalize_title(query)
+        squashed = key.replace(" ", "")
+        query_grams = trigrams(key)
+        if len(squashed) < 3:
+            candidates = list(self._rows_by_title)
+        else:
+            counts = self._overlap_counts(query_grams)
+            # Containing the query needs all of its trigrams; being contained needs all of the title's
+            candidates = [title for title, count in counts.items()
+                          if count == len(query_grams) or count == len(self._trigrams[title])]
+            # Titles under three characters have no trigrams to match on
+            candidates += [title for title, grams in self._trigrams.items() if not grams]
+        return [title for title in candidates
+                if squashed in self._squashed[title] or self._squashed[title] in squashed]
+
+    def find_rows(self, paper_title: str) -> List[int]:
+        """Chunk rows for a title: exact match, then PMC id, then fuzzy containment"""
+        key = normalize_title(paper_title)
+        if key in self._rows_by_title:
+            return self._rows_for([key])
+
+        pmc_match = PMC_ID_RE.search(key)
+        if pmc_match and pmc_match.group(1) in self._titles_by_pmc:
+            return self._rows_for(self._titles_by_pmc[pmc_match.group(1)])
+
+        return self._rows_for(self.fuzzy_titles(paper_title))
+
+    def get_chunks(self, paper_title: str) -> List[str]:
+        return [self.source[row]['Chunk'] for row in self.find_rows(paper_title)]
+
+    def suggest(self, query: str, limit: int = 5, min_similarity: float = 0.2) -> List[str]:
+        """Titles ranked by trigram similarity to the query; containment matches first"""
+        key = normalize_title(query)
+        query_grams = trigrams(key)
+        contained = set(self.fuzzy_titles(query))
+        scored = []
+        for title, overlap in self._overlap_counts(query_grams).items():
+            union = len(query_grams) + len(self._trigrams[title]) - overlap
+            similarity = overlap / union if union else 0.0
+            if title in contained or similarity >= min_similarity:
+                scored.append((title in contained, similarity, title))
+        for title in contained - {title for _, _, title in scored}:
+            scored.append((True, 0.0, title))
+        scored.sort(key=lambda entry: (entry[0], entry[1]), reverse=True)
+        return [self._display_titles[title] for _, _, title in scored[:limit]]
+
+
+def build_title_index(chunks_data: Optional[List[Dict[str, Any]]]) -> PaperTitleIndex:
+    # Keep the caller's list (even an empty one) so identity checks against it hold
+    index = PaperTitleIndex(chunks_data if chunks_data is not None else [])
+    print(f"Indexed {len(index)} paper titles over {len(index.source)} chunks")
+    return index
@@ -0,0 +1,473 @@
+"""
+Memory-Mapped Vector Store
+On-disk replacement for the pickled embedding and chunk caches. Embeddings are a raw
+float32 matrix opened with np.memmap and metadata is stored column by column, so
+every uvicorn worker shares the same pages through the OS cache. The header records
+the source file hash, model name and dimension; a changed source triggers a rebuild,
+or an incremental update when rows are keyed (see VectorStore.sync).
+
+Rows are append-only: changed and deleted rows are tombstoned, new rows are appended,
+so row numbers stay valid as FAISS ids until the store is compacted.
+
+Writers (sync, build, append, compact) hold an exclusive flock on <store_dir>.lock,
+so uvicorn workers syncing at start-up take turns; the lock sits beside the store
+directory because build swaps the whole directory. Indexes built over the store
+(ann_index.sync_store_index) are written under the same lock.
+"""
+import hashlib
+import json
+import os
+import shutil
+import time
+import uuid
+from contextlib import contextmanager
+import numpy as np
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking
+    fcntl = None
+
+FORMAT_VERSION = 2
+HEADER_FILE = "header.json"
+EMBEDDINGS_FILE = "embeddings.f32"
+TOMBSTONES_FILE = "tombstones.npy"
+KEY_COLUMN = "key"
+HASH_COLUMN = "text_hash"
+
+
+def file_sha256(path: str, block_size: int = 1 << 20) -> str:
+    """Stream a file through SHA-256"""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def text_hash(text: str) -> str:
+    """Short content hash used to detect changed chunks"""
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()[:16]
+
+
+def _truncate(path: str, size: int):
+    """Cut a file back to size, dropping bytes a crashed append left past the header's row count"""
+    if os.path.exists(path) and os.path.getsize(path) > size:
+        os.truncate(path, size)
+
+
+def _replace_npy(path: str, array: np.ndarray):
+    """Write an .npy file next to the target and atomically swap it in"""
+    tmp_path = f"{path}.tmp-{os.getpid()}.npy"
+    np.save(tmp_path, array)
+    os.replace(tmp_path, path)
+
+
+class StringColumn:
+    """Variable-length UTF-8 column backed by a memory-mapped blob and offsets array"""
+
+    def __init__(self, blob: np.ndarray, offsets: np.ndarray):
+        self._blob = blob
+        self._offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        start, end = self._offsets[i], self._offsets[i + 1]
+        return bytes(self._blob[start:end]).decode("utf-8")
+
+    @staticmethod
+    def write(directory: str, name: str, values: Sequence[Any]):
+        encoded = [str(v).encode("utf-8") for v in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        if encoded:
+            offsets[1:] = np.cumsum([len(b) for b in encoded])
+        with open(os.path.join(directory, f"{name}.utf8"), "wb") as f:
+            for b in encoded:
+                f.write(b)
+        np.save(os.path.join(directory, f"{name}.offsets.npy"), offsets)
+
+    @staticmethod
+    def append(directory: str, name: str, values: Sequence[Any], count: int):
+        """
+        Append to the blob in place (existing readers only map the old prefix) and swap
+        the offsets. Offsets and blob bytes past the first `count` rows are discarded first.
+        """
+        encoded = [str(v).encode("utf-8") for v in values]
+        offsets_path = os.path.join(directory, f"{name}.offsets.npy")
+        offsets = np.load(offsets_path)[:count + 1]
+        blob_path = os.path.join(directory, f"{name}.utf8")
+        _truncate(blob_path, int(offsets[-1]))
+        new_offsets = offsets[-1] + np.cumsum([len(b) for b in encoded], dtype=np.int64)
+        with open(blob_path, "ab") as f:
+            for b in encoded:
+                f.write(b)
+        _replace_npy(offsets_path, np.concatenate([offsets, new_offsets]))
+
+    @classmethod
+    def open(cls, directory: str, name: str) -> "StringColumn":
+        offsets = np.load(os.path.join(directory, f"{name}.offsets.npy"), mmap_mode="r")
+        blob_path = os.path.join(directory, f"{name}.utf8")
+        if offsets[-1] == 0:
+            blob = np.zeros(0, dtype=np.uint8)
+        else:
+            blob = np.memmap(blob_path, dtype=np.uint8, mode="r")
+        return cls(blob, offsets)
+
+
+class VectorStore:
+    """Versioned on-disk embedding matrix plus columnar chunk metadata"""
+
+    def __init__(self, store_dir: str):
+        self.store_dir = os.path.abspath(store_dir)
+        self.header: Dict[str, Any] = {}
+        self.embeddings: Optional[np.ndarray] = None
+        self.columns: Dict[str, Any] = {}
+        self.deleted: np.ndarray = np.zeros(0, dtype=bool)
+        self._lock_depth = 0
+        self._lock_file = None
+
+    @contextmanager
+    def locked(self):
+        """Exclusive writer lock across processes; re-entrant within one store object"""
+        if self._lock_depth == 0:
+            os.makedirs(os.path.dirname(self.store_dir) or ".", exist_ok=True)
+            self._lock_file = open(f"{self.store_dir}.lock", "a")
+            if fcntl is not None:
+                fcntl.flock(self._lock_file.fileno(), fcntl.LOCK_EX)
+        self._lock_depth += 1
+        try:
+            yield
+        finally:
+            self._lock_depth -= 1
+            if self._lock_depth == 0:
+                # Closing the file releases the flock
+                self._lock_file.close()
+                self._lock_file = None
+
+    def __len__(self) -> int:
+        return int(self.header.get("count", 0))
+
+    @property
+    def deleted_count(self) -> int:
+        return int(self.deleted.sum())
+
+    @property
+    def live_count(self) -> int:
+        return len(self) - self.deleted_count
+
+    def is_deleted(self, i: int) -> bool:
+        return bool(self.deleted[i])
+
+    def __getitem__(self, i: int) -> Dict[str, Any]:
+        return self.row(i)
+
+    @property
+    def dimension(self) -> int:
+        return int(self.header.get("dimension", 0))
+
+    @property
+    def version(self) -> str:
+        """Changes whenever rows are rebuilt, appended or tombstoned"""
+        return f"{self.header.get('build_id')}:{self.header.get('generation', 0)}"
+
+    def row(self, i: int) -> Dict[str, Any]:
+        """Metadata of one row as a dict"""
+        row = {}
+        for name, column in self.columns.items():
+            value = column[i]
+            row[name] = int(value) if isinstance(value, np.integer) else value
+        return row
+
+    def read_header(self) -> Optional[Dict[str, Any]]:
+        path = os.path.join(self.store_dir, HEADER_FILE)
+        if not os.path.exists(path):
+            return None
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def is_current(self, source_path: str, model_name: str) -> bool:
+        """Check the header against the source file and model; hashes only when size/mtime moved"""
+        header = self.read_header()
+        if not header or header.get("format_version") != FORMAT_VERSION:
+            return False
+        if header.get("model_name") != model_name:
+            return False
+        stat = os.stat(source_path)
+        if header.get("source_size") == stat.st_size and header.get("source_mtime") == stat.st_mtime:
+            return True
+        sha256 = file_sha256(source_path)
+        if header.get("source_sha256") != sha256:
+            return False
+        # Touched but unchanged: record the new mtime so the next start skips the hash
+        try:
+            with self.locked():
+                header = self.read_header()
+                if header and header.get("source_sha256") == sha256:
+                    header.update(source_size=stat.st_size, source_mtime=stat.st_mtime)
+                    self._write_header(self.store_dir, header)
+        except OSError:
+            pass
+        return True
+
+    def open(self) -> "VectorStore":
+        """Memory-map the embeddings and metadata columns"""
+        header = self.read_header()
+        if header is None:
+            raise FileNotFoundError(f"No vector store at {self.store_dir}")
+        self.header = header
+        count, dimension = int(header["count"]), int(header["dimension"])
+        if count and dimension:
+            self.embeddings = np.memmap(os.path.join(self.store_dir, EMBEDDINGS_FILE), dtype=np.float32,
+                                        mode="r", shape=(count, dimension))
+        else:
+            self.embeddings = np.zeros((count, dimension), dtype=np.float32)
+        self.columns = {}
+        for name, kind in header.get("columns", {}).items():
+            if kind == "int":
+                self.columns[name] = np.load(os.path.join(self.store_dir, f"{name}.npy"), mmap_mode="r")
+            else:
+                self.columns[name] = StringColumn.open(self.store_dir, name)
+        tombstones_path = os.path.join(self.store_dir, TOMBSTONES_FILE)
+        self.deleted = np.zeros(count, dtype=bool)
+        if os.path.exists(tombstones_path):
+            tombstones = np.load(tombstones_path)
+            self.deleted[:min(count, len(tombstones))] = tombstones[:count]
+        return self
+
+    def _write_header(self, directory: str, header: Dict[str, Any]):
+        path = os.path.join(directory, HEADER_FILE)
+        tmp_path = f"{path}.tmp-{os.getpid()}"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(header, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def _source_fields(self, source_path: str) -> Dict[str, Any]:
+        stat = os.stat(source_path)
+        return {
+            "source_path": os.path.abspath(source_path),
+            "source_sha256": file_sha256(source_path),
+            "source_size": stat.st_size,
+            "source_mtime": stat.st_mtime,
+        }
+
+    def build(self, source_path: str, model_name: str, columns: Dict[str, List[Any]],
+              embeddings: np.ndarray) -> "VectorStore":
+        """Write a fresh store next to the old one and swap it in"""
+        with self.locked():
+            return self._build(source_path, model_name, columns, embeddings)
+
+    def _build(self, source_path: str, model_name: str, columns: Dict[str, List[Any]],
+               embeddings: np.ndarray) -> "VectorStore":
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32)
+        count = embeddings.shape[0]
+        for name, values in columns.items():
+            if len(values) != count:
+                raise ValueError(f"Column '{name}' has {len(values)} rows, expected {count}")
+
+        tmp_dir = f"{self.store_dir}.tmp-{os.getpid()}"
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        os.makedirs(tmp_dir)
+
+        embeddings.tofile(os.path.join(tmp_dir, EMBEDDINGS_FILE))
+        column_kinds = {}
+        for name, values in columns.items():
+            if values and all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values):
+                np.save(os.path.join(tmp_dir, f"{name}.npy"), np.asarray(values, dtype=np.int64))
+                column_kinds[name] = "int"
+            else:
+                StringColumn.write(tmp_dir, name, values)
+                column_kinds[name] = "str"
+
+        header = {
+            "format_version": FORMAT_VERSION,
+            **self._source_fields(source_path),
+            "model_name": model_name,
+            "dimension": int(embeddings.shape[1]) if embeddings.ndim == 2 else 0,
+            "count": int(count),
+            "columns": column_kinds,
+            "created_at": time.time(),
+            "build_id": uuid.uuid4().hex,
+            "generation": 0,
+        }
+        self._write_header(tmp_dir, header)
+
+        # Readers that already mapped the old files keep their pages until they reopen
+        shutil.rmtree(self.store_dir, ignore_errors=True)
+        os.rename(tmp_dir, self.store_dir)
+        return self.open()
+
+    def append(self, source_path: str, columns: Dict[str, List[Any]], embeddings: np.ndarray,
+               deleted: np.ndarray) -> "VectorStore":
+        """Append rows and replace the tombstone mask without rewriting existing data"""
+        with self.locked():
+            return self._append(source_path, columns, embeddings, deleted)
+
+    def _append(self, source_path: str, columns: Dict[str, List[Any]], embeddings: np.ndarray,
+                deleted: np.ndarray) -> "VectorStore":
+        embeddings = np.ascontiguousarray(embeddings, dtype=np.float32).reshape(-1, self.dimension)
+        added = embeddings.shape[0]
+        header = dict(self.header)
+        kinds = dict(header["columns"])
+        count = len(self)
+
+        if added:
+            # Rows past the header's count are leftovers of an append that died before its header write
+            embeddings_path = os.path.join(self.store_dir, EMBEDDINGS_FILE)
+            _truncate(embeddings_path, count * self.dimension * np.dtype(np.float32).itemsize)
+            with open(embeddings_path, "ab") as f:
+                embeddings.tofile(f)
+            for name, kind in kinds.items():
+                values = columns[name]
+                if kind == "int" and all(isinstance(v, (int, np.integer)) and not isinstance(v, bool) for v in values):
+                    old_values = np.asarray(self.columns[name][:count])
+                    _replace_npy(os.path.join(self.store_dir, f"{name}.npy"),
+                                 np.concatenate([old_values, np.asarray(values, dtype=np.int64)]))
+                elif kind == "int":
+                    # A non-integer value arrived; widen the column to strings
+                    old_values = [int(v) for v in self.columns[name][:count]]
+                    StringColumn.write(self.store_dir, name, old_values + list(values))
+                    kinds[name] = "str"
+                else:
+                    StringColumn.append(self.store_dir, name, values, count)
+
+        deleted = np.concatenate([np.asarray(deleted, dtype=bool)[:count], np.zeros(added, dtype=bool)])
+        _replace_npy(os.path.join(self.store_dir, TOMBSTONES_FILE), deleted)
+
+        header.update(self._source_fields(source_path))
+        header["count"] = count + added
+        header["columns"] = kinds
+        header["generation"] = int(header.get("generation", 0)) + 1
+        header["updated_at"] = time.time()
+        # The header goes last: readers opening mid-update see the old row count
+        self._write_header(self.store_dir, header)
+        return self.open()
+
+    def compact(self) -> "VectorStore":
+        """Rewrite the store without tombstoned rows; row numbers change, so indexes must be rebuilt"""
+        with self.locked():
+            # Another writer may have changed the store since this one was opened
+            self.open()
+            return self._compact()
+
+    def _compact(self) -> "VectorStore":
+        live = np.flatnonzero(~self.deleted)
+        rows = [self.row(i) for i in live]
+        columns = {name: [row[name] for row in rows] for name in self.columns}
+        embeddings = np.asarray(self.embeddings[live]) if len(live) else np.zeros((0, self.dimension), dtype=np.float32)
+        return self._build(self.header["source_path"], self.header["model_name"], columns, embeddings)
+
+    def sync(self, source_path: str, model_name: str,
+             read_rows: Callable[[], Tuple[List[str], Dict[str, List[Any]]]],
+             encode_fn: Callable[[List[str]], np.ndarray], text_column: str) -> Dict[str, int]:
+        """
+        Bring the store in line with the source. Rows are matched by key and text hash:
+        only new or changed rows are encoded and appended, removed rows are tombstoned.
+        """
+        if self.is_current(source_path, model_name):
+            self.open()
+            return {"added": 0, "updated": 0, "deleted": 0, "unchanged": self.live_count}
+        with self.locked():
+            # Another worker may have synced the store while this one waited for the lock
+            if self.is_current(source_path, model_name):
+                self.open()
+                return {"added": 0, "updated": 0, "deleted": 0, "unchanged": self.live_count}
+            return self._sync(source_path, model_name, read_rows, encode_fn, text_column)
+
+    def _sync(self, source_path: str, model_name: str,
+              read_rows: Callable[[], Tuple[List[str], Dict[str, List[Any]]]],
+              encode_fn: Callable[[List[str]], np.ndarray], text_column: str) -> Dict[str, int]:
+        keys, columns = read_rows()
+        texts = columns[text_column]
+        hashes = [text_hash(text) for text in texts]
+        columns = {**columns, KEY_COLUMN: keys, HASH_COLUMN: hashes}
+
+        header = self.read_header()
+        can_append = (
+            header is not None
+            and header.get("format_version") == FORMAT_VERSION
+            and header.get("model_name") == model_name
+            and set(header.get("columns", {})) == set(columns)
+        )
+        if not can_append:
+            print(f"Building vector store {self.store_dir} from {source_path}...")
+            self._build(source_path, model_name, columns, encode_fn(texts))
+            return {"added": len(keys), "updated": 0, "deleted": 0, "unchanged": 0}
+
+        self.open()
+        existing = {}
+        for row in np.flatnonzero(~self.deleted):
+            existing[self.columns[KEY_COLUMN][row]] = row
+
+        deleted = self.deleted.copy()
+        stats = {"added": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        new_rows = []
+        for i, (key, digest) in enumerate(zip(keys, hashes)):
+            row = existing.pop(key, None)
+            if row is not None and self.columns[HASH_COLUMN][row] == digest:
+                stats["unchanged"] += 1
+                continue
+            if row is not None:
+                deleted[row] = True
+                stats["updated"] += 1
+            else:
+                stats["added"] += 1
+            new_rows.append(i)
+
+        # Whatever is left in the store no longer exists in the source
+        for row in existing.values():
+            deleted[row] = True
+            stats["deleted"] += 1
+
+        print(f"Updating vector store {self.store_dir}: {stats}")
+        new_columns = {name: [values[i] for i in new_rows] for name, values in columns.items()}
+        embeddings = encode_fn([texts[i] for i in new_rows]) if new_rows else np.zeros((0, self.dimension), dtype=np.float32)
+        self._append(source_path, new_columns, embeddings, deleted)
+        return stats
+
+    def open_or_build(self, source_path: str, model_name: str,
+                      build_fn: Callable[[], Tuple[Dict[str, List[Any]], np.ndarray]]) -> "VectorStore":
+        """Open the store if it matches the source and model, otherwise rebuild it"""
+        if self.is_current(source_path, model_name):
+            return self.open()
+        with self.locked():
+            if self.is_current(source_path, model_name):
+                return self.open()
+            print(f"Building vector store {self.store_dir} from {source_path}...")
+            columns, embeddings = build_fn()
+            return self._build(source_path, model_name, columns, embeddings)
+
+
+def open_rag_chunk_store(rag_system_path: str, faiss_index, model_name: str, encode_fn: Callable) -> VectorStore:
+    """
+    Vector store for the rag_system chunks.pkl, shared by NASAAI and HybridNASA_AI.
+    Vectors are taken from the prebuilt FAISS index when it can reconstruct them.
+    """
+    import pickle
+    chunks_path = os.path.join(rag_system_path, "chunks.pkl")
+    store = VectorStore(os.path.join(rag_system_path, "chunks_store"))
+
+    def _build():
+        with open(chunks_path, "rb") as f:
+            chunks = pickle.load(f)
+        columns = {
+            "text": [chunk["text"] for chunk in chunks],
+            "source": [chunk.get("source", "unknown") for chunk in chunks],
+            "paper_id": [chunk.get("paper_id", "N/A") for chunk in chunks],
+            "section": [chunk.get("section", "N/A") for chunk in chunks],
+        }
+        embeddings = None
+        try:
+            embeddings = faiss_index.reconstruct_n(0, faiss_index.ntotal)
+        except Exception:
+            pass
+        if embeddings is None or len(embeddings) != len(chunks):
+            embeddings = encode_fn(columns["text"])
+        return columns, embeddings
+
+    return store.open_or_build(chunks_path, model_name, _build)
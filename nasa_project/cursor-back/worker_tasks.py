@@ -0,0 +1,53 @@
+"""
+Execution Pool Worker Tasks
+Module-level functions the execution pool runs in its worker processes, plus the
+loaders named in NASA_POOL_PRELOAD. Models live in the worker that loaded them;
+shared inputs such as the paper records arrive once through worker_state().
+"""
+import os
+from typing import Any, Dict, List, Optional, Tuple
+from execution_pool import worker_state
+from knowledge_graph import knowledge_graph_engine
+from summarizer_backends import load_summarization_pipeline
+
+_summarizer = None
+_summarizer_backend = None
+
+
+def load_summarizer() -> str:
+    """Load this worker's summarization pipeline; returns the backend actually loaded"""
+    global _summarizer, _summarizer_backend
+    if _summarizer is None:
+        import torch
+        # Workers share the machine's cores instead of each claiming all of them
+        workers = max(1, int(worker_state().get("pool_size", 1)))
+        torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+        _summarizer, _summarizer_backend = load_summarization_pipeline(
+            worker_state()["summarizer_model"], worker_state().get("summarizer_backend"), device=-1)
+    return _summarizer_backend
+
+
+def load_hypothesis():
+    """Build this worker's hypothesis generator (papers, pre-generated sets, TF-IDF)"""
+    from hypothesis_generator import hypothesis_generator
+    return hypothesis_generator
+
+
+def summarize_texts(texts: List[str], params: Dict[str, Any], backend: Optional[str] = None) -> List[str]:
+    """Summaries from this worker's pipeline, which must run `backend` when given"""
+    loaded = load_summarizer()
+    if backend and loaded != backend:
+        # Summaries are cached under the backend the server resolved; never mislabel them
+        raise RuntimeError(f"worker loaded the {loaded} summarizer, not {backend}")
+    results = _summarizer(texts, batch_size=len(texts), **params)
+    return [result['summary_text'] for result in results]
+
+
+def knowledge_graph(role: str) -> Tuple[str, bytes]:
+    """Dataset version and serialized graph; only papers new to this worker are processed"""
+    knowledge_graph_engine.update(worker_state().get("papers", []))
+    return knowledge_graph_engine.version, knowledge_graph_engine.response_json(role)
+
+
+def generate_hypotheses(query: str, role: str) -> List[Dict[str, Any]]:
+    return load_hypothesis().generate_hypotheses(query, role)
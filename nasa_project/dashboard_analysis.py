@@ -1,42 +1,18 @@
-import pandas as pd
+import os
+import sys
 import matplotlib.pyplot as plt
 from datetime import datetime
 import numpy as np
 
-# Load the CSV data
-df = pd.read_csv("Taskbook_cleaned_for_NLP.csv")
+# Shared dataset cache and keyword tagger live with the backend services
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "cursor-back"))
+from dataset_cache import load_taskbook
+
+# Load the CSV data (parsed once per CSV version, with domains already assigned)
+df = load_taskbook("Taskbook_cleaned_for_NLP.csv")
 print("📊 Loaded CSV with columns:", df.columns.tolist())
 print(f"📄 Total records: {len(df)}")
 
-# Domain classification keywords
-domain_keywords = {
-    "Plants": ["plant", "flora", "crop", "seed", "photosynth", "phyt", "agri", "leaf", "root"],
-    "Microbes": ["microbe", "microbial", "bacteria", "bacterial", "virus", "fungi", "fungal",
-                 "staphyl", "streptoc", "pathogen", "microorganism"],
-    "Radiation": ["radiation", "ionizing", "cosmic", "radiol", "shield", "dosimetry", "radiobiology"],
-    "Psychology": ["psych", "behavior", "crew", "cognitive", "sleep", "social", "mental",
-                   "stress", "isolation"],
-    "Human Physiology": ["cardio", "cardiovascular", "musculo", "bone", "neuro",
-                         "endocrine", "immune"],
-}
-
-def assign_domain(row):
-    text = " ".join([
-        str(row.get("Title", "")),
-        str(row.get("Abstract", "")),
-        str(row.get("Methods", "")),
-        str(row.get("Results", ""))
-    ]).lower()
-
-    for domain, keywords in domain_keywords.items():
-        for kw in keywords:
-            if kw in text:
-                return domain
-    return "Other"
-
-# Assign domains to all records
-df["Assigned_Domain"] = df.apply(assign_domain, axis=1)
-
 # Create synthetic fiscal years for analysis
 np.random.seed(42)
 current_year = datetime.now().year
@@ -1,40 +1,17 @@
-import pandas as pd
+import os
+import sys
 import matplotlib.pyplot as plt
 from datetime import datetime
 import numpy as np
 
+# Shared dataset cache and keyword tagger live with the backend services
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "cursor-back"))
+from dataset_cache import load_taskbook
+
 def load_and_process_data():
     """Load and process the CSV data"""
-    df = pd.read_csv("Taskbook_cleaned_for_NLP.csv")
-    
-    # Domain classification keywords
-    domain_keywords = {
-        "Plants": ["plant", "flora", "crop", "seed", "photosynth", "phyt", "agri", "leaf", "root"],
-        "Microbes": ["microbe", "microbial", "bacteria", "bacterial", "virus", "fungi", "fungal",
-                     "staphyl", "streptoc", "pathogen", "microorganism"],
-        "Radiation": ["radiation", "ionizing", "cosmic", "radiol", "shield", "dosimetry", "radiobiology"],
-        "Psychology": ["psych", "behavior", "crew", "cognitive", "sleep", "social", "mental",
-                       "stress", "isolation"],
-        "Human Physiology": ["cardio", "cardiovascular", "musculo", "bone", "neuro",
-                             "endocrine", "immune"],
-    }
-
-    def assign_domain(row):
-        text = " ".join([
-            str(row.get("Title", "")),
-            str(row.get("Abstract", "")),
-            str(row.get("Methods", "")),
-            str(row.get("Results", ""))
-        ]).lower()
-
-        for domain, keywords in domain_keywords.items():
-            for kw in keywords:
-                if kw in text:
-                    return domain
-        return "Other"
-
-    # Assign domains
-    df["Assigned_Domain"] = df.apply(assign_domain, axis=1)
+    # Parsed once per CSV version, with domains already assigned
+    df = load_taskbook("Taskbook_cleaned_for_NLP.csv")
     
     # Create synthetic fiscal years
     np.random.seed(42)
@@ -196,11 +173,13 @@ def red_flag_alerts():
         "Human Physiology": "Astronaut health"
     }
     
-    df['Recent_7yrs'] = df['Fiscal Year'] >= (datetime.now().year - 7)
+    # One counting pass each instead of two filters per domain
+    total_counts = df['Assigned_Domain'].value_counts()
+    recent_counts = df.loc[df['Fiscal Year'] >= (datetime.now().year - 7), 'Assigned_Domain'].value_counts()
     
     for domain, importance in critical_domains.items():
-        recent_count = len(df[(df["Assigned_Domain"] == domain) & (df["Recent_7yrs"] == True)])
-        total_count = len(df[df["Assigned_Domain"] == domain])
+        recent_count = int(recent_counts.get(domain, 0))
+        total_count = int(total_counts.get(domain, 0))
         
         # Determine alert level
         if recent_count < 10:
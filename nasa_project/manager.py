@@ -7,6 +7,8 @@ Original file is located at
     https://colab.research.google.com/drive/1b9WgWuAwYu3pn4XlRiafSedm3KyJ1T7Q
 """
 
+import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 from datetime import datetime
@@ -14,8 +16,13 @@ from IPython.display import display, HTML
 import ipywidgets as widgets
 import numpy as np
 
+# Shared dataset cache and keyword tagger live with the backend services
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "cursor-back"))
+from dataset_cache import load_taskbook
+from keyword_tagger import taskbook_domain_tagger
+
 # Load Excel
-df = pd.read_csv("C:/Users/ravur/PERSONAL/Desktop/Frontend/Taskbook_cleaned_for_NLP.csv")
+df = load_taskbook("C:/Users/ravur/PERSONAL/Desktop/Frontend/Taskbook_cleaned_for_NLP.csv")
 
 # Inspect columns
 print(df.columns)
@@ -27,7 +34,7 @@ df.head()
 
 
 # Load Excel file
-df = pd.read_csv("C:/Users/ravur/PERSONAL/Desktop/Frontend/Taskbook_cleaned_for_NLP.csv")
+df = load_taskbook("C:/Users/ravur/PERSONAL/Desktop/Frontend/Taskbook_cleaned_for_NLP.csv")
 
 # Use available columns for dashboard
 available_columns = ['Title', 'Abstract', 'Methods', 'Results', 'Conclusion']
@@ -59,32 +66,7 @@ print("✅ Preprocessed CSV saved as 'nasa_funding_dashboard.csv'")
 df = pd.read_csv("nasa_funding_dashboard.csv")
 
 # --- Domain Assignment ---
-domain_keywords = {
-    "Plants": ["plant", "flora", "crop", "seed", "photosynth", "phyt", "agri", "leaf", "root"],
-    "Microbes": ["microbe", "microbial", "bacteria", "bacterial", "virus", "fungi", "fungal",
-                 "staphyl", "streptoc", "pathogen", "microorganism"],
-    "Radiation": ["radiation", "ionizing", "cosmic", "radiol", "shield", "dosimetry", "radiobiology"],
-    "Psychology": ["psych", "behavior", "crew", "cognitive", "sleep", "social", "mental",
-                   "stress", "isolation"],
-    "Human Physiology": ["cardio", "cardiovascular", "musculo", "bone", "neuro",
-                         "endocrine", "immune"],
-}
-
-def assign_domain(row):
-    text = " ".join([
-        str(row.get("Title", "")),
-        str(row.get("Abstract", "")),
-        str(row.get("Methods", "")),
-        str(row.get("Results", ""))
-    ]).lower()
-
-    for domain, keywords in domain_keywords.items():
-        for kw in keywords:
-            if kw in text:
-                return domain
-    return "Other"
-
-df["Assigned_Domain"] = df.apply(assign_domain, axis=1)
+df["Assigned_Domain"] = taskbook_domain_tagger.assign(df)
 
 # --- Count + Percentages ---
 counts = df["Assigned_Domain"].value_counts().reset_index()
@@ -117,31 +99,7 @@ counts
 df = pd.read_csv("nasa_funding_dashboard.csv")
 
 # --- Domain Assignment (reuse from Section 1) ---
-domain_keywords = {
-    "Plants": ["plant", "flora", "crop", "seed", "photosynth", "phyt", "agri", "leaf", "root"],
-    "Microbes": ["microbe", "microbial", "bacteria", "bacterial", "virus", "fungi", "fungal",
-                 "staphyl", "streptoc", "pathogen", "microorganism"],
-    "Radiation": ["radiation", "ionizing", "cosmic", "radiol", "shield", "dosimetry", "radiobiology"],
-    "Psychology": ["psych", "behavior", "crew", "cognitive", "sleep", "social", "mental",
-                   "stress", "isolation"],
-    "Human Physiology": ["cardio", "cardiovascular", "musculo", "bone", "neuro",
-                         "endocrine", "immune"],
-}
-
-def assign_domain(row):
-    text = " ".join([
-        str(row.get("Title", "")),
-        str(row.get("Abstract", "")),
-        str(row.get("Methods", "")),
-        str(row.get("Results", ""))
-    ]).lower()
-    for domain, keywords in domain_keywords.items():
-        for kw in keywords:
-            if kw in text:
-                return domain
-    return "Other"
-
-df["Assigned_Domain"] = df.apply(assign_domain, axis=1)
+df["Assigned_Domain"] = taskbook_domain_tagger.assign(df)
 
 # --- Count projects in last 5 years ---
 recent_counts = df[df["Recent_5yrs"] == True]["Assigned_Domain"].value_counts()